@@ -141,6 +141,8 @@ class AuthStore:
             assert self._users is not None
 
         self._users.pop(user.id)
+        # Tokens of a removed user should never validate again
+        user.refresh_tokens.clear()
         self._async_schedule_save()
 
     async def async_update_user(
@@ -1,6 +1,6 @@
 """Permissions for Home Assistant."""
 import logging
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import voluptuous as vol
 
@@ -46,6 +46,27 @@ class PolicyPermissions(AbstractPermissions):
         """Initialize the permission class."""
         self._policy = policy
         self._perm_lookup = perm_lookup
+        self._entity_results: Dict[Tuple[str, str], bool] = {}
+        self._entity_results_generation = perm_lookup.generation
+
+    def check_entity(self, entity_id: str, key: str) -> bool:
+        """Check if we can access entity.
+
+        Results are cached until the entity or device registry changes,
+        as area and device policies depend on them.
+        """
+        generation = self._perm_lookup.generation
+        if generation != self._entity_results_generation:
+            self._entity_results = {}
+            self._entity_results_generation = generation
+
+        cache_key = (entity_id, key)
+        result = self._entity_results.get(cache_key)
+        if result is None:
+            result = self._entity_results[cache_key] = super().check_entity(
+                entity_id, key
+            )
+        return result
 
     def access_all_entities(self, key: str) -> bool:
         """Check if we have a certain access to all entities."""
@@ -1,5 +1,5 @@
 """Models for permissions."""
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Tuple
 
 import attr
 
@@ -17,3 +17,8 @@ class PermissionLookup:
 
     entity_registry: "ent_reg.EntityRegistry" = attr.ib()
     device_registry: "dev_reg.DeviceRegistry" = attr.ib()
+
+    @property
+    def generation(self) -> Tuple[int, int]:
+        """Return the generation of the registries, changed by every update."""
+        return (self.entity_registry.generation, self.device_registry.generation)
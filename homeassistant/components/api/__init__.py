@@ -1,7 +1,10 @@
 """Rest API for Home Assistant."""
 import asyncio
+from collections import OrderedDict
+import itertools
 import json
 import logging
+from typing import Any, Optional, Set
 
 from aiohttp import web
 from aiohttp.web_exceptions import HTTPBadRequest
@@ -13,6 +16,7 @@ from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     EVENT_TIME_CHANGED,
     HTTP_BAD_REQUEST,
     HTTP_CREATED,
@@ -54,6 +58,9 @@ ATTR_VERSION = "version"
 DOMAIN = "api"
 STREAM_PING_PAYLOAD = "ping"
 STREAM_PING_INTERVAL = 50  # seconds
+STREAM_MAX_PENDING = 1024
+STREAM_OVERFLOW_DISCONNECT = "disconnect"
+STREAM_OVERFLOW_DROP_OLDEST = "drop_oldest"
 
 
 async def async_setup(hass, config):
@@ -89,6 +96,71 @@ class APIStatusView(HomeAssistantView):
         return self.json_message("API running.")
 
 
+class _EventStreamQueue:
+    """Bounded queue of events waiting to be written to an event stream.
+
+    State changes of an entity that is already waiting to be written are
+    merged into the waiting event, so a slow client gets the latest state
+    instead of every intermediate one.
+    """
+
+    def __init__(self, maxsize: int, drop_oldest: bool) -> None:
+        """Initialize the queue."""
+        self._maxsize = maxsize
+        self._drop_oldest = drop_oldest
+        self._pending: "OrderedDict[Any, Any]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._keys = itertools.count()
+        self.dropped = 0
+        self.overflowed = False
+
+    @ha.callback
+    def async_put(self, item: Any) -> None:
+        """Queue an event or a payload."""
+        if isinstance(item, ha.Event) and item.event_type == EVENT_STATE_CHANGED:
+            key = item.data["entity_id"]
+            waiting = self._pending.get(key)
+            if waiting is not None:
+                self._pending[key] = ha.Event(
+                    EVENT_STATE_CHANGED,
+                    {**item.data, "old_state": waiting.data["old_state"]},
+                    item.origin,
+                    item.time_fired,
+                    item.context,
+                )
+                return
+        else:
+            key = next(self._keys)
+
+        if len(self._pending) >= self._maxsize:
+            if not self._drop_oldest:
+                self.overflowed = True
+                self._ready.set()
+                return
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._pending[key] = item
+        self._ready.set()
+
+    async def async_get(self) -> Any:
+        """Return the oldest queued item, waiting for one if needed."""
+        while not self._pending and not self.overflowed:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.overflowed:
+            return None
+        return self._pending.popitem(last=False)[1]
+
+
+def _split_query(request: web.Request, key: str) -> Optional[Set[str]]:
+    """Return the comma separated values of a query parameter."""
+    value = request.query.get(key)
+    if not value:
+        return None
+    return set(value.split(","))
+
+
 class APIEventStream(HomeAssistantView):
     """View to handle EventStream requests."""
 
@@ -101,13 +173,22 @@ class APIEventStream(HomeAssistantView):
             raise Unauthorized()
         hass = request.app["hass"]
         stop_obj = object()
-        to_write = asyncio.Queue()
+        to_write = _EventStreamQueue(
+            STREAM_MAX_PENDING,
+            request.query.get("overflow", STREAM_OVERFLOW_DROP_OLDEST)
+            != STREAM_OVERFLOW_DISCONNECT,
+        )
 
         restrict = request.query.get("restrict")
         if restrict:
             restrict = restrict.split(",") + [EVENT_HOMEASSISTANT_STOP]
 
-        async def forward_events(event):
+        # Only applied to events that are about a single entity
+        entity_ids = _split_query(request, "entity_id")
+        domains = _split_query(request, "domain")
+
+        @ha.callback
+        def forward_events(event):
             """Forward events to the open request."""
             if event.event_type == EVENT_TIME_CHANGED:
                 return
@@ -115,14 +196,20 @@ class APIEventStream(HomeAssistantView):
             if restrict and event.event_type not in restrict:
                 return
 
+            if entity_ids or domains:
+                entity_id = event.data.get("entity_id")
+                if isinstance(entity_id, str) and not (
+                    (entity_ids and entity_id in entity_ids)
+                    or (domains and ha.split_entity_id(entity_id)[0] in domains)
+                ):
+                    return
+
             _LOGGER.debug("STREAM %s FORWARDING %s", id(stop_obj), event)
 
             if event.event_type == EVENT_HOMEASSISTANT_STOP:
-                data = stop_obj
+                to_write.async_put(stop_obj)
             else:
-                data = json.dumps(event, cls=JSONEncoder)
-
-            await to_write.put(data)
+                to_write.async_put(event)
 
         response = web.StreamResponse()
         response.content_type = "text/event-stream"
@@ -134,27 +221,43 @@ class APIEventStream(HomeAssistantView):
             _LOGGER.debug("STREAM %s ATTACHED", id(stop_obj))
 
             # Fire off one message so browsers fire open event right away
-            await to_write.put(STREAM_PING_PAYLOAD)
+            to_write.async_put(STREAM_PING_PAYLOAD)
 
             while True:
                 try:
                     with async_timeout.timeout(STREAM_PING_INTERVAL):
-                        payload = await to_write.get()
+                        payload = await to_write.async_get()
 
                     if payload is stop_obj:
                         break
 
+                    if payload is None:
+                        _LOGGER.warning(
+                            "STREAM %s closed, client exceeded %s pending events",
+                            id(stop_obj),
+                            STREAM_MAX_PENDING,
+                        )
+                        break
+
+                    if isinstance(payload, ha.Event):
+                        # Serialized when written, dropped events cost nothing
+                        payload = json.dumps(payload, cls=JSONEncoder)
+
                     msg = f"data: {payload}\n\n"
                     _LOGGER.debug("STREAM %s WRITING %s", id(stop_obj), msg.strip())
                     await response.write(msg.encode("UTF-8"))
                 except asyncio.TimeoutError:
-                    await to_write.put(STREAM_PING_PAYLOAD)
+                    to_write.async_put(STREAM_PING_PAYLOAD)
 
         except asyncio.CancelledError:
             _LOGGER.debug("STREAM %s ABORT", id(stop_obj))
 
         finally:
-            _LOGGER.debug("STREAM %s RESPONSE CLOSED", id(stop_obj))
+            _LOGGER.debug(
+                "STREAM %s RESPONSE CLOSED, %s events dropped",
+                id(stop_obj),
+                to_write.dropped,
+            )
             unsub_stream()
 
         return response
@@ -229,7 +332,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            body = f"[{','.join(state.as_dict_json() for state in states)}]"
+        except (ValueError, TypeError):
+            # Let the regular serializer report which data is bad
+            return self.json(states)
+        return self.json_encoded(body.encode())
 
 
 class APIEntityStateView(HomeAssistantView):
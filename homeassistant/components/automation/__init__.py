@@ -1,5 +1,6 @@
 """Allow to set up simple automation rules via the config file."""
 import logging
+from time import monotonic
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union, cast
 
 import voluptuous as vol
@@ -53,6 +54,12 @@ from homeassistant.helpers.script import (
 )
 from homeassistant.helpers.script_variables import ScriptVariables
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.trace import (
+    CONF_TRACE,
+    async_trace_step_finish,
+    async_trace_step_start,
+    trace_run,
+)
 from homeassistant.helpers.trigger import async_initialize_triggers
 from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.loader import bind_hass
@@ -228,6 +235,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         initial_state,
         variables,
         trigger_variables,
+        trace_config=None,
     ):
         """Initialize an automation entity."""
         self._id = automation_id
@@ -244,6 +252,9 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         self._logger = LOGGER
         self._variables: ScriptVariables = variables
         self._trigger_variables: ScriptVariables = trigger_variables
+        self.condition_runs = 0
+        self.condition_time = 0.0
+        self._trace_config = trace_config
 
     @property
     def name(self):
@@ -374,6 +385,11 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
 
         This method is a coroutine.
         """
+        with trace_run(self.hass, self.entity_id, self._trace_config, context):
+            await self._async_trigger(run_variables, context, skip_condition)
+
+    async def _async_trigger(self, run_variables, context, skip_condition):
+        """Evaluate the conditions and run the actions of the automation."""
         if self._variables:
             try:
                 variables = self._variables.async_render(self.hass, run_variables)
@@ -383,12 +399,26 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         else:
             variables = run_variables
 
-        if (
-            not skip_condition
-            and self._cond_func is not None
-            and not self._cond_func(variables)
-        ):
-            return
+        if not skip_condition and self._cond_func is not None:
+            trace_element = async_trace_step_start(("condition",), variables)
+            start = monotonic()
+            try:
+                # Automations triggered by the same state change share results
+                with condition.async_memo_context(context):
+                    conditions_passed = self._cond_func(variables)
+            finally:
+                if trace_element is not None:
+                    async_trace_step_finish(trace_element)
+            elapsed = monotonic() - start
+            if trace_element is not None:
+                trace_element.set_result(result=conditions_passed)
+            self.condition_runs += 1
+            self.condition_time += elapsed
+            self._logger.debug(
+                "Conditions of %s evaluated in %.3f ms", self.entity_id, elapsed * 1000
+            )
+            if not conditions_passed:
+                return
 
         # Create a new context referring to the old context.
         parent_id = None if context is None else context.id
@@ -596,6 +626,7 @@ async def _async_process_config(
                 initial_state,
                 variables,
                 config_block.get(CONF_TRIGGER_VARIABLES),
+                config_block.get(CONF_TRACE),
             )
 
             entities.append(entity)
@@ -541,6 +541,7 @@ class CameraMjpegStream(CameraView):
 
 
 @websocket_api.async_response
+@websocket_api.limit_concurrency
 async def websocket_camera_thumbnail(hass, connection, msg):
     """Handle get camera thumbnail websocket command.
 
@@ -1,8 +1,8 @@
 """Allows the creation of a sensor that filters state property."""
+import asyncio
 from collections import Counter, deque
 from copy import copy
 from datetime import timedelta
-from functools import partial
 import logging
 from numbers import Number
 import statistics
@@ -10,9 +10,9 @@ from typing import Optional
 
 import voluptuous as vol
 
-from homeassistant.components import history
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.input_number import DOMAIN as INPUT_NUMBER_DOMAIN
+from homeassistant.components.recorder import preload
 from homeassistant.components.sensor import (
     DEVICE_CLASSES as SENSOR_DEVICE_CLASSES,
     DOMAIN as SENSOR_DOMAIN,
@@ -276,36 +276,36 @@ class SensorFilter(Entity):
                 ):
                     largest_window_time = filt.window_size
 
-            # Retrieve the largest window_size of each type
+            # Retrieve the largest window_size of each type, the states are
+            # read together with the ones of the other sensors
+            requests = []
             if largest_window_items > 0:
-                filter_history = await self.hass.async_add_executor_job(
-                    partial(
-                        history.get_last_state_changes,
+                requests.append(
+                    preload.async_get_states(
                         self.hass,
-                        largest_window_items,
-                        entity_id=self._entity,
+                        self._entity,
+                        limit=largest_window_items,
+                        state_changes_only=True,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(filter_history[self._entity])
             if largest_window_time > timedelta(seconds=0):
                 start = dt_util.utcnow() - largest_window_time
-                filter_history = await self.hass.async_add_executor_job(
-                    partial(
-                        history.state_changes_during_period,
-                        self.hass,
-                        start,
-                        entity_id=self._entity,
+                # The state at the start of the window
+                requests.append(
+                    preload.async_get_states(
+                        self.hass, self._entity, end_time=start, limit=1
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(
-                        [
-                            state
-                            for state in filter_history[self._entity]
-                            if state not in history_list
-                        ]
+                requests.append(
+                    preload.async_get_states(
+                        self.hass, self._entity, start, state_changes_only=True
                     )
+                )
+
+            for filter_history in await asyncio.gather(*requests):
+                history_list.extend(
+                    [state for state in filter_history if state not in history_list]
+                )
 
             # Sort the window states
             history_list = sorted(history_list, key=lambda s: s.last_updated)
@@ -39,6 +39,7 @@ CONF_EXTRA_MODULE_URL = "extra_module_url"
 CONF_EXTRA_JS_URL_ES5 = "extra_js_url_es5"
 CONF_FRONTEND_REPO = "development_repo"
 CONF_JS_VERSION = "javascript_version"
+CONF_PRECOMPRESS_LOCAL = "precompress_local"
 EVENT_PANELS_UPDATED = "panels_updated"
 
 DEFAULT_THEME_COLOR = "#03A9F4"
@@ -101,6 +102,7 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_EXTRA_JS_URL_ES5): vol.All(
                     cv.ensure_list, [cv.string]
                 ),
+                vol.Optional(CONF_PRECOMPRESS_LOCAL): cv.boolean,
                 # We no longer use these options.
                 vol.Optional(CONF_EXTRA_HTML_URL): cv.match_all,
                 vol.Optional(CONF_EXTRA_HTML_URL_ES5): cv.match_all,
@@ -278,7 +280,13 @@ async def async_setup(hass, config):
 
     local = hass.config.path("www")
     if os.path.isdir(local):
-        hass.http.register_static_path("/local", local, not is_dev)
+        # Writing compressed copies into the www folder is opt-in
+        hass.http.register_static_path(
+            "/local",
+            local,
+            not is_dev,
+            precompress=conf.get(CONF_PRECOMPRESS_LOCAL, False),
+        )
 
     hass.http.app.router.register_resource(IndexView(repo_path, hass))
 
@@ -1,23 +1,28 @@
 """Provide pre-made queries on top of the recorder component."""
-from collections import defaultdict
+import asyncio
+from collections import OrderedDict, defaultdict
 from datetime import datetime as dt, timedelta
 from itertools import groupby
 import json
 import logging
+import threading
 import time
 from typing import Iterable, Optional, cast
 
 from aiohttp import web
-from sqlalchemy import and_, bindparam, func, not_, or_
+from sqlalchemy import bindparam, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.checkpoint import most_recent_state_ids
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     States,
-    process_timestamp,
-    process_timestamp_to_utc_isoformat,
+    process_datetime_to_timestamp,
+    process_epoch_timestamp,
+    process_epoch_timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
@@ -80,16 +85,25 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
-    States.last_changed,
-    States.last_updated,
+    States.last_changed_ts,
+    States.last_updated_ts,
 ]
 
 HISTORY_BAKERY = "history_bakery"
 
+# Estimated size in bytes of the state rows kept by the history view
+HISTORY_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Estimated size in bytes of a cached row, without its attributes
+HISTORY_CACHE_ROW_SIZE = 256
+# Estimated size in bytes of a cached period, without its rows
+HISTORY_CACHE_WINDOW_SIZE = 1024
+# Seconds to wait for the recorder to commit the states before reading them
+RECORDER_COMMIT_TIMEOUT = 10
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_significant_states(hass, session, *args, **kwargs)
 
 
@@ -103,6 +117,8 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    cache=None,
+    committed_time=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -110,9 +126,60 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    The rows of the states are read through cache when it is given, the
+    states updated before committed_time must be committed to the database.
     """
     timer_start = time.perf_counter()
 
+    if cache is None:
+        states = _query_significant_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    else:
+        states = cache.get_significant_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            committed_time,
+        )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def _query_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the rows of the significant states, by entity_id and last_updated."""
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
@@ -121,12 +188,14 @@ def _get_significant_states(
         baked_query += lambda q: q.filter(
             (
                 States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
+                | (States.last_changed_ts == States.last_updated_ts)
             )
-            & (States.last_updated > bindparam("start_time"))
+            & (States.last_updated_ts > bindparam("start_time"))
         )
     else:
-        baked_query += lambda q: q.filter(States.last_updated > bindparam("start_time"))
+        baked_query += lambda q: q.filter(
+            States.last_updated_ts > bindparam("start_time")
+        )
 
     if entity_ids is not None:
         baked_query += lambda q: q.filter(
@@ -138,58 +207,49 @@ def _get_significant_states(
             filters.bake(baked_query)
 
     if end_time is not None:
-        baked_query += lambda q: q.filter(States.last_updated < bindparam("end_time"))
+        baked_query += lambda q: q.filter(
+            States.last_updated_ts < bindparam("end_time")
+        )
 
-    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
 
-    states = execute(
+    return execute(
         baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
+            start_time=process_datetime_to_timestamp(start_time),
+            end_time=process_datetime_to_timestamp(end_time),
+            entity_ids=entity_ids,
         )
     )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_json(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
-    )
-
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
 
         baked_query += lambda q: q.filter(
-            (States.last_changed == States.last_updated)
-            & (States.last_updated > bindparam("start_time"))
+            (States.last_changed_ts == States.last_updated_ts)
+            & (States.last_updated_ts > bindparam("start_time"))
         )
 
         if end_time is not None:
             baked_query += lambda q: q.filter(
-                States.last_updated < bindparam("end_time")
+                States.last_updated_ts < bindparam("end_time")
             )
 
         if entity_id is not None:
             baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
 
-        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
 
         states = execute(
             baked_query(session).params(
-                start_time=start_time, end_time=end_time, entity_id=entity_id
+                start_time=process_datetime_to_timestamp(start_time),
+                end_time=process_datetime_to_timestamp(end_time),
+                entity_id=entity_id,
             )
         )
 
@@ -202,18 +262,20 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     """Return the last number_of_states."""
     start_time = dt_util.utcnow()
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
-        baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
+        baked_query += lambda q: q.filter(
+            States.last_changed_ts == States.last_updated_ts
+        )
 
         if entity_id is not None:
             baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
-            States.entity_id, States.last_updated.desc()
+            States.entity_id, States.last_updated_ts.desc()
         )
 
         baked_query += lambda q: q.limit(bindparam("number_of_states"))
@@ -245,7 +307,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
         if run is None:
             return []
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_states_with_session(
             hass, session, utc_point_in_time, entity_ids, run, filters
         )
@@ -269,41 +331,17 @@ def _get_states_with_session(
 
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
-    # last recorder run started.
+    # last checkpoint of the recorder run.
     query = session.query(*QUERY_STATES)
 
-    most_recent_states_by_date = session.query(
-        States.entity_id.label("max_entity_id"),
-        func.max(States.last_updated).label("max_last_updated"),
-    ).filter(
-        (States.last_updated >= run.start) & (States.last_updated < utc_point_in_time)
-    )
-
-    if entity_ids:
-        most_recent_states_by_date.filter(States.entity_id.in_(entity_ids))
-
-    most_recent_states_by_date = most_recent_states_by_date.group_by(States.entity_id)
-
-    most_recent_states_by_date = most_recent_states_by_date.subquery()
-
-    most_recent_state_ids = session.query(
-        func.max(States.state_id).label("max_state_id")
-    ).join(
-        most_recent_states_by_date,
-        and_(
-            States.entity_id == most_recent_states_by_date.c.max_entity_id,
-            States.last_updated == most_recent_states_by_date.c.max_last_updated,
-        ),
+    state_ids = most_recent_state_ids(
+        session,
+        process_datetime_to_timestamp(run.start),
+        process_datetime_to_timestamp(utc_point_in_time),
+        entity_ids,
     )
 
-    most_recent_state_ids = most_recent_state_ids.group_by(States.entity_id)
-
-    most_recent_state_ids = most_recent_state_ids.subquery()
-
-    query = query.join(
-        most_recent_state_ids,
-        States.state_id == most_recent_state_ids.c.max_state_id,
-    )
+    query = query.join(state_ids, States.state_id == state_ids.c.state_id)
 
     if entity_ids is not None:
         query = query.filter(States.entity_id.in_(entity_ids))
@@ -322,14 +360,15 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
         lambda session: session.query(*QUERY_STATES)
     )
     baked_query += lambda q: q.filter(
-        States.last_updated < bindparam("utc_point_in_time"),
+        States.last_updated_ts < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
     )
-    baked_query += lambda q: q.order_by(States.last_updated.desc())
+    baked_query += lambda q: q.order_by(States.last_updated_ts.desc())
     baked_query += lambda q: q.limit(1)
 
     query = baked_query(session).params(
-        utc_point_in_time=utc_point_in_time, entity_id=entity_id
+        utc_point_in_time=process_datetime_to_timestamp(utc_point_in_time),
+        entity_id=entity_id,
     )
 
     return [LazyState(row) for row in execute(query)]
@@ -379,7 +418,7 @@ def _sorted_states_to_json(
 
     # Called in a tight loop so cache the function
     # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+    _process_epoch_timestamp_to_utc_isoformat = process_epoch_timestamp_to_utc_isoformat
 
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
@@ -407,8 +446,8 @@ def _sorted_states_to_json(
             ent_results.append(
                 {
                     STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
+                    LAST_CHANGED_KEY: _process_epoch_timestamp_to_utc_isoformat(
+                        db_state.last_changed_ts
                     ),
                 }
             )
@@ -430,6 +469,143 @@ def get_state(hass, utc_point_in_time, entity_id, run=None):
     return states[0] if states else None
 
 
+class _CachedWindow:
+    """The significant state rows of a period, by entity_id."""
+
+    __slots__ = ("start_time", "tail_time", "rows", "size")
+
+    def __init__(self, key, start_time, tail_time, rows):
+        """Initialize the window."""
+        # Rows are complete for start_time < last_updated <= tail_time
+        self.start_time = start_time
+        self.tail_time = tail_time
+        self.rows = rows
+        entity_ids = key[0] or ()
+        self.size = (
+            HISTORY_CACHE_WINDOW_SIZE
+            + sum(map(len, entity_ids))
+            + sum(
+                HISTORY_CACHE_ROW_SIZE + len(row.attributes or "")
+                for entity_rows in rows.values()
+                for row in entity_rows
+            )
+        )
+
+
+class HistoryResultCache:
+    """Cache of the significant state rows of repeated history requests.
+
+    Dashboards request the same entities for a rolling period on every
+    refresh. The rows of the previous request are reused and only the
+    rows updated after them are read, rows before the start of the new
+    period are dropped. Rows are only kept up to the time the recorder
+    committed the states at. The least recently used periods are evicted
+    when their estimated size is more than max_bytes.
+    """
+
+    def __init__(self, max_bytes=HISTORY_CACHE_MAX_BYTES):
+        """Initialize the cache."""
+        self.max_bytes = max_bytes
+        self._windows = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_significant_states(
+        self,
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+        committed_time=None,
+    ):
+        """Return the rows of the significant states, by entity_id and last_updated.
+
+        The filters must be the same for every call. The states updated
+        before committed_time must be committed to the database, no rows
+        are added to the cache without it.
+        """
+        key = (
+            tuple(entity_ids) if entity_ids is not None else None,
+            significant_changes_only,
+        )
+        with self._lock:
+            window = self._windows.get(key)
+
+        if window is None or start_time < window.start_time:
+            window = _CachedWindow(key, start_time, start_time, {})
+
+        query_start = max(start_time, window.tail_time)
+        if end_time is None or end_time > query_start:
+            new_rows = _query_significant_states(
+                hass,
+                session,
+                query_start,
+                end_time,
+                entity_ids,
+                filters,
+                significant_changes_only,
+            )
+        else:
+            new_rows = []
+
+        start_ts = process_datetime_to_timestamp(start_time)
+        rows = {
+            entity_id: [row for row in entity_rows if row.last_updated_ts > start_ts]
+            for entity_id, entity_rows in window.rows.items()
+        }
+        result_rows = {
+            entity_id: list(entity_rows) for entity_id, entity_rows in rows.items()
+        }
+        if end_time is not None:
+            end_ts = process_datetime_to_timestamp(end_time)
+            for entity_rows in result_rows.values():
+                while entity_rows and entity_rows[-1].last_updated_ts >= end_ts:
+                    entity_rows.pop()
+
+        if committed_time is None:
+            tail_time = window.tail_time
+        elif end_time is not None and committed_time >= end_time:
+            # States updated at end_time are not read, the rows are only
+            # complete up to the last row that was read
+            tail_time = max(
+                [process_epoch_timestamp(row.last_updated_ts) for row in new_rows],
+                default=start_time,
+            )
+        else:
+            tail_time = committed_time
+        tail_time = max(tail_time, window.tail_time, start_time)
+        tail_ts = process_datetime_to_timestamp(tail_time)
+        for entity_id, group in groupby(new_rows, lambda row: row.entity_id):
+            group = list(group)
+            result_rows.setdefault(entity_id, []).extend(group)
+            rows.setdefault(entity_id, []).extend(
+                row for row in group if row.last_updated_ts <= tail_ts
+            )
+
+        self._store(key, _CachedWindow(key, start_time, tail_time, rows))
+
+        return [
+            row for entity_id in sorted(result_rows) for row in result_rows[entity_id]
+        ]
+
+    def _store(self, key, window):
+        """Store a window, evicting the least recently used windows."""
+        with self._lock:
+            old_window = self._windows.pop(key, None)
+            if old_window is not None:
+                self._size -= old_window.size
+            if window.size > self.max_bytes:
+                return
+            self._windows[key] = window
+            self._size += window.size
+            while self._size > self.max_bytes:
+                _, evicted = self._windows.popitem(last=False)
+                self._size -= evicted.size
+
+
 async def async_setup(hass, config):
     """Set up the history hooks."""
     conf = config.get(DOMAIN, {})
@@ -459,6 +635,7 @@ class HistoryPeriodView(HomeAssistantView):
         """Initialize the history period view."""
         self.filters = filters
         self.use_include_order = use_include_order
+        self.cache = HistoryResultCache()
 
     async def get(
         self, request: web.Request, datetime: Optional[str] = None
@@ -511,6 +688,16 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        # States updated before committed_time are read from the database
+        committed_time: Optional[dt] = dt_util.utcnow()
+        try:
+            await asyncio.wait_for(
+                hass.data[DATA_INSTANCE].async_commit(), RECORDER_COMMIT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.warning("The recorder did not commit the states in time")
+            committed_time = None
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -522,6 +709,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                committed_time,
             ),
         )
 
@@ -534,11 +722,12 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        committed_time,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
 
-        with session_scope(hass=hass) as session:
+        with session_scope(hass=hass, read_only=True) as session:
             result = _get_significant_states(
                 hass,
                 session,
@@ -549,6 +738,8 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                self.cache,
+                committed_time,
             )
 
         result = list(result.values())
@@ -738,7 +929,7 @@ class LazyState(State):
     def last_changed(self):
         """Last changed datetime."""
         if not self._last_changed:
-            self._last_changed = process_timestamp(self._row.last_changed)
+            self._last_changed = process_epoch_timestamp(self._row.last_changed_ts)
         return self._last_changed
 
     @last_changed.setter
@@ -750,7 +941,7 @@ class LazyState(State):
     def last_updated(self):
         """Last updated datetime."""
         if not self._last_updated:
-            self._last_updated = process_timestamp(self._row.last_updated)
+            self._last_updated = process_epoch_timestamp(self._row.last_updated_ts)
         return self._last_updated
 
     @last_updated.setter
@@ -768,14 +959,14 @@ class LazyState(State):
         if self._last_changed:
             last_changed_isoformat = self._last_changed.isoformat()
         else:
-            last_changed_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_changed
+            last_changed_isoformat = process_epoch_timestamp_to_utc_isoformat(
+                self._row.last_changed_ts
             )
         if self._last_updated:
             last_updated_isoformat = self._last_updated.isoformat()
         else:
-            last_updated_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_updated
+            last_updated_isoformat = process_epoch_timestamp_to_utc_isoformat(
+                self._row.last_updated_ts
             )
         return {
             "entity_id": self.entity_id,
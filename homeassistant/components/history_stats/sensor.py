@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -109,6 +110,7 @@ class HistoryStatsSensor(Entity):
         self, hass, entity_id, entity_states, start, end, duration, sensor_type, name
     ):
         """Initialize the HistoryStats sensor."""
+        self.hass = hass
         self._entity_id = entity_id
         self._entity_states = entity_states
         self._duration = duration
@@ -122,6 +124,14 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        # The state changes are complete from _history_start on, which
+        # is None until the history is loaded from the database
+        self._history_start = None
+        # Whether the state at _history_start matched, None if unknown
+        self._start_state = None
+        # Timestamps of the state changes since and whether they matched
+        self._changes = deque()
+
     async def async_added_to_hass(self):
         """Create listeners when the entity is added."""
 
@@ -134,10 +144,26 @@ class HistoryStatsSensor(Entity):
                 """Force the component to refresh."""
                 self.async_schedule_update_ha_state(True)
 
+            @callback
+            def record_state_change(event):
+                """Record the state change and refresh."""
+                new_state = event.data.get("new_state")
+                if new_state is None:
+                    # The recorder stores the removal as an empty state
+                    self._changes.append((event.time_fired.timestamp(), False))
+                elif new_state.last_changed == new_state.last_updated:
+                    self._changes.append(
+                        (
+                            new_state.last_changed.timestamp(),
+                            new_state.state in self._entity_states,
+                        )
+                    )
+                force_refresh()
+
             force_refresh()
             self.async_on_remove(
                 async_track_state_change_event(
-                    self.hass, [self._entity_id], force_refresh
+                    self.hass, [self._entity_id], record_state_change
                 )
             )
 
@@ -187,13 +213,13 @@ class HistoryStatsSensor(Entity):
         """Return the icon to use in the frontend, if any."""
         return ICON
 
-    def update(self):
+    async def async_update(self):
         """Get the latest data and updates the states."""
         # Get previous values of start and end
         p_start, p_end = self._period
 
         # Parse templates
-        self.update_period()
+        self.async_update_period()
         start, end = self._period
 
         # Convert times to UTC
@@ -219,26 +245,33 @@ class HistoryStatsSensor(Entity):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
-        )
+        # The state changes are only read from the database when the
+        # period starts before the changes that are already known
+        if self._history_start is None or start_timestamp < self._history_start:
+            history_list = await self.hass.async_add_executor_job(
+                history.state_changes_during_period,
+                self.hass,
+                start,
+                None,
+                str(self._entity_id),
+            )
+            self._load_history(history_list, start_timestamp)
 
-        if self._entity_id not in history_list:
-            return
+        # Forget the state changes before the period
+        while self._changes and self._changes[0][0] <= start_timestamp:
+            _, self._start_state = self._changes.popleft()
+        self._history_start = start_timestamp
 
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state in self._entity_states
+        last_state = self._start_state
         last_time = start_timestamp
         elapsed = 0
         count = 0
+        period_end = dt_util.as_timestamp(end)
 
         # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state in self._entity_states
-            current_time = item.last_changed.timestamp()
-
+        for current_time, current_state in self._changes:
+            if current_time >= period_end:
+                break
             if last_state:
                 elapsed += current_time - last_time
             if current_state and not last_state:
@@ -247,6 +280,10 @@ class HistoryStatsSensor(Entity):
             last_state = current_state
             last_time = current_time
 
+        if last_state is None:
+            # No history of the entity
+            return
+
         # Count time elapsed between last history state and end of measure
         if last_state:
             measure_end = min(end_timestamp, now_timestamp)
@@ -258,7 +295,28 @@ class HistoryStatsSensor(Entity):
         # Save counter
         self.count = count
 
-    def update_period(self):
+    def _load_history(self, history_list, start_timestamp):
+        """Replace the known state changes with the ones of history_list.
+
+        State changes recorded after the last state change in the database
+        are kept, as they may not have been committed yet.
+        """
+        self._start_state = None
+        changes = []
+        for item in history_list.get(self._entity_id, []):
+            current_time = item.last_changed.timestamp()
+            current_state = item.state in self._entity_states
+            if current_time <= start_timestamp:
+                self._start_state = current_state
+            else:
+                changes.append((current_time, current_state))
+
+        last_time = changes[-1][0] if changes else start_timestamp
+        changes.extend(change for change in self._changes if change[0] > last_time)
+        self._changes = deque(changes)
+
+    @callback
+    def async_update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
         start = None
         end = None
@@ -266,7 +324,7 @@ class HistoryStatsSensor(Entity):
         # Parse start
         if self._start is not None:
             try:
-                start_rendered = self._start.render()
+                start_rendered = self._start.async_render()
             except (TemplateError, TypeError) as ex:
                 HistoryStatsHelper.handle_template_exception(ex, "start")
                 return
@@ -286,7 +344,7 @@ class HistoryStatsSensor(Entity):
         # Parse end
         if self._end is not None:
             try:
-                end_rendered = self._end.render()
+                end_rendered = self._end.async_render()
             except (TemplateError, TypeError) as ex:
                 HistoryStatsHelper.handle_template_exception(ex, "end")
                 return
@@ -3,6 +3,7 @@ from contextvars import ContextVar
 from ipaddress import ip_network
 import logging
 import os
+from pathlib import Path
 import ssl
 from typing import Dict, Optional, cast
 
@@ -29,8 +30,14 @@ from .const import KEY_AUTHENTICATED, KEY_HASS, KEY_HASS_USER  # noqa: F401
 from .cors import setup_cors
 from .forwarded import async_setup_forwarded
 from .request_context import setup_request_context
+from .request_timing import setup_request_timing
 from .security_filter import setup_security_filter
-from .static import CACHE_HEADERS, CachingStaticResource
+from .static import (
+    CACHE_HEADERS,
+    CachingStaticResource,
+    async_serve_file,
+    precompress_directory,
+)
 from .view import HomeAssistantView  # noqa: F401
 from .web_runner import HomeAssistantTCPSite
 
@@ -50,6 +57,7 @@ CONF_TRUSTED_PROXIES = "trusted_proxies"
 CONF_LOGIN_ATTEMPTS_THRESHOLD = "login_attempts_threshold"
 CONF_IP_BAN_ENABLED = "ip_ban_enabled"
 CONF_SSL_PROFILE = "ssl_profile"
+CONF_SLOW_REQUEST_THRESHOLD = "slow_request_threshold"
 
 SSL_MODERN = "modern"
 SSL_INTERMEDIATE = "intermediate"
@@ -61,6 +69,7 @@ DEFAULT_DEVELOPMENT = "0"
 # My to be able to check url and version info.
 DEFAULT_CORS = ["https://cast.home-assistant.io"]
 NO_LOGIN_ATTEMPT_THRESHOLD = -1
+DEFAULT_SLOW_REQUEST_THRESHOLD = 10.0
 
 MAX_CLIENT_SIZE: int = 1024 ** 2 * 16
 
@@ -94,6 +103,9 @@ HTTP_SCHEMA = vol.All(
             vol.Optional(CONF_SSL_PROFILE, default=SSL_MODERN): vol.In(
                 [SSL_INTERMEDIATE, SSL_MODERN]
             ),
+            vol.Optional(
+                CONF_SLOW_REQUEST_THRESHOLD, default=DEFAULT_SLOW_REQUEST_THRESHOLD
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
         }
     ),
 )
@@ -143,6 +155,7 @@ async def async_setup(hass, config):
     is_ban_enabled = conf[CONF_IP_BAN_ENABLED]
     login_threshold = conf[CONF_LOGIN_ATTEMPTS_THRESHOLD]
     ssl_profile = conf[CONF_SSL_PROFILE]
+    slow_request_threshold = conf[CONF_SLOW_REQUEST_THRESHOLD]
 
     server = HomeAssistantHTTP(
         hass,
@@ -157,6 +170,7 @@ async def async_setup(hass, config):
         login_threshold=login_threshold,
         is_ban_enabled=is_ban_enabled,
         ssl_profile=ssl_profile,
+        slow_request_threshold=slow_request_threshold,
     )
 
     startup_listeners = []
@@ -223,6 +237,7 @@ class HomeAssistantHTTP:
         login_threshold,
         is_ban_enabled,
         ssl_profile,
+        slow_request_threshold=None,
     ):
         """Initialize the HTTP Home Assistant server."""
         app = self.app = web.Application(
@@ -241,6 +256,8 @@ class HomeAssistantHTTP:
 
         setup_request_context(app, current_request)
 
+        self.request_stats = setup_request_timing(app, slow_request_threshold)
+
         if is_ban_enabled:
             setup_bans(hass, app, login_threshold)
 
@@ -298,29 +315,40 @@ class HomeAssistantHTTP:
 
         self.app.router.add_route("GET", url, redirect)
 
-    def register_static_path(self, url_path, path, cache_headers=True):
-        """Register a folder or file to serve as a static path."""
+    def register_static_path(
+        self, url_path, path, cache_headers=True, precompress=False
+    ):
+        """Register a folder or file to serve as a static path.
+
+        With precompress, compressed copies of the files in the folder are
+        written in the background so they don't have to be compressed
+        per request. Only use it for folders Home Assistant may write to.
+        The copies are only used with cache_headers, which serves them after
+        checking they are not older than their file.
+        """
         if os.path.isdir(path):
             if cache_headers:
                 resource = CachingStaticResource
             else:
                 resource = web.StaticResource
             self.app.router.register_resource(resource(url_path, path))
+            if precompress and cache_headers:
+                self.hass.async_add_executor_job(precompress_directory, Path(path))
             return
 
         if cache_headers:
 
-            async def serve_file(request):
+            async def serve_static_file(request):
                 """Serve file from disk."""
-                return web.FileResponse(path, headers=CACHE_HEADERS)
+                return await async_serve_file(request, Path(path), CACHE_HEADERS)
 
         else:
 
-            async def serve_file(request):
+            async def serve_static_file(request):
                 """Serve file from disk."""
                 return web.FileResponse(path)
 
-        self.app.router.add_route("GET", url_path, serve_file)
+        self.app.router.add_route("GET", url_path, serve_static_file)
 
     async def start(self):
         """Start the aiohttp server."""
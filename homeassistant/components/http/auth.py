@@ -1,11 +1,15 @@
 """Authentication for HTTP component."""
+from collections import OrderedDict
 import logging
 import secrets
+import time
+from typing import Optional, Tuple
 
 from aiohttp import hdrs
 from aiohttp.web import middleware
 import jwt
 
+from homeassistant.auth.models import RefreshToken
 from homeassistant.core import callback
 from homeassistant.util import dt as dt_util
 
@@ -19,6 +23,59 @@ DATA_API_PASSWORD = "api_password"
 DATA_SIGN_SECRET = "http.auth.sign_secret"
 SIGN_QUERY_PARAM = "authSig"
 
+# Number of recently validated access tokens to keep
+ACCESS_TOKEN_CACHE_SIZE = 256
+
+
+class AccessTokenCache:
+    """Remember recently validated access tokens.
+
+    Decoding and verifying a token for every request is expensive for
+    clients that make many requests, like camera streams. A cached token
+    is only used while it has not expired, its refresh token is still
+    registered to its user and that user is active, so revoking the
+    refresh token or removing or deactivating the user takes effect
+    immediately.
+    """
+
+    def __init__(self, max_size: int = ACCESS_TOKEN_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._max_size = max_size
+        self._tokens: "OrderedDict[str, Tuple[RefreshToken, float]]" = OrderedDict()
+
+    @callback
+    def async_get(self, token: str) -> Optional[RefreshToken]:
+        """Return the refresh token of a cached access token."""
+        cached = self._tokens.get(token)
+        if cached is None:
+            return None
+
+        refresh_token, expires = cached
+        user = refresh_token.user
+        if (
+            expires <= time.time()
+            or not user.is_active
+            or user.refresh_tokens.get(refresh_token.id) is not refresh_token
+        ):
+            del self._tokens[token]
+            return None
+
+        self._tokens.move_to_end(token)
+        return refresh_token
+
+    @callback
+    def async_set(self, token: str, refresh_token: RefreshToken) -> None:
+        """Cache a validated access token."""
+        try:
+            expires = jwt.decode(token, verify=False)["exp"]
+        except (jwt.InvalidTokenError, KeyError):
+            return
+
+        self._tokens[token] = (refresh_token, expires)
+        self._tokens.move_to_end(token)
+        if len(self._tokens) > self._max_size:
+            self._tokens.popitem(last=False)
+
 
 @callback
 def async_sign_path(hass, refresh_token_id, path, expiration):
@@ -40,6 +97,7 @@ def async_sign_path(hass, refresh_token_id, path, expiration):
 @callback
 def setup_auth(hass, app):
     """Create auth middleware for the app."""
+    token_cache = AccessTokenCache()
 
     async def async_validate_auth_header(request):
         """
@@ -56,10 +114,15 @@ def setup_auth(hass, app):
         if auth_type != "Bearer":
             return False
 
-        refresh_token = await hass.auth.async_validate_access_token(auth_val)
+        refresh_token = token_cache.async_get(auth_val)
 
         if refresh_token is None:
-            return False
+            refresh_token = await hass.auth.async_validate_access_token(auth_val)
+
+            if refresh_token is None:
+                return False
+
+            token_cache.async_set(auth_val, refresh_token)
 
         request[KEY_HASS_USER] = refresh_token.user
         request[KEY_HASS_REFRESH_TOKEN_ID] = refresh_token.id
@@ -0,0 +1,166 @@
+"""Middleware that keeps timing statistics of requests."""
+from bisect import bisect_left
+import logging
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from aiohttp.web import (
+    Application,
+    HTTPException,
+    Request,
+    Response,
+    StreamResponse,
+    middleware,
+)
+
+from homeassistant.core import callback
+
+# mypy: allow-untyped-defs
+
+_LOGGER = logging.getLogger(__name__)
+
+KEY_REQUEST_STATS = "ha_request_stats"
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+ROUTE_UNMATCHED = "unmatched"
+
+
+class RouteStats:
+    """Statistics of the requests of a single route."""
+
+    __slots__ = (
+        "count",
+        "duration_sum",
+        "duration_max",
+        "bytes_sent",
+        "status",
+        "_buckets",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.count = 0
+        self.duration_sum = 0.0
+        self.duration_max = 0.0
+        self.bytes_sent = 0
+        # Requests per status class, like 2xx
+        self.status: Dict[str, int] = {}
+        # One extra bucket for requests slower than the last bound
+        self._buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, duration: float, status: int, size: int) -> None:
+        """Add a request."""
+        self.count += 1
+        self.duration_sum += duration
+        if duration > self.duration_max:
+            self.duration_max = duration
+        self.bytes_sent += size
+        self._buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        status_class = f"{status // 100}xx"
+        self.status[status_class] = self.status.get(status_class, 0) + 1
+
+    def cumulative_buckets(self) -> List[int]:
+        """Return the number of requests at or below each bucket bound."""
+        total = 0
+        cumulative = []
+        for count in self._buckets:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return dictionary version of the statistics."""
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "duration_sum": self.duration_sum,
+            "duration_max": self.duration_max,
+            "bytes_sent": self.bytes_sent,
+            "status": dict(self.status),
+            "buckets": dict(zip(bounds, self.cumulative_buckets())),
+        }
+
+
+class RequestStats:
+    """Statistics of the requests handled by the server, per route."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.routes: Dict[str, RouteStats] = {}
+
+    @callback
+    def async_add(self, route: str, duration: float, status: int, size: int) -> None:
+        """Add a request of a route."""
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteStats()
+        stats.add(duration, status, size)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return dictionary version of the statistics."""
+        return {route: stats.as_dict() for route, stats in self.routes.items()}
+
+
+def _route_name(request: Request) -> str:
+    """Return the route pattern of a request, keeps the number of routes bounded."""
+    resource = request.match_info.route.resource
+    if resource is None:
+        return ROUTE_UNMATCHED
+    return resource.canonical
+
+
+def _response_size(response: StreamResponse) -> int:
+    """Return the size of the body of a response."""
+    if response.prepared:
+        return response.body_length
+    if isinstance(response, Response):
+        return response.content_length or 0
+    return 0
+
+
+@callback
+def setup_request_timing(
+    app: Application, slow_request_threshold: Optional[float]
+) -> RequestStats:
+    """Create request timing middleware for the app."""
+    stats = app[KEY_REQUEST_STATS] = RequestStats()
+
+    @middleware
+    async def request_timing_middleware(
+        request: Request, handler: Callable[[Request], Awaitable[StreamResponse]]
+    ) -> StreamResponse:
+        """Request timing middleware."""
+        start = monotonic()
+        try:
+            response = await handler(request)
+        except HTTPException as err:
+            stats.async_add(_route_name(request), monotonic() - start, err.status, 0)
+            raise
+        except Exception:
+            stats.async_add(_route_name(request), monotonic() - start, 500, 0)
+            raise
+
+        duration = monotonic() - start
+        route = _route_name(request)
+        stats.async_add(route, duration, response.status, _response_size(response))
+
+        # Streams like websockets take as long as the client stays connected
+        if (
+            slow_request_threshold is not None
+            and duration > slow_request_threshold
+            and isinstance(response, Response)
+        ):
+            _LOGGER.warning(
+                "Slow request %s %s (route %s) took %.3f seconds",
+                request.method,
+                request.path,
+                route,
+                duration,
+            )
+
+        return response
+
+    app.middlewares.append(request_timing_middleware)
+    return stats
@@ -1,15 +1,202 @@
 """Static file handling for HTTP component."""
+import asyncio
+import gzip
+import logging
+import mimetypes
+import os
 from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse
+from aiohttp.typedefs import LooseHeaders
+from aiohttp.web import FileResponse, Request, Response, StreamResponse
 from aiohttp.web_exceptions import HTTPForbidden, HTTPNotFound
 from aiohttp.web_urldispatcher import StaticResource
+from multidict import CIMultiDict
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
 
 # mypy: allow-untyped-defs
 
+_LOGGER = logging.getLogger(__name__)
+
 CACHE_TIME = 31 * 86400  # = 1 month
-CACHE_HEADERS = {hdrs.CACHE_CONTROL: f"public, max-age={CACHE_TIME}"}
+CACHE_HEADERS: Mapping[str, str] = {hdrs.CACHE_CONTROL: f"public, max-age={CACHE_TIME}"}
+
+# Smaller files gain too little from compression to be worth a second file
+PRECOMPRESS_MIN_SIZE = 1024
+PRECOMPRESS_EXTENSIONS = {
+    ".css",
+    ".html",
+    ".js",
+    ".json",
+    ".map",
+    ".svg",
+    ".txt",
+    ".xml",
+}
+
+# Compressed siblings of a file, in order of preference
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _compress_file(path: Path, suffix: str) -> None:
+    """Write a compressed copy of a file next to it."""
+    data = path.read_bytes()
+    if suffix == ".br":
+        compressed = brotli.compress(data)
+    else:
+        compressed = gzip.compress(data, mtime=0)
+    target = path.with_name(path.name + suffix)
+    tmp_target = target.with_name(f".{target.name}.tmp")
+    tmp_target.write_bytes(compressed)
+    os.replace(tmp_target, target)
+
+
+def precompress_directory(directory: Path) -> int:
+    """Write gzip and brotli copies of the compressible files in a directory.
+
+    Copies that are newer than their file are kept. Returns the number
+    of files compressed. Blocking, run in the executor.
+    """
+    suffixes = [".gz"] if brotli is None else [".gz", ".br"]
+    compressed = 0
+
+    for path in directory.rglob("*"):
+        if path.suffix not in PRECOMPRESS_EXTENSIONS or not path.is_file():
+            continue
+        try:
+            stat = path.stat()
+            if stat.st_size < PRECOMPRESS_MIN_SIZE:
+                continue
+            for suffix in suffixes:
+                variant = path.with_name(path.name + suffix)
+                if variant.exists() and variant.stat().st_mtime >= stat.st_mtime:
+                    continue
+                _compress_file(path, suffix)
+                compressed += 1
+        except OSError as err:
+            _LOGGER.warning("Unable to precompress %s: %s", path, err)
+
+    if compressed:
+        _LOGGER.info("Wrote %d compressed copies of files in %s", compressed, directory)
+    return compressed
+
+
+def _etag(stat: os.stat_result) -> str:
+    """Return the ETag of a file."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return if the client already has this version of the file."""
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Return the quality value of each coding of an Accept-Encoding header."""
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def _accepts(qualities: Dict[str, float], encoding: str) -> bool:
+    """Return if a coding is accepted, codings with q=0 are refused."""
+    return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+
+def _stat_file(filepath: Path) -> Tuple[os.stat_result, Dict[str, Path], bool]:
+    """Return the stat of a file and its compressed copies.
+
+    The copies are the ones newer than the file, by encoding. Also returns
+    if the file has a gzip copy at all. Blocking, run in the executor.
+    """
+    stat = filepath.stat()
+    variants = {}
+    has_gzip = False
+    if filepath.suffix in PRECOMPRESS_EXTENSIONS:
+        for encoding, suffix in _ENCODINGS:
+            variant = filepath.with_name(filepath.name + suffix)
+            try:
+                variant_mtime = variant.stat().st_mtime
+            except OSError:
+                continue
+            has_gzip = has_gzip or suffix == ".gz"
+            # A copy older than the file was compressed before the file changed
+            if variant_mtime >= stat.st_mtime:
+                variants[encoding] = variant
+    return stat, variants, has_gzip
+
+
+async def async_serve_file(
+    request: Request, filepath: Path, headers: Optional[LooseHeaders] = None
+) -> StreamResponse:
+    """Serve a file, preferring a precompressed copy the client accepts.
+
+    Responds with 304 when the client sends the ETag of the current file.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        stat, variants, has_gzip = await loop.run_in_executor(
+            None, _stat_file, filepath
+        )
+    except OSError as error:
+        raise HTTPNotFound() from error
+
+    etag = _etag(stat)
+    response_headers: CIMultiDict[str] = CIMultiDict(headers or {})
+    response_headers[hdrs.ETAG] = etag
+    if _etag_matches(request, etag):
+        return Response(status=304, headers=response_headers)
+
+    if filepath.suffix not in PRECOMPRESS_EXTENSIONS:
+        return FileResponse(filepath, headers=response_headers)
+
+    content_type = mimetypes.guess_type(str(filepath))[0] or "application/octet-stream"
+    response_headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+    accept_encoding = request.headers.get(hdrs.ACCEPT_ENCODING, "")
+    qualities = _accepted_encodings(accept_encoding)
+    for encoding, _ in _ENCODINGS:
+        if encoding not in variants or not _accepts(qualities, encoding):
+            continue
+        response_headers[hdrs.CONTENT_TYPE] = content_type
+        response_headers[hdrs.CONTENT_ENCODING] = encoding
+        return FileResponse(variants[encoding], headers=response_headers)
+
+    if has_gzip and "gzip" in accept_encoding:
+        # FileResponse would pick the gzip copy by itself, even when it is
+        # stale or refused with q=0
+        body = await loop.run_in_executor(None, filepath.read_bytes)
+        return Response(body=body, content_type=content_type, headers=response_headers)
+
+    return FileResponse(filepath, headers=response_headers)
 
 
 class CachingStaticResource(StaticResource):
@@ -39,10 +226,5 @@ class CachingStaticResource(StaticResource):
         if filepath.is_dir():
             return await super()._handle(request)
         if filepath.is_file():
-            return FileResponse(
-                filepath,
-                chunk_size=self._chunk_size,
-                # type ignore: https://github.com/aio-libs/aiohttp/pull/3976
-                headers=CACHE_HEADERS,  # type: ignore
-            )
+            return await async_serve_file(request, filepath, CACHE_HEADERS)
         raise HTTPNotFound
@@ -1,6 +1,5 @@
 """Support for views."""
 import asyncio
-import json
 import logging
 from typing import Any, Callable, List, Optional
 
@@ -16,12 +15,15 @@ import voluptuous as vol
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON, HTTP_OK, HTTP_SERVICE_UNAVAILABLE
 from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_bytes
 
 from .const import KEY_AUTHENTICATED, KEY_HASS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Compressing smaller responses costs more CPU than it saves in transfer
+COMPRESSION_MIN_SIZE = 1024
+
 
 class HomeAssistantView:
     """Base view for all views."""
@@ -49,17 +51,27 @@ class HomeAssistantView:
     ) -> web.Response:
         """Return a JSON response."""
         try:
-            msg = json.dumps(result, cls=JSONEncoder, allow_nan=False).encode("UTF-8")
+            msg = json_bytes(result)
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
+        return HomeAssistantView.json_encoded(msg, status_code, headers)
+
+    @staticmethod
+    def json_encoded(
+        msg: bytes,
+        status_code: int = HTTP_OK,
+        headers: Optional[LooseHeaders] = None,
+    ) -> web.Response:
+        """Return a JSON response of an already encoded body."""
         response = web.Response(
             body=msg,
             content_type=CONTENT_TYPE_JSON,
             status=status_code,
             headers=headers,
         )
-        response.enable_compression()
+        if len(msg) >= COMPRESSION_MIN_SIZE:
+            response.enable_compression()
         return response
 
     def json_message(
@@ -1,7 +1,10 @@
 """Event parser and human readable log generator."""
+import asyncio
+from collections import OrderedDict
 from datetime import timedelta
 from itertools import groupby
 import json
+import logging
 import re
 
 import sqlalchemy
@@ -9,13 +12,17 @@ from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
+    Contexts,
     Events,
     States,
-    process_timestamp_to_utc_isoformat,
+    process_datetime_to_timestamp,
+    process_epoch_timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -26,6 +33,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -47,6 +55,8 @@ from homeassistant.helpers.integration_platform import (
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
+_LOGGER = logging.getLogger(__name__)
+
 ENTITY_ID_JSON_TEMPLATE = '"entity_id": "{}"'
 ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": "([^"]+)"')
 DOMAIN_JSON_EXTRACT = re.compile('"domain": "([^"]+)"')
@@ -57,6 +67,7 @@ ATTR_MESSAGE = "message"
 CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
+DATA_FILTERS = "logbook_filters"
 
 GROUP_BY_MINUTES = 15
 
@@ -76,7 +87,6 @@ HOMEASSISTANT_EVENTS = [
 
 ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED = [
     EVENT_LOGBOOK_ENTRY,
-    EVENT_CALL_SERVICE,
     *HOMEASSISTANT_EVENTS,
 ]
 
@@ -86,9 +96,10 @@ ALL_EVENT_TYPES = [
 ]
 
 EVENT_COLUMNS = [
+    Events.event_id,
     Events.event_type,
     Events.event_data,
-    Events.time_fired,
+    Events.time_fired_ts,
     Events.context_id,
     Events.context_user_id,
     Events.context_parent_id,
@@ -96,6 +107,14 @@ EVENT_COLUMNS = [
 
 SCRIPT_AUTOMATION_EVENTS = [EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED]
 
+# Stays below the maximum number of variables of a SQLite query
+MAX_CONTEXT_IDS_PER_QUERY = 500
+
+# Number of contexts a live stream remembers the first event of
+MAX_LIVE_CONTEXTS = 1000
+# Seconds to wait for the recorder to commit before reading the database
+RECORDER_COMMIT_TIMEOUT = 10
+
 LOG_MESSAGE_SCHEMA = vol.Schema(
     {
         vol.Required(ATTR_NAME): cv.string,
@@ -159,7 +178,9 @@ async def async_setup(hass, config):
         filters = None
         entities_filter = None
 
+    hass.data[DATA_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    hass.components.websocket_api.async_register_command(ws_event_stream)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -249,6 +270,108 @@ class LogbookView(HomeAssistantView):
         return await hass.async_add_executor_job(json_events)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+@websocket_api.async_response
+@websocket_api.limit_concurrency
+async def ws_event_stream(hass, connection, msg):
+    """Send the logbook entries since start_time, then stream new entries."""
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    filters, entities_filter = hass.data[DATA_FILTERS]
+    entity_ids = msg.get("entity_ids")
+    if entity_ids is not None:
+        entities_filter = generate_filter([], entity_ids, [], [])
+
+    entity_attr_cache = EntityAttributeCache(hass)
+    context_lookup = OrderedDict()
+    # Events fired while the entries of the database are read
+    pending_events = []
+
+    def send_entries(events):
+        """Send the entries of events."""
+        entries = list(humanify(hass, events, entity_attr_cache, context_lookup))
+        if entries:
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"events": entries})
+            )
+
+    @callback
+    def forward_event(event):
+        """Forward the entry of an event to the websocket."""
+        live_event = LiveEventPartialState(event)
+        if live_event.context_id not in context_lookup:
+            context_lookup[live_event.context_id] = live_event
+            if len(context_lookup) > MAX_LIVE_CONTEXTS:
+                context_lookup.popitem(last=False)
+
+        if event.event_type == EVENT_CALL_SERVICE:
+            return
+        if event.event_type == EVENT_STATE_CHANGED:
+            if not _keep_state_change(event, entities_filter):
+                return
+        elif not _keep_event(hass, live_event, entities_filter):
+            return
+
+        if pending_events is not None:
+            pending_events.append(live_event)
+        else:
+            send_entries([live_event])
+
+    unsubs = [
+        hass.bus.async_listen(event_type, forward_event)
+        for event_type in {
+            EVENT_STATE_CHANGED,
+            EVENT_CALL_SERVICE,
+            *ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED,
+            *hass.data[DOMAIN],
+        }
+    ]
+
+    @callback
+    def unsubscribe():
+        """Stop streaming entries."""
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    end_time = dt_util.utcnow()
+
+    # Entries of events fired before end_time are read from the database
+    try:
+        await asyncio.wait_for(
+            hass.data[DATA_INSTANCE].async_commit(), RECORDER_COMMIT_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        _LOGGER.warning("The recorder did not commit the events in time")
+
+    entries = await hass.async_add_executor_job(
+        _get_events,
+        hass,
+        dt_util.as_utc(start_time),
+        end_time,
+        entity_ids,
+        filters,
+        entities_filter,
+    )
+    if msg["id"] not in connection.subscriptions:
+        return
+
+    connection.send_message(websocket_api.event_message(msg["id"], {"events": entries}))
+    events = [event for event in pending_events if event.time_fired >= end_time]
+    pending_events = None
+    send_entries(events)
+
+
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
 
@@ -416,15 +539,11 @@ def _get_events(
 ):
     """Get events for a period of time."""
     entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
         for row in query.yield_per(1000):
             event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
-            if event.event_type == EVENT_CALL_SERVICE:
-                continue
             if event.event_type == EVENT_STATE_CHANGED or _keep_event(
                 hass, event, entities_filter
             ):
@@ -433,7 +552,7 @@ def _get_events(
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         old_state = aliased(States, name="old_state")
 
         if entity_ids is not None:
@@ -458,7 +577,7 @@ def _get_events(
             query = _apply_events_types_and_states_filter(
                 hass, query, old_state
             ).filter(
-                (States.last_updated == States.last_changed)
+                (States.last_updated_ts == States.last_changed_ts)
                 | (Events.event_type != EVENT_STATE_CHANGED)
             )
             if filters:
@@ -466,11 +585,56 @@ def _get_events(
                     filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
                 )
 
-        query = query.order_by(Events.time_fired)
+        query = query.order_by(Events.time_fired_ts)
+
+        events = list(yield_events(query))
+        context_lookup = _get_context_lookup(session, events)
+
+    return list(humanify(hass, events, entity_attr_cache, context_lookup))
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+
+def _get_context_lookup(session, events):
+    """Map the contexts of events, and their parent contexts, to their first event.
+
+    The first events are looked up in the contexts table of the recorder, so
+    events of other types or outside of the period do not have to be read.
+    """
+    context_lookup = {None: None}
+    context_ids = set()
+    for event in events:
+        context_ids.add(event.context_id)
+        context_ids.add(event.context_parent_id)
+    context_ids.discard(None)
+
+    # The first event of a context is often one of the events themselves
+    events_by_id = {event.event_id: event for event in events}
+    context_ids = list(context_ids)
+
+    for chunk_start in range(0, len(context_ids), MAX_CONTEXT_IDS_PER_QUERY):
+        query = (
+            _generate_events_query(session)
+            .select_from(Contexts)
+            .join(Events, Contexts.event_id == Events.event_id)
+            .outerjoin(States, Events.event_id == States.event_id)
+            .filter(
+                Contexts.context_id.in_(
+                    context_ids[chunk_start : chunk_start + MAX_CONTEXT_IDS_PER_QUERY]
+                )
+            )
+            # A context can be recorded more than once, the first event wins
+            .order_by(Events.event_id.desc())
         )
+        for row in query:
+            context_lookup[row.context_id] = events_by_id.get(
+                row.event_id
+            ) or LazyEventPartialState(row)
+
+    # The recorder skips the contexts no other event refers to, their first
+    # event is the event itself
+    for event in events:
+        context_lookup.setdefault(event.context_id, event)
+
+    return context_lookup
 
 
 def _generate_events_query(session):
@@ -500,9 +664,12 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
-        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
         .filter(
-            (States.last_updated == States.last_changed)
+            (States.last_updated_ts > process_datetime_to_timestamp(start_day))
+            & (States.last_updated_ts < process_datetime_to_timestamp(end_day))
+        )
+        .filter(
+            (States.last_updated_ts == States.last_changed_ts)
             & States.entity_id.in_(entity_ids)
         )
     )
@@ -547,7 +714,8 @@ def _continuous_entity_matcher():
 
 def _apply_event_time_filter(events_query, start_day, end_day):
     return events_query.filter(
-        (Events.time_fired > start_day) & (Events.time_fired < end_day)
+        (Events.time_fired_ts > process_datetime_to_timestamp(start_day))
+        & (Events.time_fired_ts < process_datetime_to_timestamp(end_day))
     )
 
 
@@ -589,6 +757,22 @@ def _keep_event(hass, event, entities_filter):
     return entities_filter is None or entities_filter(f"{domain}.")
 
 
+def _keep_state_change(event, entities_filter):
+    """Return if the entry of a state_changed event is kept, like the database query."""
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    if old_state is None or new_state is None or old_state.state == new_state.state:
+        return False
+
+    if (
+        new_state.domain in CONTINUOUS_DOMAINS
+        and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+    ):
+        return False
+
+    return entities_filter is None or entities_filter(new_state.entity_id)
+
+
 def _augment_data_with_context(
     data, entity_id, event, context_lookup, entity_attr_cache, external_events
 ):
@@ -670,6 +854,7 @@ class LazyEventPartialState:
         "_event_data",
         "_time_fired_isoformat",
         "_attributes",
+        "event_id",
         "event_type",
         "entity_id",
         "state",
@@ -686,6 +871,7 @@ class LazyEventPartialState:
         self._event_data = None
         self._time_fired_isoformat = None
         self._attributes = None
+        self.event_id = self._row.event_id
         self.event_type = self._row.event_type
         self.entity_id = self._row.entity_id
         self.state = self._row.state
@@ -693,7 +879,8 @@ class LazyEventPartialState:
         self.context_id = self._row.context_id
         self.context_user_id = self._row.context_user_id
         self.context_parent_id = self._row.context_parent_id
-        self.time_fired_minute = self._row.time_fired.minute
+        # Minute of the hour in UTC
+        self.time_fired_minute = int(self._row.time_fired_ts // 60) % 60
 
     @property
     def attributes_icon(self):
@@ -749,13 +936,85 @@ class LazyEventPartialState:
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
         if not self._time_fired_isoformat:
-            self._time_fired_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.time_fired or dt_util.utcnow()
+            self._time_fired_isoformat = process_epoch_timestamp_to_utc_isoformat(
+                self._row.time_fired_ts or dt_util.utcnow().timestamp()
             )
 
         return self._time_fired_isoformat
 
 
+class LiveEventPartialState:
+    """A core event with the interface of LazyEventPartialState."""
+
+    __slots__ = [
+        "_event",
+        "_state",
+        "event_id",
+        "event_type",
+        "entity_id",
+        "state",
+        "domain",
+        "context_id",
+        "context_user_id",
+        "context_parent_id",
+        "time_fired",
+        "time_fired_minute",
+    ]
+
+    def __init__(self, event):
+        """Init the event."""
+        self._event = event
+        self._state = None
+        self.event_id = None
+        self.event_type = event.event_type
+        self.entity_id = None
+        self.state = None
+        self.domain = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            self._state = event.data.get("new_state")
+            self.entity_id = event.data.get(ATTR_ENTITY_ID)
+            if self._state is not None:
+                self.state = self._state.state
+                self.domain = self._state.domain
+        self.context_id = event.context.id
+        self.context_user_id = event.context.user_id
+        self.context_parent_id = event.context.parent_id
+        self.time_fired = event.time_fired
+        self.time_fired_minute = event.time_fired.minute
+
+    @property
+    def attributes_icon(self):
+        """Extract the icon from the state attributes."""
+        return self.attributes.get(ATTR_ICON)
+
+    @property
+    def data_entity_id(self):
+        """Extract the entity id from the event data."""
+        return self._event.data.get(ATTR_ENTITY_ID)
+
+    @property
+    def data_domain(self):
+        """Extract the domain from the event data."""
+        return self._event.data.get(ATTR_DOMAIN)
+
+    @property
+    def attributes(self):
+        """State attributes."""
+        if self._state is None:
+            return {}
+        return self._state.attributes
+
+    @property
+    def data(self):
+        """Event data."""
+        return self._event.data
+
+    @property
+    def time_fired_isoformat(self):
+        """Time event was fired in utc isoformat."""
+        return dt_util.as_utc(self.time_fired).isoformat()
+
+
 class EntityAttributeCache:
     """A cache to lookup static entity_id attribute.
 
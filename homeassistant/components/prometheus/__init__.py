@@ -13,6 +13,7 @@ from homeassistant.components.climate.const import (
     CURRENT_HVAC_ACTIONS,
 )
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.request_timing import LATENCY_BUCKETS
 from homeassistant.components.humidifier.const import (
     ATTR_AVAILABLE_MODES,
     ATTR_HUMIDITY,
@@ -25,6 +26,7 @@ from homeassistant.const import (
     ATTR_TEMPERATURE,
     ATTR_UNIT_OF_MEASUREMENT,
     CONTENT_TYPE_TEXT_PLAIN,
+    EVENT_HOMEASSISTANT_STOP,
     EVENT_STATE_CHANGED,
     PERCENTAGE,
     STATE_ON,
@@ -49,6 +51,7 @@ CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_DEFAULT_METRIC = "default_metric"
 CONF_OVERRIDE_METRIC = "override_metric"
+CONF_HTTP_METRICS = "http_metrics"
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_METRIC): cv.string}
 )
@@ -61,6 +64,7 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_PROM_NAMESPACE): cv.string,
                 vol.Optional(CONF_DEFAULT_METRIC): cv.string,
                 vol.Optional(CONF_OVERRIDE_METRIC): cv.string,
+                vol.Optional(CONF_HTTP_METRICS, default=False): cv.boolean,
                 vol.Optional(CONF_COMPONENT_CONFIG, default={}): vol.Schema(
                     {cv.entity_id: COMPONENT_CONFIG_SCHEMA_ENTRY}
                 ),
@@ -104,9 +108,66 @@ def setup(hass, config):
     )
 
     hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+
+    if conf[CONF_HTTP_METRICS]:
+        collector = HttpRequestCollector(
+            prometheus_client, hass.http.request_stats, metrics.metrics_prefix
+        )
+        prometheus_client.REGISTRY.register(collector)
+
+        def unregister_collector(event):
+            """Stop exporting the HTTP metrics."""
+            prometheus_client.REGISTRY.unregister(collector)
+
+        hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, unregister_collector)
+
     return True
 
 
+class HttpRequestCollector:
+    """Export the timing statistics of the HTTP server per route."""
+
+    def __init__(self, prometheus_cli, request_stats, metrics_prefix):
+        """Initialize the collector."""
+        self.prometheus_cli = prometheus_cli
+        self._request_stats = request_stats
+        self._metrics_prefix = metrics_prefix
+
+    def collect(self):
+        """Return the metrics of the HTTP requests."""
+        metrics_core = self.prometheus_cli.metrics_core
+        durations = metrics_core.HistogramMetricFamily(
+            f"{self._metrics_prefix}http_request_duration_seconds",
+            "Time spent handling HTTP requests",
+            labels=["route"],
+        )
+        sent = metrics_core.CounterMetricFamily(
+            f"{self._metrics_prefix}http_response_bytes",
+            "Bytes sent in HTTP response bodies",
+            labels=["route"],
+        )
+        responses = metrics_core.CounterMetricFamily(
+            f"{self._metrics_prefix}http_responses",
+            "HTTP responses per status class",
+            labels=["route", "status"],
+        )
+
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        for route, stats in self._request_stats.routes.items():
+            durations.add_metric(
+                [route],
+                list(zip(bounds, stats.cumulative_buckets())),
+                stats.duration_sum,
+            )
+            sent.add_metric([route], stats.bytes_sent)
+            for status, count in stats.status.items():
+                responses.add_metric([route, status], count)
+
+        yield durations
+        yield sent
+        yield responses
+
+
 class PrometheusMetrics:
     """Model all of the metrics which should be exposed to Prometheus."""
 
@@ -1,23 +1,24 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime
 import logging
-import queue
 import sqlite3
+import sys
 import threading
 import time
 from typing import Any, Callable, List, Optional
 
 from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 import voluptuous as vol
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ATTR_NOW,
     CONF_EXCLUDE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -35,9 +36,10 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import checkpoint, migration, purge
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Contexts, Events, RecorderRuns, States
+from .spool import SpoolingQueue
 from .util import (
     dburl_to_path,
     move_away_broken_database,
@@ -65,16 +67,38 @@ SERVICE_DISABLE_SCHEMA = vol.Schema({})
 
 DEFAULT_URL = "sqlite:///{hass_config_path}"
 DEFAULT_DB_FILE = "home-assistant_v2.db"
+DEFAULT_SPOOL_FILE = "home-assistant_v2.spool"
 DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
 KEEPALIVE_TIME = 30
 
+# Long lived read only connections to a file SQLite database, used by
+# history, logbook and other readers so they keep a warm page cache.
+# Readers wait for a free connection, the pool never grows beyond its size.
+DB_READ_POOL_SIZE = 2
+# Memory map up to 64 MiB of the database, 32-bit systems don't have the
+# address space to spare
+SQLITE_READ_MMAP_SIZE = 64 * 1024 * 1024 if sys.maxsize > 2 ** 32 else 0
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA query_only=ON",
+    f"PRAGMA mmap_size={SQLITE_READ_MMAP_SIZE}",
+    # Negative values are in KiB, 4 MiB per connection
+    "PRAGMA cache_size=-4096",
+    "PRAGMA temp_store=MEMORY",
+)
+# Durable against crashes of Home Assistant, with far fewer fsyncs in WAL mode
+SQLITE_WRITE_PRAGMAS = ("PRAGMA synchronous=NORMAL", "PRAGMA cache_size=-16384")
+
 # Controls how often we clean up
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# Number of recent contexts whose first event is remembered, to record it
+# once a later event refers to the context
+RECORDED_CONTEXTS_SIZE = 2048
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -133,7 +157,7 @@ def run_information(hass, point_in_time: Optional[datetime] = None):
     if run_info:
         return run_info
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return run_information_with_session(session, point_in_time)
 
 
@@ -230,6 +254,9 @@ class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+CommitTask = namedtuple("CommitTask", ["future"])
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -253,7 +280,7 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
-        self.queue: Any = queue.SimpleQueue()
+        self.queue: Any = SpoolingQueue(hass.config.path(DEFAULT_SPOOL_FILE))
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -262,6 +289,7 @@ class Recorder(threading.Thread):
         self.async_db_ready = asyncio.Future()
         self._queue_watch = threading.Event()
         self.engine: Any = None
+        self.read_engine: Any = None
         self.run_info: Any = None
 
         self.entity_filter = entity_filter
@@ -271,9 +299,13 @@ class Recorder(threading.Thread):
         self._commits_without_expire = 0
         self._keepalive_count = 0
         self._old_states = {}
+        self._recorded_contexts = OrderedDict()
         self._pending_expunge = []
+        self._last_checkpoint_ts = None
+        self._next_checkpoint = None
         self.event_session = None
         self.get_session = None
+        self.get_read_session = None
         self._completed_database_setup = None
 
         self.enabled = True
@@ -428,6 +460,10 @@ class Recorder(threading.Thread):
         if isinstance(event, WaitTask):
             self._queue_watch.set()
             return
+        if isinstance(event, CommitTask):
+            self._commit_event_session_or_recover()
+            self.hass.loop.call_soon_threadsafe(_async_set_future_done, event.future)
+            return
         if event.event_type == EVENT_TIME_CHANGED:
             self._keepalive_count += 1
             if self._keepalive_count >= KEEPALIVE_TIME:
@@ -438,6 +474,10 @@ class Recorder(threading.Thread):
                 if self._timechanges_seen >= self.commit_interval:
                     self._timechanges_seen = 0
                     self._commit_event_session_or_recover()
+            now = event.data[ATTR_NOW]
+            if now >= self._next_checkpoint:
+                self._next_checkpoint = now + checkpoint.CHECKPOINT_INTERVAL
+                self._checkpoint_states(now - checkpoint.CHECKPOINT_DELAY)
             return
 
         if not self.enabled:
@@ -450,6 +490,7 @@ class Recorder(threading.Thread):
                 dbevent = Events.from_event(event)
             dbevent.created = event.time_fired
             self.event_session.add(dbevent)
+            self._record_context(event, dbevent)
         except (TypeError, ValueError):
             _LOGGER.warning("Event is not JSON serializable: %s", event)
             return
@@ -490,6 +531,36 @@ class Recorder(threading.Thread):
         if not self.commit_interval:
             self._commit_event_session_or_recover()
 
+    def _record_context(self, event, dbevent):
+        """Record the first event of a context once another event refers to it.
+
+        Most contexts only have one event and are never looked up, the first
+        event is recorded when a later event of the context, or of a child
+        context, is recorded.
+        """
+        context = event.context
+        recorded_contexts = self._recorded_contexts
+        if context.id in recorded_contexts:
+            recorded_contexts.move_to_end(context.id)
+            self._write_context(context.id)
+        else:
+            dbcontext = Contexts.from_event(event)
+            dbcontext.event = dbevent
+            recorded_contexts[context.id] = dbcontext
+            if len(recorded_contexts) > RECORDED_CONTEXTS_SIZE:
+                recorded_contexts.popitem(last=False)
+
+        if context.parent_id is not None:
+            self._write_context(context.parent_id)
+
+    def _write_context(self, context_id):
+        """Add the first event of a recent context if it was not added yet."""
+        dbcontext = self._recorded_contexts.get(context_id)
+        if dbcontext is None:
+            return
+        self._recorded_contexts[context_id] = None
+        self.event_session.add(dbcontext)
+
     def _commit_event_session_or_recover(self):
         """Commit changes to the database and recover if the database fails when possible."""
         try:
@@ -553,6 +624,21 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _checkpoint_states(self, checkpoint_time):
+        """Store the most recent state of each entity."""
+        # The checkpoint must include all states recorded before it
+        self._commit_event_session_or_recover()
+        try:
+            with session_scope(session=self.get_session()) as session:
+                self._last_checkpoint_ts = checkpoint.create_checkpoint(
+                    session,
+                    checkpoint_time,
+                    self._last_checkpoint_ts,
+                    self.run_info.start,
+                )
+        except exc.SQLAlchemyError as err:
+            _LOGGER.warning("Error storing the state checkpoint: %s", err)
+
     def _handle_sqlite_corruption(self):
         """Handle the sqlite3 database being corrupt."""
         self._close_connection()
@@ -562,6 +648,7 @@ class Recorder(threading.Thread):
     def _reopen_event_session(self):
         """Rollback the event session and reopen it after a failure."""
         self._old_states = {}
+        self._recorded_contexts.clear()
 
         try:
             self.event_session.rollback()
@@ -599,6 +686,12 @@ class Recorder(threading.Thread):
         """Listen for new events and put them in the process queue."""
         self.queue.put(event)
 
+    async def async_commit(self):
+        """Wait until the events fired so far are committed to the database."""
+        future = self.hass.loop.create_future()
+        self.queue.put(CommitTask(future))
+        await future
+
     def block_till_done(self):
         """Block till all events processed.
 
@@ -622,6 +715,9 @@ class Recorder(threading.Thread):
 
         def setup_recorder_connection(dbapi_connection, connection_record):
             """Dbapi specific connection settings."""
+            if self._using_file_sqlite:
+                _execute_pragmas(dbapi_connection, SQLITE_WRITE_PRAGMAS)
+
             if self._completed_database_setup:
                 return
 
@@ -629,12 +725,7 @@ class Recorder(threading.Thread):
             # users do not have to pay for it to be loaded in
             # memory
             if self.db_url.startswith(SQLITE_URL_PREFIX):
-                old_isolation = dbapi_connection.isolation_level
-                dbapi_connection.isolation_level = None
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA journal_mode=WAL")
-                cursor.close()
-                dbapi_connection.isolation_level = old_isolation
+                _execute_pragmas(dbapi_connection, ("PRAGMA journal_mode=WAL",))
                 # WAL mode only needs to be setup once
                 # instead of every time we open the sqlite connection
                 # as its persistent and isn't free to call every time.
@@ -666,6 +757,9 @@ class Recorder(threading.Thread):
 
         if self.engine is not None:
             self.engine.dispose()
+        if self.read_engine is not None:
+            self.read_engine.dispose()
+            self.read_engine = None
 
         self.engine = create_engine(self.db_url, **kwargs)
 
@@ -673,6 +767,33 @@ class Recorder(threading.Thread):
 
         Base.metadata.create_all(self.engine)
         self.get_session = scoped_session(sessionmaker(bind=self.engine))
+        self.get_read_session = self.get_session
+
+        if self._using_file_sqlite:
+            self._setup_read_engine()
+
+    def _setup_read_engine(self):
+        """Create the pool of read only connections to a file SQLite database.
+
+        SQLAlchemy does not pool file SQLite connections by default, so every
+        session would open a new connection with a cold page cache.
+        """
+
+        def setup_read_connection(dbapi_connection, connection_record):
+            """Tune a new read only connection."""
+            _execute_pragmas(dbapi_connection, SQLITE_READ_PRAGMAS)
+
+        # A connection is only used by one thread at a time
+        self.read_engine = create_engine(
+            self.db_url,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=DB_READ_POOL_SIZE,
+            max_overflow=0,
+            echo=False,
+        )
+        sqlalchemy_event.listen(self.read_engine, "connect", setup_read_connection)
+        self.get_read_session = scoped_session(sessionmaker(bind=self.read_engine))
 
     @property
     def _using_file_sqlite(self):
@@ -683,9 +804,13 @@ class Recorder(threading.Thread):
 
     def _close_connection(self):
         """Close the connection."""
+        if self.read_engine is not None:
+            self.read_engine.dispose()
+            self.read_engine = None
         self.engine.dispose()
         self.engine = None
         self.get_session = None
+        self.get_read_session = None
 
     def _setup_run(self):
         """Log the start of the current run."""
@@ -705,6 +830,10 @@ class Recorder(threading.Thread):
             session.flush()
             session.expunge(self.run_info)
 
+        # Checkpoints only cover states of the current run
+        self._last_checkpoint_ts = None
+        self._next_checkpoint = self.recording_start + checkpoint.CHECKPOINT_INTERVAL
+
     def _shutdown(self):
         """Save end time for current run."""
         if self.event_session is not None:
@@ -720,3 +849,22 @@ class Recorder(threading.Thread):
 
         self.run_info = None
         self._close_connection()
+        self.queue.close()
+
+
+@callback
+def _async_set_future_done(future):
+    """Mark a future done unless it was cancelled."""
+    if not future.done():
+        future.set_result(None)
+
+
+def _execute_pragmas(dbapi_connection, pragmas):
+    """Execute pragmas on a SQLite connection outside of a transaction."""
+    old_isolation = dbapi_connection.isolation_level
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    for pragma in pragmas:
+        cursor.execute(pragma)
+    cursor.close()
+    dbapi_connection.isolation_level = old_isolation
@@ -0,0 +1,164 @@
+"""Checkpoints of the most recent state of each entity.
+
+Finding the state of every entity at a point in time means finding the
+most recent state of each entity since the recorder run started. The
+recorder regularly stores the result as a checkpoint, so a lookup only
+has to consider the states recorded after the nearest checkpoint.
+"""
+from datetime import datetime, timedelta
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, func, union_all
+
+from .models import StateCheckpoints, States, process_datetime_to_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+CHECKPOINT_INTERVAL = timedelta(hours=1)
+# States that changed this long before the checkpoint are certain to have
+# been added to the recorder queue before the checkpoint is created
+CHECKPOINT_DELAY = timedelta(seconds=10)
+
+
+def _most_recent_states_by_date(
+    session, start_ts: float, end_ts: float, entity_ids: Optional[Iterable[str]]
+):
+    """Return a subquery of the time of the most recent state of each entity."""
+    query = session.query(
+        States.entity_id.label("max_entity_id"),
+        func.max(States.last_updated_ts).label("max_last_updated"),
+    ).filter((States.last_updated_ts >= start_ts) & (States.last_updated_ts < end_ts))
+
+    if entity_ids:
+        query = query.filter(States.entity_id.in_(entity_ids))
+
+    return query.group_by(States.entity_id).subquery()
+
+
+def _most_recent_states_query(session, columns, start_ts, end_ts, entity_ids):
+    """Return a query of columns of the most recent state of each entity."""
+    most_recent_states_by_date = _most_recent_states_by_date(
+        session, start_ts, end_ts, entity_ids
+    )
+    return (
+        session.query(*columns)
+        .join(
+            most_recent_states_by_date,
+            and_(
+                States.entity_id == most_recent_states_by_date.c.max_entity_id,
+                States.last_updated_ts == most_recent_states_by_date.c.max_last_updated,
+            ),
+        )
+        .group_by(States.entity_id)
+    )
+
+
+def most_recent_state_ids(
+    session,
+    start_ts: float,
+    end_ts: float,
+    entity_ids: Optional[Iterable[str]] = None,
+):
+    """Return a subquery of the ids of the most recent state of each entity.
+
+    Only states updated between start_ts and end_ts are considered. The
+    subquery has a single state_id column.
+    """
+    checkpoint_ts = (
+        session.query(func.max(StateCheckpoints.checkpoint_ts))
+        .filter(
+            (StateCheckpoints.checkpoint_ts > start_ts)
+            & (StateCheckpoints.checkpoint_ts <= end_ts)
+        )
+        .scalar()
+    )
+
+    if checkpoint_ts is None:
+        return _most_recent_states_query(
+            session,
+            [func.max(States.state_id).label("state_id")],
+            start_ts,
+            end_ts,
+            entity_ids,
+        ).subquery()
+
+    changed_since_checkpoint = _most_recent_states_query(
+        session,
+        [func.max(States.state_id).label("state_id")],
+        checkpoint_ts,
+        end_ts,
+        entity_ids,
+    )
+    changed_entity_ids = session.query(States.entity_id).filter(
+        (States.last_updated_ts >= checkpoint_ts) & (States.last_updated_ts < end_ts)
+    )
+    unchanged_since_checkpoint = session.query(StateCheckpoints.state_id).filter(
+        (StateCheckpoints.checkpoint_ts == checkpoint_ts)
+        & StateCheckpoints.entity_id.notin_(changed_entity_ids.subquery())
+    )
+    if entity_ids:
+        unchanged_since_checkpoint = unchanged_since_checkpoint.filter(
+            StateCheckpoints.entity_id.in_(entity_ids)
+        )
+
+    return union_all(
+        changed_since_checkpoint.statement, unchanged_since_checkpoint.statement
+    ).alias()
+
+
+def create_checkpoint(
+    session,
+    checkpoint_time: datetime,
+    previous_checkpoint_ts: Optional[float],
+    run_start: datetime,
+) -> float:
+    """Store the most recent state of each entity at checkpoint_time.
+
+    The checkpoint extends the previous checkpoint of the run with the
+    states recorded since. Returns the timestamp of the new checkpoint.
+    """
+    checkpoint_ts = process_datetime_to_timestamp(checkpoint_time)
+    most_recent = {}
+
+    if previous_checkpoint_ts is None:
+        start_ts = process_datetime_to_timestamp(run_start)
+    else:
+        start_ts = previous_checkpoint_ts
+        for entity_id, last_updated_ts, state_id in session.query(
+            StateCheckpoints.entity_id,
+            StateCheckpoints.last_updated_ts,
+            StateCheckpoints.state_id,
+        ).filter(StateCheckpoints.checkpoint_ts == previous_checkpoint_ts):
+            most_recent[entity_id] = (last_updated_ts, state_id)
+
+    # States since the previous checkpoint are always more recent
+    for entity_id, last_updated_ts, state_id in _most_recent_states_query(
+        session,
+        [
+            States.entity_id,
+            func.max(States.last_updated_ts),
+            func.max(States.state_id),
+        ],
+        start_ts,
+        checkpoint_ts,
+        None,
+    ):
+        most_recent[entity_id] = (last_updated_ts, state_id)
+
+    session.bulk_insert_mappings(
+        StateCheckpoints,
+        [
+            {
+                "checkpoint_ts": checkpoint_ts,
+                "entity_id": entity_id,
+                "last_updated_ts": last_updated_ts,
+                "state_id": state_id,
+            }
+            for entity_id, (last_updated_ts, state_id) in most_recent.items()
+        ],
+    )
+    _LOGGER.debug(
+        "Stored checkpoint of %d entities at %s", len(most_recent), checkpoint_time
+    )
+    return checkpoint_ts
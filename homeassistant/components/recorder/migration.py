@@ -1,7 +1,16 @@
 """Schema migration helpers."""
 import logging
 
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, text
+from sqlalchemy import (
+    ForeignKeyConstraint,
+    MetaData,
+    Table,
+    bindparam,
+    func,
+    or_,
+    select,
+    text,
+)
 from sqlalchemy.engine import reflection
 from sqlalchemy.exc import (
     InternalError,
@@ -12,11 +21,22 @@ from sqlalchemy.exc import (
 from sqlalchemy.schema import AddConstraint, DropConstraint
 
 from .const import DOMAIN
-from .models import SCHEMA_VERSION, TABLE_STATES, Base, SchemaChanges
+from .models import (
+    SCHEMA_VERSION,
+    TABLE_CONTEXTS,
+    TABLE_EVENTS,
+    TABLE_STATES,
+    Base,
+    SchemaChanges,
+    process_datetime_to_timestamp,
+)
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows converted per statement when filling the epoch timestamp columns
+TIMESTAMP_BACKFILL_BATCH_SIZE = 10000
+
 
 def migrate_schema(instance):
     """Check if the schema needs to be upgraded."""
@@ -243,6 +263,92 @@ def _update_states_table_with_foreign_key_options(engine):
             )
 
 
+def _backfill_timestamp_columns(engine, table_name, id_column, columns):
+    """Fill epoch timestamp columns from their datetime columns.
+
+    columns maps the epoch column to its datetime column. Converting in
+    Python works the same for every database engine.
+    """
+    _LOGGER.warning(
+        "Converting timestamps of table %s. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!",
+        table_name,
+    )
+    table = Base.metadata.tables[table_name]
+    row_id = table.c[id_column]
+    first_ts_column = table.c[next(iter(columns))]
+    select_query = (
+        select([row_id, *(table.c[column] for column in columns.values())])
+        .where(first_ts_column.is_(None) & (row_id > bindparam("last_id")))
+        .order_by(row_id)
+        .limit(TIMESTAMP_BACKFILL_BATCH_SIZE)
+    )
+    update_query = (
+        table.update()
+        .where(row_id == bindparam("row_id"))
+        .values({column: bindparam(f"new_{column}") for column in columns})
+    )
+
+    last_id = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(select_query, last_id=last_id).fetchall()
+            if not rows:
+                return
+            params = []
+            for row in rows:
+                row_params = {"row_id": row[0]}
+                for column, value in zip(columns, row[1:]):
+                    row_params[f"new_{column}"] = process_datetime_to_timestamp(value)
+                params.append(row_params)
+            connection.execute(update_query, params)
+        last_id = rows[-1][0]
+
+
+def _backfill_contexts(engine):
+    """Record the first event of the contexts other events refer to."""
+    _LOGGER.warning(
+        "Indexing the contexts of recorded events. Note: this can take several "
+        "minutes on large databases and slow computers. Please "
+        "be patient!"
+    )
+    events = Base.metadata.tables[TABLE_EVENTS]
+    parent_ids = select([events.c.context_parent_id]).where(
+        events.c.context_parent_id.isnot(None)
+    )
+    first_event_ids = (
+        select([func.min(events.c.event_id)])
+        .where(events.c.context_id.isnot(None))
+        .group_by(events.c.context_id)
+        # Like the recorder, skip the contexts no other event refers to
+        .having(or_(func.count() > 1, events.c.context_id.in_(parent_ids)))
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            Base.metadata.tables[TABLE_CONTEXTS]
+            .insert()
+            .from_select(
+                [
+                    "context_id",
+                    "event_id",
+                    "context_user_id",
+                    "context_parent_id",
+                    "time_fired_ts",
+                ],
+                select(
+                    [
+                        events.c.context_id,
+                        events.c.event_id,
+                        events.c.context_user_id,
+                        events.c.context_parent_id,
+                        events.c.time_fired_ts,
+                    ]
+                ).where(events.c.event_id.in_(first_event_ids)),
+            )
+        )
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -321,6 +427,35 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 11:
         _create_index(engine, "states", "ix_states_old_state_id")
         _update_states_table_with_foreign_key_options(engine)
+    elif new_version == 12:
+        # Queries compare and read seconds since the epoch, which avoids
+        # converting every datetime read from the database
+        _add_columns(
+            engine,
+            TABLE_STATES,
+            ["last_changed_ts DOUBLE PRECISION", "last_updated_ts DOUBLE PRECISION"],
+        )
+        _add_columns(engine, TABLE_EVENTS, ["time_fired_ts DOUBLE PRECISION"])
+        _backfill_timestamp_columns(
+            engine,
+            TABLE_STATES,
+            "state_id",
+            {"last_updated_ts": "last_updated", "last_changed_ts": "last_changed"},
+        )
+        _backfill_timestamp_columns(
+            engine, TABLE_EVENTS, "event_id", {"time_fired_ts": "time_fired"}
+        )
+        _create_index(engine, TABLE_STATES, "ix_states_last_updated_ts")
+        _create_index(engine, TABLE_STATES, "ix_states_entity_id_last_updated_ts")
+        _drop_index(engine, TABLE_STATES, "ix_states_entity_id_last_updated")
+        _create_index(engine, TABLE_EVENTS, "ix_events_event_type_time_fired_ts")
+        _drop_index(engine, TABLE_EVENTS, "ix_events_event_type_time_fired")
+    elif new_version == 13:
+        # The state_checkpoints table is created by create_all
+        pass
+    elif new_version == 14:
+        # The contexts table is created by create_all
+        _backfill_contexts(engine)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
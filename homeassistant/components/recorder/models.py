@@ -1,4 +1,5 @@
 """Models for SQLAlchemy."""
+from datetime import datetime
 import json
 import logging
 
@@ -6,6 +7,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -13,6 +15,7 @@ from sqlalchemy import (
     Text,
     distinct,
 )
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
@@ -25,7 +28,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 11
+SCHEMA_VERSION = 14
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,9 +38,25 @@ TABLE_EVENTS = "events"
 TABLE_STATES = "states"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
+TABLE_STATE_CHECKPOINTS = "state_checkpoints"
+TABLE_CONTEXTS = "contexts"
 
 ALL_TABLES = [TABLE_STATES, TABLE_EVENTS, TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES]
 
+# Seconds since the epoch, FLOAT is single precision on MySQL
+TIMESTAMP_TYPE = Float().with_variant(mysql.DOUBLE(asdecimal=False), "mysql")
+
+
+def _timestamp_default(column):
+    """Return a default filling an epoch column from its datetime column."""
+
+    def default(context):
+        return process_datetime_to_timestamp(
+            context.get_current_parameters().get(column)
+        )
+
+    return default
+
 
 class Events(Base):  # type: ignore
     """Event history data."""
@@ -52,6 +71,7 @@ class Events(Base):  # type: ignore
     event_data = Column(Text)
     origin = Column(String(32))
     time_fired = Column(DateTime(timezone=True), index=True)
+    time_fired_ts = Column(TIMESTAMP_TYPE, default=_timestamp_default("time_fired"))
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
@@ -60,7 +80,7 @@ class Events(Base):  # type: ignore
     __table_args__ = (
         # Used for fetching events at a specific time
         # see logbook
-        Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index("ix_events_event_type_time_fired_ts", "event_type", "time_fired_ts"),
     )
 
     @staticmethod
@@ -71,6 +91,7 @@ class Events(Base):  # type: ignore
             event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
             origin=str(event.origin.value),
             time_fired=event.time_fired,
+            time_fired_ts=process_datetime_to_timestamp(event.time_fired),
             context_id=event.context.id,
             context_user_id=event.context.user_id,
             context_parent_id=event.context.parent_id,
@@ -115,6 +136,10 @@ class States(Base):  # type: ignore
     )
     last_changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
+    last_changed_ts = Column(TIMESTAMP_TYPE, default=_timestamp_default("last_changed"))
+    last_updated_ts = Column(
+        TIMESTAMP_TYPE, default=_timestamp_default("last_updated"), index=True
+    )
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
     old_state_id = Column(
         Integer, ForeignKey("states.state_id", ondelete="SET NULL"), index=True
@@ -124,8 +149,14 @@ class States(Base):  # type: ignore
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
-        # (get_states in history.py)
-        Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
+        # (get_states in history.py), last_changed_ts is included so
+        # significant changes can be found without reading the table
+        Index(
+            "ix_states_entity_id_last_updated_ts",
+            "entity_id",
+            "last_updated_ts",
+            "last_changed_ts",
+        ),
     )
 
     @staticmethod
@@ -143,12 +174,16 @@ class States(Base):  # type: ignore
             dbstate.attributes = "{}"
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
+            dbstate.last_changed_ts = process_datetime_to_timestamp(event.time_fired)
+            dbstate.last_updated_ts = dbstate.last_changed_ts
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
             dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
+            dbstate.last_changed_ts = process_datetime_to_timestamp(state.last_changed)
+            dbstate.last_updated_ts = process_datetime_to_timestamp(state.last_updated)
 
         return dbstate
 
@@ -210,6 +245,50 @@ class RecorderRuns(Base):  # type: ignore
         return self
 
 
+class StateCheckpoints(Base):  # type: ignore
+    """The most recent state of each entity at a point in time of a recorder run."""
+
+    __tablename__ = TABLE_STATE_CHECKPOINTS
+    checkpoint_id = Column(Integer, primary_key=True)
+    checkpoint_ts = Column(TIMESTAMP_TYPE)
+    entity_id = Column(String(255))
+    state_id = Column(Integer)
+    last_updated_ts = Column(TIMESTAMP_TYPE)
+
+    __table_args__ = (
+        # Used for fetching the states at the start of a period
+        # (get_states in history.py)
+        Index(
+            "ix_state_checkpoints_checkpoint_ts_entity_id",
+            "checkpoint_ts",
+            "entity_id",
+        ),
+    )
+
+
+class Contexts(Base):  # type: ignore
+    """The first event of each context that other events refer to."""
+
+    __tablename__ = TABLE_CONTEXTS
+    context_row_id = Column(Integer, primary_key=True)
+    context_id = Column(String(36), index=True)
+    event_id = Column(Integer, ForeignKey("events.event_id", ondelete="CASCADE"))
+    context_user_id = Column(String(36))
+    context_parent_id = Column(String(36))
+    time_fired_ts = Column(TIMESTAMP_TYPE, index=True)
+    event = relationship("Events", uselist=False)
+
+    @staticmethod
+    def from_event(event):
+        """Create a context database object from the first event of a context."""
+        return Contexts(
+            context_id=event.context.id,
+            context_user_id=event.context.user_id,
+            context_parent_id=event.context.parent_id,
+            time_fired_ts=process_datetime_to_timestamp(event.time_fired),
+        )
+
+
 class SchemaChanges(Base):  # type: ignore
     """Representation of schema version changes."""
 
@@ -238,3 +317,24 @@ def process_timestamp_to_utc_isoformat(ts):
     if ts.tzinfo is None:
         return f"{ts.isoformat()}{DB_TIMEZONE}"
     return ts.astimezone(dt_util.UTC).isoformat()
+
+
+def process_datetime_to_timestamp(ts):
+    """Process a datetime into seconds since the epoch."""
+    if ts is None:
+        return None
+    return process_timestamp(ts).timestamp()
+
+
+def process_epoch_timestamp(ts):
+    """Process seconds since the epoch into a UTC datetime object."""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, dt_util.UTC)
+
+
+def process_epoch_timestamp_to_utc_isoformat(ts):
+    """Process seconds since the epoch into UTC isotime."""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, dt_util.UTC).isoformat()
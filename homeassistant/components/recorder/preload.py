@@ -0,0 +1,151 @@
+"""Load the recorded states of many entities in one query.
+
+Sensors that replay the history of their source entity, like statistics
+and filter, all read it while Home Assistant starts. The requests made
+within PRELOAD_DELAY of each other are read from the database together.
+"""
+from collections import namedtuple
+import logging
+from typing import List, Optional
+
+from sqlalchemy import literal, select, union_all
+
+from homeassistant.core import HomeAssistant, State, callback
+
+from .models import States, process_datetime_to_timestamp
+from .util import execute, session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PRELOADER = "recorder_preloader"
+
+# Seconds to wait for more requests before reading the database
+PRELOAD_DELAY = 0.1
+# SQLite limits the number of terms of a compound select to 500
+MAX_REQUESTS_PER_QUERY = 100
+
+StatesRequest = namedtuple(
+    "StatesRequest",
+    ["entity_id", "start_time", "end_time", "limit", "state_changes_only"],
+)
+
+
+async def async_get_states(
+    hass: HomeAssistant,
+    entity_id: str,
+    start_time=None,
+    end_time=None,
+    limit: Optional[int] = None,
+    state_changes_only: bool = False,
+) -> List[State]:
+    """Return the recorded states of an entity, the oldest first.
+
+    Only the states updated from start_time and before end_time are
+    returned. When limit is set, only the limit most recent of them are
+    returned. When state_changes_only is set, only the states that changed
+    the state, and not just the attributes, are returned.
+    """
+    preloader = hass.data.get(DATA_PRELOADER)
+    if preloader is None:
+        preloader = hass.data[DATA_PRELOADER] = StatesPreloader(hass)
+
+    return await preloader.async_get_states(
+        StatesRequest(
+            entity_id.lower(), start_time, end_time, limit, state_changes_only
+        )
+    )
+
+
+class StatesPreloader:
+    """Collect requests for recorded states and read them in one query."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the preloader."""
+        self.hass = hass
+        self._pending = []
+        self._flush_handle = None
+
+    async def async_get_states(self, request: StatesRequest) -> List[State]:
+        """Return the states of a request once the requests are read."""
+        future = self.hass.loop.create_future()
+        self._pending.append((request, future))
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                PRELOAD_DELAY, self._async_flush
+            )
+        return await future
+
+    @callback
+    def _async_flush(self):
+        """Read the pending requests."""
+        pending, self._pending = self._pending, []
+        self._flush_handle = None
+        self.hass.async_create_task(self._async_load(pending))
+
+    async def _async_load(self, pending):
+        """Read the states of the requests and hand them to the requesters."""
+        requests = [request for request, _ in pending]
+        try:
+            results = await self.hass.async_add_executor_job(
+                _get_states, self.hass, requests
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (_, future), states in zip(pending, results):
+            if not future.done():
+                future.set_result(states)
+
+
+def _get_states(hass, requests):
+    """Return the states of each request, in as few queries as possible."""
+    results = [[] for _ in requests]
+    _LOGGER.debug("Loading the states of %d requests", len(requests))
+
+    with session_scope(hass=hass, read_only=True) as session:
+        for offset in range(0, len(requests), MAX_REQUESTS_PER_QUERY):
+            chunk = requests[offset : offset + MAX_REQUESTS_PER_QUERY]
+            state_ids = union_all(
+                *(
+                    select([_state_ids_query(session, offset + index, request)])
+                    for index, request in enumerate(chunk)
+                )
+            ).alias()
+            query = (
+                session.query(state_ids.c.request_index, States)
+                .join(States, States.state_id == state_ids.c.state_id)
+                .order_by(States.last_updated_ts)
+            )
+            for request_index, row in execute(query):
+                state = row.to_native(validate_entity_id=False)
+                if state is not None:
+                    results[request_index].append(state)
+
+    return results
+
+
+def _state_ids_query(session, request_index, request):
+    """Return a subquery of the ids of the states of a request."""
+    query = session.query(
+        literal(request_index).label("request_index"),
+        States.state_id.label("state_id"),
+    ).filter(States.entity_id == request.entity_id)
+
+    if request.start_time is not None:
+        query = query.filter(
+            States.last_updated_ts >= process_datetime_to_timestamp(request.start_time)
+        )
+    if request.end_time is not None:
+        query = query.filter(
+            States.last_updated_ts < process_datetime_to_timestamp(request.end_time)
+        )
+    if request.state_changes_only:
+        query = query.filter(States.last_changed_ts == States.last_updated_ts)
+    if request.limit is not None:
+        query = query.order_by(States.last_updated_ts.desc()).limit(request.limit)
+
+    # The subquery lets SQLite limit each part of the compound select
+    return query.subquery()
@@ -7,7 +7,7 @@ from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
+from .models import Contexts, Events, RecorderRuns, StateCheckpoints, States
 from .util import execute, session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -58,6 +58,13 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s events", deleted_rows)
 
+            deleted_rows = (
+                session.query(Contexts)
+                .filter(Contexts.time_fired_ts < batch_purge_before.timestamp())
+                .delete(synchronize_session=False)
+            )
+            _LOGGER.debug("Deleted %s contexts", deleted_rows)
+
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
             if batch_purge_before != purge_before:
@@ -73,6 +80,13 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+            deleted_rows = (
+                session.query(StateCheckpoints)
+                .filter(StateCheckpoints.checkpoint_ts < purge_before.timestamp())
+                .delete(synchronize_session=False)
+            )
+            _LOGGER.debug("Deleted %s state_checkpoints", deleted_rows)
+
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
             if instance.engine.driver in ("pysqlite", "postgresql"):
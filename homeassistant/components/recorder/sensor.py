@@ -0,0 +1,59 @@
+"""Sensors of the number of events waiting to be recorded."""
+from homeassistant.helpers.entity import Entity
+
+from .const import DATA_INSTANCE
+
+ICON = "mdi:database-clock"
+UNIT_EVENTS = "events"
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the recorder queue sensors."""
+    queue = hass.data[DATA_INSTANCE].queue
+
+    async_add_entities(
+        [
+            RecorderQueueSensor("Recorder queue", queue, "backlog"),
+            RecorderQueueSensor("Recorder spool", queue, "spooled"),
+        ],
+        True,
+    )
+
+
+class RecorderQueueSensor(Entity):
+    """Representation of the number of events in the recorder queue.
+
+    The backlog is the number of events waiting in memory and the spool
+    the number of events waiting in the spool file.
+    """
+
+    def __init__(self, name, queue, attribute):
+        """Initialize the sensor."""
+        self._name = name
+        self._queue = queue
+        self._attribute = attribute
+        self._state = None
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return self._name
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        return self._state
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit the value is expressed in."""
+        return UNIT_EVENTS
+
+    @property
+    def icon(self):
+        """Return the icon to use in the frontend, if any."""
+        return ICON
+
+    async def async_update(self):
+        """Read the number of events from the queue."""
+        self._state = getattr(self._queue, self._attribute)
@@ -0,0 +1,259 @@
+"""Queue of the recorder that spools events to a file when it is full.
+
+When the database is slow or unavailable the events fired meanwhile pile
+up in the queue of the recorder. Once more than MAX_QUEUE_BACKLOG events
+wait in memory, the following events are handed to a writer thread that
+appends them to a spool file, so putting an event never blocks the event
+loop. The queue keeps the position of the spooled events between the
+other items, so they are read back in the order they were fired.
+"""
+from collections import deque
+import json
+import logging
+import os
+import threading
+
+from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import JSONEncoder
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of events kept in memory before they are spooled
+MAX_QUEUE_BACKLOG = 30000
+
+# Line of an event that could not be encoded
+_SKIPPED_LINE = b"null\n"
+
+
+class _SpooledEvents:
+    """A run of consecutive events in the spool."""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        """Initialize the run."""
+        self.count = 0
+
+
+class SpoolingQueue:
+    """A first in, first out queue that spools events to a file.
+
+    Items are put from the event loop and taken by the recorder thread.
+    The spooled events are written by a writer thread. The events it did
+    not write yet are taken from memory, the file only holds the events
+    before them.
+    """
+
+    def __init__(self, spool_path: str, max_backlog: int = MAX_QUEUE_BACKLOG):
+        """Initialize the queue."""
+        self.spool_path = spool_path
+        self.max_backlog = max_backlog
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._to_write_available = threading.Condition(self._lock)
+        self._written = threading.Condition(self._lock)
+        # Spooled events the writer did not take yet
+        self._to_write = deque()
+        # Number of events the writer is writing and of unread lines
+        self._writing = 0
+        self._unread = 0
+        self._writer_thread = None
+        self._reader = None
+        self._spool_exists = False
+        self._remove_spool = False
+        self._closing = False
+        # Number of events waiting in memory and in the spool
+        self.backlog = 0
+        self.spooled = 0
+
+    def put(self, item):
+        """Add an item to the queue."""
+        with self._lock:
+            if not isinstance(item, Event):
+                self._items.append(item)
+            elif self.backlog < self.max_backlog:
+                self._items.append(item)
+                self.backlog += 1
+            else:
+                self._spool(item)
+            self._not_empty.notify()
+
+    def get(self):
+        """Remove and return the oldest item, waiting for one if needed."""
+        while True:
+            with self._lock:
+                while not self._items:
+                    self._not_empty.wait()
+
+                item = self._items[0]
+                if not isinstance(item, _SpooledEvents):
+                    self._items.popleft()
+                    if isinstance(item, Event):
+                        self.backlog -= 1
+                    return item
+
+                item.count -= 1
+                if not item.count:
+                    self._items.popleft()
+                self.spooled -= 1
+
+                # The events in the file come before the ones being written
+                while not self._unread and self._writing:
+                    self._written.wait()
+                if not self._unread:
+                    event = self._to_write.popleft()
+                    self._check_all_read()
+                    return event
+                self._unread -= 1
+
+            event = self._read_event()
+            if event is not None:
+                return event
+
+    def _spool(self, event):
+        """Hand an event to the writer thread."""
+        if self._writer_thread is None:
+            _LOGGER.warning(
+                "More than %d events wait to be recorded, spooling events to %s",
+                self.max_backlog,
+                self.spool_path,
+            )
+            self._writer_thread = threading.Thread(
+                target=self._write_events, name="Recorder spool", daemon=True
+            )
+            self._writer_thread.start()
+
+        self._to_write.append(event)
+        if not self._items or not isinstance(self._items[-1], _SpooledEvents):
+            self._items.append(_SpooledEvents())
+        self._items[-1].count += 1
+        self.spooled += 1
+        self._to_write_available.notify()
+
+    def _write_events(self):
+        """Write the spooled events to the file, run by the writer thread."""
+        writer = None
+        while True:
+            with self._lock:
+                while (
+                    not self._to_write and not self._remove_spool and not self._closing
+                ):
+                    self._to_write_available.wait()
+                if self._closing:
+                    break
+                events = list(self._to_write)
+                self._to_write.clear()
+                self._writing = len(events)
+                remove_spool, self._remove_spool = self._remove_spool, False
+
+            try:
+                if remove_spool:
+                    # The reader read all the lines, start over with a new file
+                    writer.close()
+                    writer = None
+                    os.remove(self.spool_path)
+                    self._spool_exists = False
+                if not events:
+                    continue
+                if writer is None:
+                    writer = open(self.spool_path, "wb")
+                    self._spool_exists = True
+                writer.write(b"".join(_encode_event(event) for event in events))
+                writer.flush()
+            except OSError as err:
+                _LOGGER.error("Error spooling events, keeping them in memory: %s", err)
+                with self._lock:
+                    self._to_write.extendleft(reversed(events))
+                    self._writing = 0
+                    self._written.notify_all()
+                break
+
+            with self._lock:
+                self._unread += len(events)
+                self._writing = 0
+                self._written.notify_all()
+
+        if writer is not None:
+            writer.close()
+
+    def _read_event(self):
+        """Read the oldest unread event of the spool file.
+
+        Returns None for an event that could not be encoded.
+        """
+        if self._reader is None:
+            self._reader = open(self.spool_path, "rb")
+        line = self._reader.readline()
+
+        with self._lock:
+            self._check_all_read()
+
+        event_dict = json.loads(line)
+        if event_dict is None:
+            return None
+        return _event_from_dict(event_dict)
+
+    def _check_all_read(self):
+        """Have the writer remove the spool file once all its events were read."""
+        if self.spooled or self._reader is None:
+            return
+        self._reader.close()
+        self._reader = None
+        self._remove_spool = True
+        self._to_write_available.notify()
+        _LOGGER.info("All spooled events were read")
+
+    def close(self):
+        """Stop the writer thread and remove the spool file."""
+        with self._lock:
+            self._closing = True
+            self._to_write_available.notify()
+        if self._writer_thread is not None:
+            self._writer_thread.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._spool_exists:
+            os.remove(self.spool_path)
+            self._spool_exists = False
+
+
+def _encode_event(event):
+    """Return the line of an event in the spool file."""
+    try:
+        # Like the recorder, keep NaN values
+        return json.dumps(event.as_dict(), cls=JSONEncoder).encode() + b"\n"
+    except (TypeError, ValueError):
+        _LOGGER.warning("Event is not JSON serializable: %s", event)
+        return _SKIPPED_LINE
+
+
+def _event_from_dict(event_dict):
+    """Return the event of a dict created by Event.as_dict."""
+    event_type = event_dict["event_type"]
+    data = event_dict["data"]
+    if event_type == EVENT_STATE_CHANGED:
+        data["old_state"] = _state_from_dict(data.get("old_state"))
+        data["new_state"] = _state_from_dict(data.get("new_state"))
+    elif event_type == EVENT_TIME_CHANGED:
+        data[ATTR_NOW] = dt_util.parse_datetime(data[ATTR_NOW])
+
+    return Event(
+        event_type,
+        data,
+        EventOrigin(event_dict["origin"]),
+        dt_util.parse_datetime(event_dict["time_fired"]),
+        Context(**event_dict["context"]),
+    )
+
+
+def _state_from_dict(state_dict):
+    """Return the state of a dict created by State.as_dict."""
+    state = State.from_dict(state_dict)
+    if state is not None:
+        # State.from_dict does not restore the parent of the context
+        state.context = Context(**state_dict["context"])
+    return state
@@ -35,6 +35,7 @@ from homeassistant.helpers.script import (
     make_script_schema,
 )
 from homeassistant.helpers.service import async_set_service_schema
+from homeassistant.helpers.trace import CONF_TRACE, trace_run
 from homeassistant.loader import bind_hass
 
 _LOGGER = logging.getLogger(__name__)
@@ -270,6 +271,7 @@ class ScriptEntity(ToggleEntity):
             logger=logging.getLogger(f"{__name__}.{object_id}"),
             variables=cfg.get(CONF_VARIABLES),
         )
+        self._trace_config = cfg.get(CONF_TRACE)
         self._changed = asyncio.Event()
 
     @property
@@ -318,7 +320,7 @@ class ScriptEntity(ToggleEntity):
             {ATTR_NAME: self.script.name, ATTR_ENTITY_ID: self.entity_id},
             context=context,
         )
-        coro = self.script.async_run(variables, context)
+        coro = self._async_run(variables, context)
         if wait:
             await coro
             return
@@ -330,6 +332,10 @@ class ScriptEntity(ToggleEntity):
         self.hass.async_create_task(coro)
         await self._changed.wait()
 
+    async def _async_run(self, variables, context):
+        with trace_run(self.hass, self.entity_id, self._trace_config, context):
+            await self.script.async_run(variables, context)
+
     async def async_turn_off(self, **kwargs):
         """Turn script off."""
         await self.script.async_stop()
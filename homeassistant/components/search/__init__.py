@@ -38,6 +38,7 @@ async def async_setup(hass: HomeAssistant, config: dict):
         vol.Required("item_id"): str,
     }
 )
+@websocket_api.limit_concurrency
 async def websocket_search_related(hass, connection, msg):
     """Handle search."""
     searcher = Searcher(
@@ -1,12 +1,10 @@
 """Support for statistics for sensor values."""
-from collections import deque
 import logging
 import statistics
 
 import voluptuous as vol
 
-from homeassistant.components.recorder.models import States
-from homeassistant.components.recorder.util import execute, session_scope
+from homeassistant.components.recorder import preload
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
@@ -27,6 +25,7 @@ from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.util import dt as dt_util
 
 from . import DOMAIN, PLATFORMS
+from .window import SlidingWindow
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -97,8 +96,8 @@ class StatisticsSensor(Entity):
         self._max_age = max_age
         self._precision = precision
         self._unit_of_measurement = None
-        self.states = deque(maxlen=self._sampling_size)
-        self.ages = deque(maxlen=self._sampling_size)
+        self.states = SlidingWindow(self._sampling_size, not self.is_binary)
+        self.ages = self.states.ages
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -151,11 +150,9 @@ class StatisticsSensor(Entity):
 
         try:
             if self.is_binary:
-                self.states.append(new_state.state)
+                self.states.append(new_state.state, new_state.last_updated)
             else:
-                self.states.append(float(new_state.state))
-
-            self.ages.append(new_state.last_updated)
+                self.states.append(float(new_state.state), new_state.last_updated)
         except ValueError:
             _LOGGER.error(
                 "%s: parsing error, expected number and received %s",
@@ -227,7 +224,6 @@ class StatisticsSensor(Entity):
                 dt_util.as_local(self.ages[0]),
                 (now - self.ages[0]),
             )
-            self.ages.popleft()
             self.states.popleft()
 
     def _next_to_purge_timestamp(self):
@@ -249,28 +245,28 @@ class StatisticsSensor(Entity):
 
         if not self.is_binary:
             try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
+                self.mean = round(self.states.mean(), self._precision)
+                self.median = round(self.states.median(), self._precision)
             except statistics.StatisticsError as err:
                 _LOGGER.debug("%s: %s", self.entity_id, err)
                 self.mean = self.median = STATE_UNKNOWN
 
             try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
+                self.stdev = round(self.states.stdev(), self._precision)
+                self.variance = round(self.states.variance(), self._precision)
             except statistics.StatisticsError as err:
                 _LOGGER.debug("%s: %s", self.entity_id, err)
                 self.stdev = self.variance = STATE_UNKNOWN
 
             if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+                self.total = round(self.states.total(), self._precision)
+                self.min = round(self.states.min(), self._precision)
+                self.max = round(self.states.max(), self._precision)
 
                 self.min_age = self.ages[0]
                 self.max_age = self.ages[-1]
 
-                self.change = self.states[-1] - self.states[0]
+                self.change = self.states.values[-1] - self.states.values[0]
                 self.average_change = self.change
                 self.change_rate = 0
 
@@ -315,9 +311,9 @@ class StatisticsSensor(Entity):
     async def _async_initialize_from_database(self):
         """Initialize the list of states from the database.
 
-        The query will get the list of states in DESCENDING order so that we
-        can limit the result to self._sample_size. Afterwards reverse the
-        list so that we get it in the right order again.
+        The states are read together with the ones of the other sensors
+        that start at the same time, limited to the most recent
+        self._sampling_size states.
 
         If MaxAge is provided then query will restrict to entries younger then
         current datetime - MaxAge.
@@ -325,28 +321,25 @@ class StatisticsSensor(Entity):
 
         _LOGGER.debug("%s: initializing values from the database", self.entity_id)
 
-        with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
-                States.entity_id == self._entity_id.lower()
-            )
-
-            if self._max_age is not None:
-                records_older_then = dt_util.utcnow() - self._max_age
-                _LOGGER.debug(
-                    "%s: retrieve records not older then %s",
-                    self.entity_id,
-                    records_older_then,
-                )
-                query = query.filter(States.last_updated >= records_older_then)
-            else:
-                _LOGGER.debug("%s: retrieving all records", self.entity_id)
-
-            query = query.order_by(States.last_updated.desc()).limit(
-                self._sampling_size
+        records_older_then = None
+        if self._max_age is not None:
+            records_older_then = dt_util.utcnow() - self._max_age
+            _LOGGER.debug(
+                "%s: retrieve records not older then %s",
+                self.entity_id,
+                records_older_then,
             )
-            states = execute(query, to_native=True, validate_entity_ids=False)
+        else:
+            _LOGGER.debug("%s: retrieving all records", self.entity_id)
+
+        states = await preload.async_get_states(
+            self.hass,
+            self._entity_id,
+            start_time=records_older_then,
+            limit=self._sampling_size,
+        )
 
-        for state in reversed(states):
+        for state in states:
             self._add_state_to_queue(state)
 
         self.async_schedule_update_ha_state(True)
@@ -0,0 +1,248 @@
+"""Sliding window of samples with incrementally maintained aggregates."""
+from collections import Counter, deque
+import heapq
+import math
+from statistics import StatisticsError
+
+
+class _SlidingMedian:
+    """Median of a multiset of numbers with lazy removal.
+
+    The lower half of the numbers is kept in a max heap and the upper half
+    in a min heap. Removed numbers stay in the heaps until they reach the
+    top of their heap, so adding and removing a number is O(log n).
+    """
+
+    def __init__(self):
+        """Initialize the median."""
+        # Max heap of the lower half, the numbers are negated
+        self._low = []
+        # Min heap of the upper half
+        self._high = []
+        # Number of numbers in each half that were not removed
+        self._low_size = 0
+        self._high_size = 0
+        # Removed numbers that are still in the heaps
+        self._removed = Counter()
+
+    def add(self, value):
+        """Add a number."""
+        if not self._low_size or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._balance()
+
+    def remove(self, value):
+        """Remove a number that was added."""
+        self._removed[value] += 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune_low()
+        else:
+            self._high_size -= 1
+            if value == self._high[0]:
+                self._prune_high()
+        self._balance()
+
+        # Rebuild the heaps when most of their numbers were removed
+        if len(self._low) + len(self._high) > 2 * (
+            self._low_size + self._high_size + 1
+        ):
+            self._rebuild()
+
+    def median(self):
+        """Return the median of the numbers."""
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def _balance(self):
+        """Keep the lower half equal to or one larger than the upper half."""
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune_low()
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._low_size += 1
+            self._high_size -= 1
+            self._prune_high()
+
+    def _prune_low(self):
+        """Pop the removed numbers from the top of the lower half."""
+        low = self._low
+        removed = self._removed
+        while low and removed[-low[0]]:
+            removed[-low[0]] -= 1
+            heapq.heappop(low)
+
+    def _prune_high(self):
+        """Pop the removed numbers from the top of the upper half."""
+        high = self._high
+        removed = self._removed
+        while high and removed[high[0]]:
+            removed[high[0]] -= 1
+            heapq.heappop(high)
+
+    def _rebuild(self):
+        """Drop the removed numbers from the heaps."""
+        removed = self._removed
+        low = []
+        for value in self._low:
+            if removed[-value]:
+                removed[-value] -= 1
+            else:
+                low.append(value)
+        high = []
+        for value in self._high:
+            if removed[value]:
+                removed[value] -= 1
+            else:
+                high.append(value)
+        heapq.heapify(low)
+        heapq.heapify(high)
+        self._low = low
+        self._high = high
+        self._removed = Counter()
+
+
+class SlidingWindow:
+    """The most recent samples of a sensor and their ages.
+
+    When numeric is set, the aggregates of the samples are updated as
+    samples are added and removed instead of being computed over all the
+    samples, adding or removing a sample is O(log n).
+    """
+
+    def __init__(self, maxlen, numeric=True):
+        """Initialize the window."""
+        self.maxlen = maxlen
+        self.numeric = numeric
+        self.values = deque()
+        self.ages = deque()
+        self._clear_aggregates()
+
+    def __len__(self):
+        """Return the number of samples."""
+        return len(self.values)
+
+    def append(self, value, age):
+        """Add a sample, removing the oldest sample when the window is full."""
+        if len(self.values) == self.maxlen:
+            self.popleft()
+        self.values.append(value)
+        self.ages.append(age)
+        if not self.numeric:
+            return
+
+        index = self._next_index
+        self._next_index += 1
+
+        count = len(self.values)
+        self._total += value
+        delta = value - self._mean
+        self._mean += delta / count
+        self._sum_squares += delta * (value - self._mean)
+
+        self._median.add(value)
+
+        minimums = self._minimums
+        while minimums and minimums[-1][1] >= value:
+            minimums.pop()
+        minimums.append((index, value))
+        maximums = self._maximums
+        while maximums and maximums[-1][1] <= value:
+            maximums.pop()
+        maximums.append((index, value))
+
+    def popleft(self):
+        """Remove the oldest sample."""
+        value = self.values.popleft()
+        self.ages.popleft()
+        if not self.numeric:
+            return
+
+        index = self._first_index
+        self._first_index += 1
+
+        count = len(self.values)
+        if not count:
+            self._clear_aggregates(self._next_index)
+            return
+
+        self._median.remove(value)
+
+        if self._minimums[0][0] == index:
+            self._minimums.popleft()
+        if self._maximums[0][0] == index:
+            self._maximums.popleft()
+
+        # The running sums drift from the exact sums as samples are added
+        # and removed, compute them again once every window of samples
+        self._removals += 1
+        if self._removals >= self.maxlen:
+            self._compute_sums()
+            return
+
+        self._total -= value
+        delta = value - self._mean
+        self._mean -= delta / count
+        self._sum_squares -= delta * (value - self._mean)
+
+    def mean(self):
+        """Return the mean of the samples."""
+        if not self.values:
+            raise StatisticsError("mean requires at least one data point")
+        return self._mean
+
+    def median(self):
+        """Return the median of the samples."""
+        if not self.values:
+            raise StatisticsError("no median for empty data")
+        return self._median.median()
+
+    def variance(self):
+        """Return the sample variance of the samples."""
+        if len(self.values) < 2:
+            raise StatisticsError("variance requires at least two data points")
+        return max(self._sum_squares, 0.0) / (len(self.values) - 1)
+
+    def stdev(self):
+        """Return the sample standard deviation of the samples."""
+        return math.sqrt(self.variance())
+
+    def total(self):
+        """Return the sum of the samples."""
+        return self._total
+
+    def min(self):
+        """Return the smallest sample."""
+        return self._minimums[0][1]
+
+    def max(self):
+        """Return the largest sample."""
+        return self._maximums[0][1]
+
+    def _clear_aggregates(self, next_index=0):
+        """Reset the aggregates of an empty window."""
+        self._first_index = self._next_index = next_index
+        self._total = self._mean = self._sum_squares = 0.0
+        self._removals = 0
+        self._median = _SlidingMedian()
+        # Indexes and values of the samples that are smaller, or larger,
+        # than all the samples added after them
+        self._minimums = deque()
+        self._maximums = deque()
+
+    def _compute_sums(self):
+        """Compute the running sums from the samples."""
+        values = self.values
+        self._total = math.fsum(values)
+        self._mean = self._total / len(values)
+        self._sum_squares = math.fsum((value - self._mean) ** 2 for value in values)
+        self._removals = 0
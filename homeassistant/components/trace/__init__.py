@@ -0,0 +1,63 @@
+"""Support for script and automation tracing and debugging."""
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.trace import async_get_traces, async_list_traced_entities
+
+DOMAIN = "trace"
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Initialize the trace integration."""
+    websocket_api.async_register_command(hass, websocket_trace_get)
+    websocket_api.async_register_command(hass, websocket_trace_list)
+    return True
+
+
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "trace/get",
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Required("run_id"): str,
+    }
+)
+def websocket_trace_get(hass, connection, msg):
+    """Get a script or automation trace."""
+    for trace in async_get_traces(hass, msg[ATTR_ENTITY_ID]):
+        if trace.run_id == msg["run_id"]:
+            connection.send_result(msg["id"], trace.as_dict())
+            return
+
+    connection.send_error(
+        msg["id"], websocket_api.ERR_NOT_FOUND, "The trace could not be found"
+    )
+
+
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "trace/list",
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+    }
+)
+def websocket_trace_list(hass, connection, msg):
+    """Summarize script and automation traces."""
+    if ATTR_ENTITY_ID in msg:
+        entity_ids = [msg[ATTR_ENTITY_ID]]
+    else:
+        entity_ids = async_list_traced_entities(hass)
+
+    connection.send_result(
+        msg["id"],
+        [
+            trace.as_short_dict()
+            for entity_id in entity_ids
+            for trace in async_get_traces(hass, entity_id)
+        ],
+    )
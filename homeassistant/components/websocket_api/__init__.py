@@ -21,6 +21,7 @@ from .const import (  # noqa
 )
 from .decorators import (  # noqa
     async_response,
+    limit_concurrency,
     require_admin,
     websocket_command,
     ws_require_user,
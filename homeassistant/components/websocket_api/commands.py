@@ -14,7 +14,11 @@ from homeassistant.exceptions import (
     Unauthorized,
 )
 from homeassistant.helpers import config_validation as cv, entity
-from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    async_track_state_change_event,
+    async_track_template_result,
+)
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
@@ -29,6 +33,7 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -40,6 +45,8 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_supported_features)
+    async_reg(hass, handle_http_request_stats)
 
 
 def pong_message(iden):
@@ -94,6 +101,59 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends a snapshot of the requested states, followed by compact
+    diffs whenever one of them changes.
+    """
+    entity_ids = msg.get("entity_ids")
+    entity_perm = connection.user.permissions.check_entity
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward entity state changes to websocket."""
+        if not entity_perm(event.data["entity_id"], POLICY_READ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    if entity_ids is None:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes
+        )
+        states = hass.states.async_all()
+    else:
+        # Dispatched per entity id, changes of other entities never reach us
+        connection.subscriptions[msg["id"]] = async_track_state_change_event(
+            hass, entity_ids, forward_entity_changes
+        )
+        states = [
+            state for state in map(hass.states.get, entity_ids) if state is not None
+        ]
+
+    connection.send_result(msg["id"])
+    connection.send_message(
+        messages.event_message(
+            msg["id"],
+            {
+                messages.ENTITY_EVENT_ADD: {
+                    state.entity_id: messages.compressed_state(state)
+                    for state in states
+                    if entity_perm(state.entity_id, POLICY_READ)
+                }
+            },
+        )
+    )
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -188,7 +248,11 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    try:
+        connection.send_message(messages.states_result_message(msg["id"], states))
+    except (ValueError, TypeError):
+        # Let the regular serializer report which data is bad
+        connection.send_message(messages.result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -236,6 +300,27 @@ async def handle_manifest_get(hass, connection, msg):
         connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Integration not found")
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting the features supported by the client."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "http/request_stats"})
+@decorators.require_admin
+def handle_http_request_stats(hass, connection, msg):
+    """Handle getting the timing statistics of the HTTP server per route."""
+    connection.send_result(msg["id"], hass.http.request_stats.as_dict())
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(hass, connection, msg):
@@ -1,6 +1,7 @@
 """Connection session."""
 import asyncio
-from typing import Any, Callable, Dict, Hashable, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Optional
 
 import voluptuous as vol
 
@@ -27,7 +28,9 @@ class ActiveConnection:
             self.refresh_token_id = None
 
         self.subscriptions: Dict[Hashable, Callable[[], Any]] = {}
+        self.supported_features: Dict[str, int] = {}
         self.last_id = 0
+        self._expensive_semaphore: Optional[asyncio.Semaphore] = None
 
     def context(self, msg):
         """Return a context."""
@@ -36,6 +39,33 @@ class ActiveConnection:
             return Context()
         return Context(user_id=user.id)
 
+    @asynccontextmanager
+    async def async_expensive_slot(self, msg_id: int) -> AsyncIterator[None]:
+        """Wait for a free slot to run an expensive command.
+
+        The command can be cancelled with unsubscribe_events while it waits
+        or runs, and is cancelled when the connection closes.
+        """
+        if self._expensive_semaphore is None:
+            self._expensive_semaphore = asyncio.Semaphore(
+                const.MAX_CONCURRENT_EXPENSIVE_PER_CONNECTION
+            )
+        global_semaphore = self.hass.data.get(const.DATA_EXPENSIVE_SEMAPHORE)
+        if global_semaphore is None:
+            global_semaphore = self.hass.data[
+                const.DATA_EXPENSIVE_SEMAPHORE
+            ] = asyncio.Semaphore(const.MAX_CONCURRENT_EXPENSIVE)
+
+        cancel = asyncio.current_task().cancel  # type: ignore
+        self.subscriptions[msg_id] = cancel
+        try:
+            async with self._expensive_semaphore, global_semaphore:
+                yield
+        finally:
+            # The command may have replaced it with a subscription of its own
+            if self.subscriptions.get(msg_id) == cancel:
+                self.subscriptions.pop(msg_id)
+
     @callback
     def send_result(self, msg_id: int, result: Optional[Any] = None) -> None:
         """Send a result message."""
@@ -1,12 +1,10 @@
 """Websocket constants."""
 import asyncio
 from concurrent import futures
-from functools import partial
-import json
 from typing import TYPE_CHECKING, Callable
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection  # noqa
@@ -20,6 +18,12 @@ PENDING_MSG_PEAK = 512
 PENDING_MSG_PEAK_TIME = 5
 MAX_PENDING_MSG = 2048
 
+# Number of expensive commands, like searches and camera thumbnails, that
+# run at the same time per connection and for all connections together.
+# Further commands wait for a slot.
+MAX_CONCURRENT_EXPENSIVE_PER_CONNECTION = 2
+MAX_CONCURRENT_EXPENSIVE = 4
+
 ERR_ID_REUSE = "id_reuse"
 ERR_INVALID_FORMAT = "invalid_format"
 ERR_NOT_FOUND = "not_found"
@@ -33,6 +37,9 @@ ERR_TEMPLATE_ERROR = "template_error"
 
 TYPE_RESULT = "result"
 
+# Features a client can enable with the supported_features command
+FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
@@ -45,4 +52,7 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS = f"{DOMAIN}.connections"
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+# Data used to store the semaphore limiting expensive commands of all connections
+DATA_EXPENSIVE_SEMAPHORE = f"{DOMAIN}.expensive_semaphore"
+
+JSON_DUMP = json_dumps
@@ -36,6 +36,24 @@ def async_response(
     return schedule_handler
 
 
+def limit_concurrency(
+    func: Callable[[HomeAssistant, ActiveConnection, dict], Awaitable[None]]
+) -> Callable[[HomeAssistant, ActiveConnection, dict], Awaitable[None]]:
+    """Decorate an async handler of an expensive command to limit concurrency.
+
+    Use below async_response. The handler waits until the connection and
+    Home Assistant have a free slot for expensive commands.
+    """
+
+    @wraps(func)
+    async def with_limit(hass, connection, msg):
+        """Wait for a slot and run the handler."""
+        async with connection.async_expensive_slot(msg["id"]):
+            await func(hass, connection, msg)
+
+    return with_limit
+
+
 def require_admin(func: const.WebSocketCommandHandler) -> const.WebSocketCommandHandler:
     """Websocket decorator to require user to be an admin."""
 
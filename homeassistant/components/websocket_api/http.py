@@ -16,6 +16,7 @@ from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -63,28 +64,60 @@ class WebSocketHandler:
         self._writer_task = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub = None
+        self._connection = None
 
     async def _writer(self):
         """Write outgoing messages."""
+        to_write = self._to_write
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
+                message = await to_write.get()
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
-
-                if not isinstance(message, str):
-                    message = message_to_json(message)
-
-                await self.wsock.send_str(message)
+                if to_write.empty() or not self._can_coalesce:
+                    await self.wsock.send_str(self._prepare_message(message))
+                    continue
+
+                # Send everything that queued up while we were waiting on the
+                # socket as a single frame, the client unpacks the array.
+                messages = [self._prepare_message(message)]
+                closing = False
+                while not to_write.empty():
+                    message = to_write.get_nowait()
+                    if message is None:
+                        closing = True
+                        break
+                    messages.append(self._prepare_message(message))
+
+                await self.wsock.send_str(f"[{','.join(messages)}]")
+                if closing:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    @property
+    def _can_coalesce(self):
+        """Return if the client accepts multiple messages in a single frame."""
+        connection = self._connection
+        return (
+            connection is not None
+            and connection.supported_features.get(FEATURE_COALESCE_MESSAGES) == 1
+        )
+
+    def _prepare_message(self, message):
+        """Return the message serialized to JSON."""
+        self._logger.debug("Sending %s", message)
+
+        if not isinstance(message, str):
+            message = message_to_json(message)
+
+        return message
+
     @callback
     def _send_message(self, message):
         """Send a message to the client.
@@ -184,7 +217,7 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -2,11 +2,11 @@
 
 from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,6 +31,20 @@ BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 IDEN_TEMPLATE = "__IDEN__"
 IDEN_JSON_TEMPLATE = '"__IDEN__"'
 
+# Short keys used by subscribe_entities to keep state messages small
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+STATE_DIFF_ADDITIONS = "+"
+STATE_DIFF_REMOVALS = "-"
+
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_EVENT_CHANGE = "c"
+
 
 def result_message(iden: int, result: Any = None) -> Dict:
     """Return a success result message."""
@@ -47,6 +61,19 @@ def error_message(iden: int, code: str, message: str) -> Dict:
     }
 
 
+def states_result_message(iden: int, states: List[State]) -> str:
+    """Return a success result message with states, serialized to json.
+
+    Assembled from the cached JSON fragments of the states, so
+    sending many states does not encode them again.
+    """
+    states_json = ",".join(state.as_dict_json() for state in states)
+    return (
+        f'{{"id": {iden}, "type": "{const.TYPE_RESULT}", '
+        f'"success": true, "result": [{states_json}]}}'
+    )
+
+
 def event_message(iden: JSON_TYPE, event: Any) -> Dict:
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
@@ -74,6 +101,83 @@ def _cached_event_message(event: Event) -> str:
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return an event message with the difference between the states of an event.
+
+    Serialize to json once per message, like cached_event_message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the state diff of the event to json."""
+    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+
+
+def _state_diff_event(event: Event) -> Dict:
+    """Convert a state_changed event to the compact subscribe_entities format."""
+    entity_id = event.data["entity_id"]
+    new_state: Optional[State] = event.data["new_state"]
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    old_state: Optional[State] = event.data["old_state"]
+    if old_state is None:
+        return {ENTITY_EVENT_ADD: {entity_id: compressed_state(new_state)}}
+    return {ENTITY_EVENT_CHANGE: {entity_id: _state_diff(old_state, new_state)}}
+
+
+def compressed_state(state: State) -> Dict[str, Any]:
+    """Return a compact dictionary version of a state."""
+    comp_state: Dict[str, Any] = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: _compressed_context(state),
+        COMPRESSED_STATE_LAST_UPDATED: state.last_updated.timestamp(),
+    }
+    if state.last_changed != state.last_updated:
+        comp_state[COMPRESSED_STATE_LAST_CHANGED] = state.last_changed.timestamp()
+    return comp_state
+
+
+def _compressed_context(state: State) -> Any:
+    """Return the context id, or the full context if it has a user or parent."""
+    context = state.context
+    if context.user_id is None and context.parent_id is None:
+        return context.id
+    return context.as_dict()
+
+
+def _state_diff(old_state: State, new_state: State) -> Dict[str, Dict[str, Any]]:
+    """Return the changed parts between two states of an entity."""
+    additions: Dict[str, Any] = {}
+    diff: Dict[str, Dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[COMPRESSED_STATE_CONTEXT] = _compressed_context(new_state)
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes is new_attributes:
+        return diff
+    changed_attributes = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed_attributes:
+        additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+    removed_attributes = [key for key in old_attributes if key not in new_attributes]
+    if removed_attributes:
+        diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: removed_attributes}
+    return diff
+
+
 def message_to_json(message: Any) -> str:
     """Serialize a websocket message to json."""
     try:
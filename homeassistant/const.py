@@ -129,6 +129,7 @@ CONF_OFFSET = "offset"
 CONF_OPTIMISTIC = "optimistic"
 CONF_PACKAGES = "packages"
 CONF_PARAMS = "params"
+CONF_PARALLEL = "parallel"
 CONF_PASSWORD = "password"
 CONF_PATH = "path"
 CONF_PAYLOAD = "payload"
@@ -9,6 +9,7 @@ import datetime
 import enum
 import functools
 import logging
+from operator import attrgetter
 import os
 import pathlib
 import re
@@ -70,6 +71,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.util import location
 from homeassistant.util.async_ import (
     fire_coroutine_threadsafe,
@@ -581,7 +583,7 @@ class HomeAssistant:
 class Context:
     """The context that triggered something."""
 
-    user_id: str = attr.ib(default=None)
+    user_id: Optional[str] = attr.ib(default=None)
     parent_id: Optional[str] = attr.ib(default=None)
     id: str = attr.ib(factory=uuid_util.random_uuid_hex)
 
@@ -879,6 +881,7 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_dict_json",
     ]
 
     def __init__(
@@ -914,6 +917,7 @@ class State:
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_dict_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -946,6 +950,19 @@ class State:
             }
         return self._as_dict
 
+    def as_dict_json(self) -> str:
+        """Return the JSON encoded dict representation of the State.
+
+        Async friendly.
+
+        States are immutable, so the encoded fragment is cached and can be
+        joined into larger responses without encoding the state again.
+        Raises ValueError or TypeError if the attributes can't be serialized.
+        """
+        if self._as_dict_json is None:
+            self._as_dict_json = json_dumps(self.as_dict())
+        return self._as_dict_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -1006,6 +1023,7 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
+        self._sorted_states: Dict[Optional[str], List[State]] = {}
         self._reservations: Set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1079,6 +1097,29 @@ class StateMachine:
             state for state in self._states.values() if state.domain in domain_filter
         ]
 
+    @callback
+    def async_all_sorted(self, domain: Optional[str] = None) -> List[State]:
+        """Return all states, or all states of a domain, sorted by entity_id.
+
+        The list is cached until a state of the domain changes, so it is
+        shared between callers and must not be modified.
+
+        This method must be run in the event loop.
+        """
+        sorted_states = self._sorted_states.get(domain)
+        if sorted_states is None:
+            sorted_states = self._sorted_states[domain] = sorted(
+                self.async_all(domain), key=attrgetter("entity_id")
+            )
+        return sorted_states
+
+    @callback
+    def _async_invalidate_sorted(self, domain: str) -> None:
+        """Drop the sorted states that include a domain."""
+        if self._sorted_states:
+            self._sorted_states.pop(domain, None)
+            self._sorted_states.pop(None, None)
+
     def get(self, entity_id: str) -> Optional[State]:
         """Retrieve state of entity_id or None if not found.
 
@@ -1120,6 +1161,7 @@ class StateMachine:
         if old_state is None:
             return False
 
+        self._async_invalidate_sorted(old_state.domain)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1225,6 +1267,7 @@ class StateMachine:
             old_state is None,
         )
         self._states[entity_id] = state
+        self._async_invalidate_sorted(state.domain)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -1,12 +1,28 @@
 """Offer reusable conditions."""
 import asyncio
 from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 import functools as ft
 import logging
 import re
 import sys
-from typing import Any, Callable, Container, List, Optional, Set, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Dict,
+    Generator,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from homeassistant.components import zone as zone_cmp
 from homeassistant.components.device_automation import (
@@ -35,7 +51,7 @@ from homeassistant.const import (
     SUN_EVENT_SUNSET,
     WEEKDAYS,
 )
-from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.core import Context, HomeAssistant, State, callback
 from homeassistant.exceptions import (
     ConditionError,
     ConditionErrorContainer,
@@ -62,6 +78,121 @@ INPUT_ENTITY_ID = re.compile(
 
 ConditionCheckerType = Callable[[HomeAssistant, TemplateVarsType], bool]
 
+DATA_CONDITION_MEMO = "condition_memo"
+
+StateSnapshotType = Tuple[Tuple[str, Optional[State]], ...]
+
+_MEMO_CONTEXT_ID: ContextVar[Optional[str]] = ContextVar(
+    "condition_memo_context_id", default=None
+)
+
+
+class ConditionMemo:
+    """Remember condition results for evaluations sharing a context.
+
+    A result is only reused while every state it was computed from is the
+    same state object, so automations fired by one state change evaluate a
+    shared condition once.
+    """
+
+    __slots__ = ("context_id", "results")
+
+    def __init__(self) -> None:
+        """Initialize the memo."""
+        self.context_id: Optional[str] = None
+        self.results: Dict[Hashable, Tuple[StateSnapshotType, bool]] = {}
+
+    @callback
+    def async_get(self, hass: HomeAssistant, key: Hashable) -> Optional[bool]:
+        """Return a remembered result if the states it depends on are unchanged."""
+        entry = self.results.get(key)
+        if entry is None:
+            return None
+        snapshot, result = entry
+        for entity_id, state_obj in snapshot:
+            if hass.states.get(entity_id) is not state_obj:
+                return None
+        return result
+
+    @callback
+    def async_set(
+        self, key: Hashable, snapshot: StateSnapshotType, result: bool
+    ) -> None:
+        """Remember a result computed from a state snapshot."""
+        self.results[key] = (snapshot, result)
+
+
+@contextmanager
+def async_memo_context(context: Optional[Context]) -> Generator[None, None, None]:
+    """Share condition results between evaluations made in this context."""
+    token = _MEMO_CONTEXT_ID.set(None if context is None else context.id)
+    try:
+        yield
+    finally:
+        _MEMO_CONTEXT_ID.reset(token)
+
+
+@callback
+def _async_get_memo(hass: HomeAssistant) -> Optional[ConditionMemo]:
+    """Return the memo for the active context, if any."""
+    context_id = _MEMO_CONTEXT_ID.get()
+    if context_id is None:
+        return None
+
+    memo: Optional[ConditionMemo] = hass.data.get(DATA_CONDITION_MEMO)
+    if memo is None:
+        memo = hass.data[DATA_CONDITION_MEMO] = ConditionMemo()
+
+    if memo.context_id != context_id:
+        memo.context_id = context_id
+        memo.results = {}
+
+    return memo
+
+
+@callback
+def _async_snapshot(
+    hass: HomeAssistant, entity_ids: Iterable[str]
+) -> StateSnapshotType:
+    """Capture the current state objects of entities."""
+    return tuple((entity_id, hass.states.get(entity_id)) for entity_id in entity_ids)
+
+
+def _memo_key(*parts: Any) -> Optional[Hashable]:
+    """Build a memo key from config values, None if they are not hashable."""
+    try:
+        hash(parts)
+    except TypeError:
+        return None
+    return parts
+
+
+def _memoize(
+    key: Optional[Hashable], entity_ids: List[str], checker: ConditionCheckerType
+) -> ConditionCheckerType:
+    """Wrap a checker that only depends on the states of entity_ids."""
+    if key is None:
+        return checker
+
+    def memoized_checker(
+        hass: HomeAssistant, variables: TemplateVarsType = None
+    ) -> bool:
+        """Evaluate checker, reusing the result from the active context."""
+        memo = _async_get_memo(hass)
+        if memo is None:
+            return checker(hass, variables)
+
+        result = memo.async_get(hass, key)
+        if result is not None:
+            return result
+
+        snapshot = _async_snapshot(hass, entity_ids)
+        result = checker(hass, variables)
+        memo.async_set(key, snapshot, result)
+        return result
+
+    return memoized_checker
+
 
 async def async_from_config(
     hass: HomeAssistant,
@@ -362,7 +493,18 @@ def async_numeric_state_from_config(
 
         return True
 
-    return if_numeric_state
+    if value_template is not None:
+        # The template may read any state or variable
+        return if_numeric_state
+
+    return _memoize(
+        _memo_key("numeric_state", tuple(entity_ids), attribute, below, above),
+        [
+            *entity_ids,
+            *(threshold for threshold in (below, above) if isinstance(threshold, str)),
+        ],
+        if_numeric_state,
+    )
 
 
 def state(
@@ -460,7 +602,23 @@ def state_from_config(
 
         return True
 
-    return if_state
+    if for_period is not None:
+        # The result depends on the current time
+        return if_state
+
+    return _memoize(
+        _memo_key("state", tuple(entity_ids), tuple(req_states), attribute),
+        [
+            *entity_ids,
+            *(
+                req_state
+                for req_state in req_states
+                if isinstance(req_state, str)
+                and INPUT_ENTITY_ID.match(req_state) is not None
+            ),
+        ],
+        if_state,
+    )
 
 
 def sun(
@@ -564,12 +722,47 @@ def async_template_from_config(
     if config_validation:
         config = cv.TEMPLATE_CONDITION_SCHEMA(config)
     value_template = cast(Template, config.get(CONF_VALUE_TEMPLATE))
+    uses_variables: Optional[bool] = None
 
     def template_if(hass: HomeAssistant, variables: TemplateVarsType = None) -> bool:
         """Validate template based if-condition."""
+        nonlocal uses_variables
+
         value_template.hass = hass
 
-        return async_template(hass, value_template, variables)
+        memo = _async_get_memo(hass)
+        if memo is None or value_template.is_static:
+            return async_template(hass, value_template, variables)
+
+        if uses_variables is None:
+            try:
+                uses_variables = bool(value_template.referenced_variables())
+            except TemplateError:
+                uses_variables = True
+        if uses_variables:
+            return async_template(hass, value_template, variables)
+
+        key = ("template", value_template)
+        result = memo.async_get(hass, key)
+        if result is not None:
+            return result
+
+        render_info = value_template.async_render_to_info(variables, parse_result=False)
+        try:
+            value: str = render_info.result()
+        except TemplateError as ex:
+            raise ConditionErrorMessage("template", str(ex)) from ex
+
+        result = value.lower() == "true"
+        if not (
+            render_info.all_states
+            or render_info.all_states_lifecycle
+            or render_info.domains
+            or render_info.domains_lifecycle
+            or render_info.has_time
+        ):
+            memo.async_set(key, _async_snapshot(hass, render_info.entities), result)
+        return result
 
     return template_if
 
@@ -738,7 +931,11 @@ def zone_from_config(
 
         return all_ok
 
-    return if_in_zone
+    return _memoize(
+        _memo_key("zone", tuple(entity_ids), tuple(zone_entity_ids)),
+        [*entity_ids, *zone_entity_ids],
+        if_in_zone,
+    )
 
 
 async def async_device_from_config(
@@ -143,6 +143,8 @@ class DeviceRegistry:
         self.hass = hass
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self._clear_index()
+        # Increased when a device changes, before the update event is fired
+        self.generation = 0
         self.hass.bus.async_listen(
             EVENT_CONFIG_ENTRY_DISABLED_BY_UPDATED,
             self.async_config_entry_disabled_by_changed,
@@ -206,6 +208,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices[device.id] = device
+            self.generation += 1
 
         _add_device_to_index(devices_index, device)
 
@@ -217,12 +220,14 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices.pop(device.id)
+            self.generation += 1
 
         _remove_device_from_index(devices_index, device)
 
     def _update_device(self, old_device: DeviceEntry, new_device: DeviceEntry) -> None:
         """Update a device and the index."""
         self.devices[new_device.id] = new_device
+        self.generation += 1
 
         devices_index = self._devices_index[REGISTERED_DEVICE]
         _remove_device_from_index(devices_index, old_device)
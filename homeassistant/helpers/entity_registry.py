@@ -154,6 +154,8 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        # Increased when an entry changes, before the update event is fired
+        self.generation = 0
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
@@ -598,6 +600,7 @@ class EntityRegistry:
     def _register_entry(self, entry: RegistryEntry) -> None:
         self.entities[entry.entity_id] = entry
         self._add_index(entry)
+        self.generation += 1
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
@@ -605,6 +608,7 @@ class EntityRegistry:
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
         del self.entities[entry.entity_id]
+        self.generation += 1
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
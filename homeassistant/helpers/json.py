@@ -1,9 +1,35 @@
-"""Helpers to help with encoding Home Assistant objects in JSON."""
+"""Helpers to help with encoding Home Assistant objects in JSON.
+
+Encoding goes through orjson when it is installed and falls back to the
+standard library otherwise. Both backends write the same compact JSON,
+with NaN and infinity written as null.
+
+Files and database rows keep using the standard library, so their format
+doesn't depend on the installed backend and they can hold NaN.
+"""
 from datetime import datetime
 import json
+import math
 from typing import Any
 
 
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Raises TypeError for objects that can't be converted.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, tuple):
+        # Named tuples, which orjson doesn't encode
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
 
@@ -12,11 +38,79 @@ class JSONEncoder(json.JSONEncoder):
 
         Hand other objects to the original method.
         """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
+        if isinstance(o, (datetime, set)) or hasattr(o, "as_dict"):
+            return json_encoder_default(o)
 
         return json.JSONEncoder.default(self, o)
+
+
+def _stdlib_json_dumps(data: Any) -> str:
+    """Encode data to JSON with the standard library, like orjson does."""
+    try:
+        return json.dumps(
+            data,
+            cls=JSONEncoder,
+            allow_nan=False,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    except ValueError:
+        # NaN or infinity, encode them as null
+        return json.dumps(
+            _replace_non_finite(data), ensure_ascii=False, separators=(",", ":")
+        )
+
+
+def _replace_non_finite(obj: Any) -> Any:
+    """Return plain data with NaN and infinity replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if obj is None or isinstance(obj, (str, int)):
+        return obj
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    return _replace_non_finite(json_encoder_default(obj))
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+
+    def json_dumps(data: Any) -> str:
+        """Encode data that may contain Home Assistant objects to JSON."""
+        return _stdlib_json_dumps(data)
+
+    def json_bytes(data: Any) -> bytes:
+        """Encode data that may contain Home Assistant objects to JSON bytes."""
+        return _stdlib_json_dumps(data).encode("utf-8")
+
+
+else:
+    # Datetimes are handed to json_encoder_default to format them the same
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def json_bytes(data: Any) -> bytes:
+        """Encode data that may contain Home Assistant objects to JSON bytes."""
+        try:
+            return orjson.dumps(
+                data, option=_ORJSON_OPTIONS, default=json_encoder_default
+            )
+        except orjson.JSONEncodeError:
+            # The standard library encodes integers over 64 bits, and raises
+            # the error for objects neither of them can encode
+            return _stdlib_json_dumps(data).encode("utf-8")
+
+    def json_dumps(data: Any) -> str:
+        """Encode data that may contain Home Assistant objects to JSON."""
+        return json_bytes(data).decode("utf-8")
+
+
+def json_dumps_pretty(data: Any) -> str:
+    """Encode plain data to indented JSON, for files read by humans."""
+    return json.dumps(data, indent=4)
@@ -41,6 +41,7 @@ from homeassistant.const import (
     CONF_EVENT_DATA,
     CONF_EVENT_DATA_TEMPLATE,
     CONF_MODE,
+    CONF_PARALLEL,
     CONF_REPEAT,
     CONF_SCENE,
     CONF_SEQUENCE,
@@ -65,6 +66,15 @@ from homeassistant.core import (
 from homeassistant.helpers import condition, config_validation as cv, service, template
 from homeassistant.helpers.event import async_call_later, async_track_template
 from homeassistant.helpers.script_variables import ScriptVariables
+from homeassistant.helpers.trace import (
+    CONF_TRACE,
+    TRACE_CONFIG_SCHEMA,
+    async_trace_set_result,
+    async_trace_step_finish,
+    async_trace_step_start,
+    trace_path,
+    trace_script_run,
+)
 from homeassistant.helpers.trigger import (
     async_initialize_triggers,
     async_validate_trigger_config,
@@ -122,6 +132,7 @@ def make_script_schema(schema, default_script_mode, extra=vol.PREVENT_EXTRA):
             vol.Optional(CONF_MAX_EXCEEDED, default=DEFAULT_MAX_EXCEEDED): vol.All(
                 vol.Upper, vol.In(_MAX_EXCEEDED_CHOICES)
             ),
+            vol.Optional(CONF_TRACE): TRACE_CONFIG_SCHEMA,
         },
         extra=extra,
     )
@@ -178,6 +189,12 @@ async def async_validate_action_config(
             hass, config[CONF_REPEAT][CONF_SEQUENCE]
         )
 
+    elif action_type == cv.SCRIPT_ACTION_PARALLEL:
+        for parallel_conf in config[CONF_PARALLEL]:
+            parallel_conf[CONF_SEQUENCE] = await async_validate_actions_config(
+                hass, parallel_conf[CONF_SEQUENCE]
+            )
+
     elif action_type == cv.SCRIPT_ACTION_CHOOSE:
         if CONF_DEFAULT in config:
             config[CONF_DEFAULT] = await async_validate_actions_config(
@@ -258,16 +275,23 @@ class _ScriptRun:
             self._finish()
 
     async def _async_step(self, log_exceptions):
+        trace_element = async_trace_step_start(
+            ("sequence", str(self._step)), self._variables
+        )
         try:
             await getattr(
                 self, f"_async_{cv.determine_script_action(self._action)}_step"
             )()
         except Exception as ex:
-            if not isinstance(ex, (_StopScript, asyncio.CancelledError)) and (
-                self._log_exceptions or log_exceptions
-            ):
-                self._log_exception(ex)
+            if not isinstance(ex, (_StopScript, asyncio.CancelledError)):
+                if trace_element is not None:
+                    trace_element.set_error(ex)
+                if self._log_exceptions or log_exceptions:
+                    self._log_exception(ex)
             raise
+        finally:
+            if trace_element is not None:
+                async_trace_step_finish(trace_element)
 
     def _finish(self) -> None:
         self._script._runs.remove(self)  # pylint: disable=protected-access
@@ -338,11 +362,12 @@ class _ScriptRun:
 
         delay = delay.total_seconds()
         self._changed()
+        async_trace_set_result(delay=delay, done=False)
         try:
             async with async_timeout.timeout(delay):
                 await self._stop.wait()
         except asyncio.TimeoutError:
-            pass
+            async_trace_set_result(delay=delay, done=True)
 
     async def _async_wait_template_step(self):
         """Handle a wait template."""
@@ -361,6 +386,7 @@ class _ScriptRun:
         # check if condition already okay
         if condition.async_template(self._hass, wait_template, self._variables):
             self._variables["wait"]["completed"] = True
+            async_trace_set_result(wait=self._variables["wait"])
             return
 
         @callback
@@ -394,6 +420,7 @@ class _ScriptRun:
             for task in tasks:
                 task.cancel()
             unsub()
+            async_trace_set_result(wait=self._variables["wait"])
 
     async def _async_run_long_action(self, long_task):
         """Run a long task while monitoring for stop request."""
@@ -437,6 +464,7 @@ class _ScriptRun:
         params = service.async_prepare_call_from_config(
             self._hass, self._action, self._variables
         )
+        async_trace_set_result(params=params)
 
         running_script = (
             params[CONF_DOMAIN] == "automation"
@@ -503,6 +531,7 @@ class _ScriptRun:
                     "Error rendering event data template: %s", ex, level=logging.ERROR
                 )
 
+        async_trace_set_result(event=self._action[CONF_EVENT], event_data=event_data)
         self._hass.bus.async_fire(
             self._action[CONF_EVENT], event_data, context=self._context
         )
@@ -520,6 +549,7 @@ class _ScriptRun:
             check = False
 
         self._log("Test condition %s: %s", self._script.last_action, check)
+        async_trace_set_result(result=check)
         if not check:
             raise _StopScript
 
@@ -541,7 +571,8 @@ class _ScriptRun:
 
         async def async_run_sequence(iteration, extra_msg=""):
             self._log("Repeating %s: Iteration %i%s", description, iteration, extra_msg)
-            await self._async_run_script(script)
+            with trace_path(("repeat",)):
+                await self._async_run_script(script)
 
         if CONF_COUNT in repeat:
             count = repeat[CONF_COUNT]
@@ -606,18 +637,22 @@ class _ScriptRun:
         # pylint: disable=protected-access
         choose_data = await self._script._async_get_choose_data(self._step)
 
-        for conditions, script in choose_data["choices"]:
+        for idx, (conditions, script) in enumerate(choose_data["choices"]):
             try:
                 if all(
                     condition(self._hass, self._variables) for condition in conditions
                 ):
-                    await self._async_run_script(script)
+                    async_trace_set_result(choice=idx)
+                    with trace_path(("choose", str(idx))):
+                        await self._async_run_script(script)
                     return
             except exceptions.ConditionError as ex:
                 _LOGGER.warning("Error in 'choose' evaluation:\n%s", ex)
 
         if choose_data["default"]:
-            await self._async_run_script(choose_data["default"])
+            async_trace_set_result(choice="default")
+            with trace_path(("default",)):
+                await self._async_run_script(choose_data["default"])
 
     async def _async_wait_for_trigger_step(self):
         """Wait for a trigger event."""
@@ -672,6 +707,7 @@ class _ScriptRun:
             for task in tasks:
                 task.cancel()
             remove_triggers()
+            async_trace_set_result(wait=self._variables["wait"])
 
     async def _async_variables_step(self):
         """Set a variable value."""
@@ -680,11 +716,32 @@ class _ScriptRun:
             self._hass, self._variables, render_as_defaults=False
         )
 
-    async def _async_run_script(self, script):
+    async def _async_parallel_step(self) -> None:
+        """Run sequences in parallel."""
+        # pylint: disable=protected-access
+        scripts = self._script._get_parallel_scripts(self._step)
+
+        async def async_run_branch(idx, script):
+            with trace_path(("parallel", str(idx))):
+                # Each branch gets its own variables, so steps like wait or
+                # repeat in one branch can't interfere with the others.
+                await self._async_run_script(script, dict(self._variables))
+
+        results = await asyncio.gather(
+            *(async_run_branch(idx, script) for idx, script in enumerate(scripts)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    async def _async_run_script(self, script, variables=None):
         """Execute a script."""
         await self._async_run_long_action(
             self._hass.async_create_task(
-                script.async_run(self._variables, self._context)
+                script.async_run(
+                    self._variables if variables is None else variables, self._context
+                )
             )
         )
 
@@ -843,6 +900,7 @@ class Script:
             self._queue_lck = asyncio.Lock()
         self._config_cache: Dict[Set[Tuple], Callable[..., bool]] = {}
         self._repeat_script: Dict[int, Script] = {}
+        self._parallel_scripts: Dict[int, List[Script]] = {}
         self._choose_data: Dict[int, Dict[str, Any]] = {}
         self._referenced_entities: Optional[Set[str]] = None
         self._referenced_devices: Optional[Set[str]] = None
@@ -877,6 +935,9 @@ class Script:
         self._set_logger(logger)
         for script in self._repeat_script.values():
             script.update_logger(self._logger)
+        for scripts in self._parallel_scripts.values():
+            for script in scripts:
+                script.update_logger(self._logger)
         for choose_data in self._choose_data.values():
             for _, script in choose_data["choices"]:
                 script.update_logger(self._logger)
@@ -1038,7 +1099,11 @@ class Script:
         self._changed()
 
         try:
-            await asyncio.shield(run.async_run())
+            if self._top_level:
+                with trace_script_run():
+                    await asyncio.shield(run.async_run())
+            else:
+                await asyncio.shield(run.async_run())
         except asyncio.CancelledError:
             await run.async_stop()
             self._changed()
@@ -1091,6 +1156,37 @@ class Script:
             self._repeat_script[step] = sub_script
         return sub_script
 
+    def _prep_parallel_scripts(self, step):
+        action = self.sequence[step]
+        step_name = action.get(CONF_ALIAS, f"Parallel action at step {step+1}")
+        parallel_scripts = []
+        for idx, parallel_conf in enumerate(action[CONF_PARALLEL], start=1):
+            branch_name = parallel_conf.get(CONF_ALIAS, f"parallel {idx}")
+            sub_script = Script(
+                self._hass,
+                parallel_conf[CONF_SEQUENCE],
+                f"{self.name}: {step_name}: {branch_name}",
+                self.domain,
+                running_description=self.running_description,
+                script_mode=SCRIPT_MODE_PARALLEL,
+                max_runs=self.max_runs,
+                logger=self._logger,
+                top_level=False,
+            )
+            sub_script.change_listener = partial(
+                self._chain_change_listener, sub_script
+            )
+            parallel_scripts.append(sub_script)
+
+        return parallel_scripts
+
+    def _get_parallel_scripts(self, step):
+        parallel_scripts = self._parallel_scripts.get(step)
+        if not parallel_scripts:
+            parallel_scripts = self._prep_parallel_scripts(step)
+            self._parallel_scripts[step] = parallel_scripts
+        return parallel_scripts
+
     async def _async_prep_choose_data(self, step):
         action = self.sequence[step]
         step_name = action.get(CONF_ALIAS, f"Choose at step {step+1}")
@@ -10,15 +10,27 @@ from functools import partial, wraps
 import json
 import logging
 import math
-from operator import attrgetter
 import random
 import re
-from typing import Any, Dict, Generator, Iterable, Optional, Type, Union, cast
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
 import jinja2
 from jinja2 import contextfilter, contextfunction
+import jinja2.meta
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace  # type: ignore
 import voluptuous as vol
@@ -47,6 +59,7 @@ _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
+_SORTED_STATES = "template.sorted_states"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 
@@ -90,20 +103,103 @@ def attach(hass: HomeAssistantType, obj: Any) -> None:
 def render_complex(
     value: Any, variables: TemplateVarsType = None, limited: bool = False
 ) -> Any:
-    """Recursive template creator helper function."""
+    """Recursive template creator helper function.
+
+    The templates are rendered with render_many, so code outside of the
+    event loop renders the whole structure with a single call into it.
+    """
+    templates: List[Template] = []
+    _collect_templates(value, templates)
+    results = render_many([(tpl, variables) for tpl in templates], limited=limited)
+    return _replace_templates(value, iter(results))
+
+
+def _collect_templates(value: Any, templates: List[Template]) -> None:
+    """Add the templates of a data structure to templates."""
     if isinstance(value, list):
-        return [render_complex(item, variables) for item in value]
+        for item in value:
+            _collect_templates(item, templates)
+    elif isinstance(value, collections.abc.Mapping):
+        for key, item in value.items():
+            _collect_templates(key, templates)
+            _collect_templates(item, templates)
+    elif isinstance(value, Template):
+        templates.append(value)
+
+
+def _replace_templates(value: Any, results: Iterator[Any]) -> Any:
+    """Return a data structure with its templates replaced by results."""
+    if isinstance(value, list):
+        return [_replace_templates(item, results) for item in value]
     if isinstance(value, collections.abc.Mapping):
         return {
-            render_complex(key, variables): render_complex(item, variables)
+            _replace_templates(key, results): _replace_templates(item, results)
             for key, item in value.items()
         }
     if isinstance(value, Template):
-        return value.async_render(variables, limited=limited)
+        return next(results)
 
     return value
 
 
+def _is_event_loop_thread() -> bool:
+    """Return if we are running inside an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def render_many(
+    renders: Iterable[Tuple[Template, TemplateVarsType]],
+    parse_result: bool = True,
+    limited: bool = False,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Render many templates with a single call into the event loop.
+
+    Meant for code running outside of the event loop that needs to render
+    several templates, rendering them one by one costs a round trip each.
+    In the event loop the templates are rendered directly.
+    If return_exceptions is True, a TemplateError is returned instead of the
+    result of a template that failed to render.
+    """
+    renders = list(renders)
+    hass = next((tpl.hass for tpl, _ in renders if not tpl.is_static), None)
+    if hass is None or _is_event_loop_thread() or not hass.loop.is_running():
+        # Static templates don't need the event loop and it can't be called
+        # into from its own thread or before it runs
+        return async_render_many(renders, parse_result, limited, return_exceptions)
+
+    return run_callback_threadsafe(
+        hass.loop,
+        partial(async_render_many, renders, parse_result, limited, return_exceptions),
+    ).result()
+
+
+@callback
+def async_render_many(
+    renders: Iterable[Tuple[Template, TemplateVarsType]],
+    parse_result: bool = True,
+    limited: bool = False,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Render many templates.
+
+    This method must be run in the event loop.
+    """
+    results: List[Any] = []
+    for tpl, variables in renders:
+        try:
+            results.append(tpl.async_render(variables, parse_result, limited))
+        except TemplateError as err:
+            if not return_exceptions:
+                raise
+            results.append(err)
+    return results
+
+
 def is_complex(value: Any) -> bool:
     """Test if data structure is a complex template."""
     if isinstance(value, Template):
@@ -319,6 +415,19 @@ class Template:
         except jinja2.TemplateError as err:
             raise TemplateError(err) from err
 
+    def referenced_variables(self) -> Set[str]:
+        """Return the variables the template references.
+
+        Names of the template globals, like states or now, are left out.
+        """
+        env = self._env
+        try:
+            parsed = env.parse(self.template)
+        except jinja2.TemplateError as err:
+            raise TemplateError(err) from err
+        names: Set[str] = jinja2.meta.find_undeclared_variables(parsed)  # type: ignore[no-untyped-call]
+        return names.difference(env.globals)
+
     def render(
         self,
         variables: TemplateVarsType = None,
@@ -778,10 +887,32 @@ def _collect_state(hass: HomeAssistantType, entity_id: str) -> None:
         entity_collect.entities.add(entity_id)
 
 
-def _state_generator(hass: HomeAssistantType, domain: Optional[str]) -> Generator:
+def _state_generator(hass: HomeAssistantType, domain: Optional[str]) -> Iterator:
     """State generator for a domain or all states."""
-    for state in sorted(hass.states.async_all(domain), key=attrgetter("entity_id")):
-        yield TemplateState(hass, state, collect=False)
+    return iter(_get_sorted_template_states(hass, domain))
+
+
+def _get_sorted_template_states(
+    hass: HomeAssistantType, domain: Optional[str]
+) -> List[TemplateState]:
+    """Return template states sorted by entity_id.
+
+    The wrappers are reused by all renders until a state of the domain changes.
+    """
+    states = hass.states.async_all_sorted(domain)
+    cache: Optional[
+        Dict[Optional[str], Tuple[List[State], List[TemplateState]]]
+    ] = hass.data.get(_SORTED_STATES)
+    if cache is None:
+        cache = hass.data[_SORTED_STATES] = {}
+
+    cached = cache.get(domain)
+    if cached is not None and cached[0] is states:
+        return cached[1]
+
+    template_states = [TemplateState(hass, state, collect=False) for state in states]
+    cache[domain] = (states, template_states)
+    return template_states
 
 
 def _get_state_if_valid(
@@ -863,10 +994,13 @@ def expand(hass: HomeAssistantType, *args: Any) -> Iterable[State]:
             if group_entities:
                 search += group_entities
         else:
-            _collect_state(hass, entity_id)
             found[entity_id] = entity
 
-    return sorted(found.values(), key=lambda a: a.entity_id)
+    entity_collect = hass.data.get(_RENDER_INFO)
+    if entity_collect is not None:
+        entity_collect.entities.update(found)
+
+    return [found[entity_id] for entity_id in sorted(found)]
 
 
 def device_entities(hass: HomeAssistantType, device_id: str) -> Iterable[str]:
@@ -0,0 +1,303 @@
+"""Helpers for tracing script and automation runs."""
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+import datetime as dt
+import itertools
+from typing import Any, Deque, Dict, Generator, List, Optional, Sequence, Tuple
+
+import voluptuous as vol
+
+from homeassistant.core import Context, HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
+
+CONF_STORED_TRACES = "stored_traces"
+CONF_TRACE = "trace"
+
+DATA_TRACE = "trace"
+
+DEFAULT_STORED_TRACES = 5
+# Number of elements kept per step path, steps in a loop are only kept this often
+TRACE_ELEMENT_MAX_LEN = 20
+
+TRACE_CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONF_STORED_TRACES, default=DEFAULT_STORED_TRACES
+        ): cv.positive_int,
+    }
+)
+
+_SENTINEL = object()
+
+
+class TraceElement:
+    """Container for the trace of a single step."""
+
+    __slots__ = (
+        "path",
+        "_error",
+        "_finished",
+        "_result",
+        "_timestamp",
+        "_variables",
+        "_tokens",
+    )
+
+    def __init__(self, path: str, variables: Dict[str, Any]) -> None:
+        """Initialize the element."""
+        self.path = path
+        self._error: Optional[Exception] = None
+        self._finished: Optional[dt.datetime] = None
+        self._result: Optional[Dict[str, Any]] = None
+        self._timestamp = dt_util.utcnow()
+        self._variables = variables
+        self._tokens: Tuple[Token, ...] = ()
+
+    def __repr__(self) -> str:
+        """Container for trace data."""
+        return str(self.as_dict())
+
+    def set_error(self, ex: Exception) -> None:
+        """Set error."""
+        self._error = ex
+
+    def set_result(self, **kwargs: Any) -> None:
+        """Set result."""
+        self._result = {**kwargs}
+
+    def finish(self) -> None:
+        """Mark the step as finished."""
+        self._finished = dt_util.utcnow()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return dictionary version of this TraceElement."""
+        result: Dict[str, Any] = {
+            "path": self.path,
+            "timestamp": self._timestamp,
+            "finished": self._finished,
+        }
+        if self._variables:
+            result["changed_variables"] = self._variables
+        if self._error is not None:
+            result["error"] = str(self._error)
+        if self._result is not None:
+            result["result"] = self._result
+        return result
+
+
+class RunTrace:
+    """Container for the trace of a script or automation run."""
+
+    _run_ids = itertools.count()
+
+    def __init__(self, entity_id: str, context: Optional[Context]) -> None:
+        """Initialize the trace."""
+        self.entity_id = entity_id
+        self.run_id = str(next(self._run_ids))
+        self.claimed = False
+        self._context = context
+        self._error: Optional[Exception] = None
+        self._elements: Dict[str, Deque[TraceElement]] = {}
+        self._last_variables: Dict[str, Any] = {}
+        self._state = "running"
+        self._timestamp_start = dt_util.utcnow()
+        self._timestamp_finish: Optional[dt.datetime] = None
+
+    def __repr__(self) -> str:
+        """Container for trace data."""
+        return str(self.as_dict())
+
+    @callback
+    def async_add_element(self, element: TraceElement) -> None:
+        """Add a step to the trace."""
+        elements = self._elements.get(element.path)
+        if elements is None:
+            elements = self._elements[element.path] = deque(
+                maxlen=TRACE_ELEMENT_MAX_LEN
+            )
+        elements.append(element)
+
+    @callback
+    def async_changed_variables(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Return variables changed since the previous step."""
+        last_variables = self._last_variables
+        changed = {
+            key: value
+            for key, value in variables.items()
+            if last_variables.get(key, _SENTINEL) != value
+        }
+        self._last_variables = dict(variables)
+        return changed
+
+    def set_error(self, ex: Exception) -> None:
+        """Set error."""
+        self._error = ex
+
+    def finish(self) -> None:
+        """Mark the run as finished."""
+        self._timestamp_finish = dt_util.utcnow()
+        self._state = "stopped"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return dictionary version of this RunTrace."""
+        result = self.as_short_dict()
+        result.update(
+            {
+                "trace": {
+                    path: [element.as_dict() for element in elements]
+                    for path, elements in self._elements.items()
+                },
+                "context": self._context,
+            }
+        )
+        return result
+
+    def as_short_dict(self) -> Dict[str, Any]:
+        """Return a brief dictionary version of this RunTrace."""
+        result: Dict[str, Any] = {
+            "entity_id": self.entity_id,
+            "run_id": self.run_id,
+            "state": self._state,
+            "timestamp": {
+                "start": self._timestamp_start,
+                "finish": self._timestamp_finish,
+            },
+        }
+        if self._error is not None:
+            result["error"] = str(self._error)
+        return result
+
+
+trace_cv: ContextVar[Optional[RunTrace]] = ContextVar("trace_cv", default=None)
+trace_path_cv: ContextVar[Tuple[str, ...]] = ContextVar("trace_path_cv", default=())
+trace_element_cv: ContextVar[Optional[TraceElement]] = ContextVar(
+    "trace_element_cv", default=None
+)
+
+
+@callback
+def async_get_traces(hass: HomeAssistant, entity_id: str) -> List[RunTrace]:
+    """Return the stored traces of a script or automation, oldest first."""
+    return list(hass.data.get(DATA_TRACE, {}).get(entity_id, ()))
+
+
+@callback
+def async_list_traced_entities(hass: HomeAssistant) -> List[str]:
+    """Return the scripts and automations with stored traces."""
+    return list(hass.data.get(DATA_TRACE, {}))
+
+
+@callback
+def _async_store_trace(
+    hass: HomeAssistant, trace: RunTrace, stored_traces: int
+) -> None:
+    """Store a trace, evicting the oldest one when the buffer is full."""
+    traces: Dict[str, Deque[RunTrace]] = hass.data.setdefault(DATA_TRACE, {})
+    buffer = traces.get(trace.entity_id)
+    if buffer is None or buffer.maxlen != stored_traces:
+        buffer = traces[trace.entity_id] = deque(buffer or (), maxlen=stored_traces)
+    buffer.append(trace)
+
+
+@contextmanager
+def trace_run(
+    hass: HomeAssistant,
+    entity_id: str,
+    trace_config: Optional[Dict[str, Any]],
+    context: Optional[Context],
+) -> Generator[Optional[RunTrace], None, None]:
+    """Trace a run of a script or automation if tracing is configured."""
+    if trace_config is None:
+        # Make sure a trace of a calling script is not continued
+        token = trace_cv.set(None)
+        try:
+            yield None
+        finally:
+            trace_cv.reset(token)
+        return
+
+    trace = RunTrace(entity_id, context)
+    _async_store_trace(hass, trace, trace_config[CONF_STORED_TRACES])
+    token = trace_cv.set(trace)
+    path_token = trace_path_cv.set(())
+    try:
+        yield trace
+    except Exception as ex:
+        trace.set_error(ex)
+        raise
+    finally:
+        trace_path_cv.reset(path_token)
+        trace_cv.reset(token)
+        trace.finish()
+
+
+@contextmanager
+def trace_script_run() -> Generator[None, None, None]:
+    """Keep steps of a top level script out of traces claimed by another script."""
+    trace = trace_cv.get()
+    if trace is None:
+        yield
+        return
+
+    if not trace.claimed:
+        trace.claimed = True
+        yield
+        return
+
+    token = trace_cv.set(None)
+    try:
+        yield
+    finally:
+        trace_cv.reset(token)
+
+
+@contextmanager
+def trace_path(suffix: Sequence[str]) -> Generator[None, None, None]:
+    """Extend the path of traced steps."""
+    if trace_cv.get() is None:
+        yield
+        return
+
+    token = trace_path_cv.set((*trace_path_cv.get(), *suffix))
+    try:
+        yield
+    finally:
+        trace_path_cv.reset(token)
+
+
+@callback
+def async_trace_step_start(
+    suffix: Sequence[str], variables: Dict[str, Any]
+) -> Optional[TraceElement]:
+    """Start tracing a step, returns None if the run is not traced."""
+    trace = trace_cv.get()
+    if trace is None:
+        return None
+
+    path = (*trace_path_cv.get(), *suffix)
+    element = TraceElement("/".join(path), trace.async_changed_variables(variables))
+    trace.async_add_element(element)
+    # pylint: disable=protected-access
+    element._tokens = (trace_path_cv.set(path), trace_element_cv.set(element))
+    return element
+
+
+@callback
+def async_trace_step_finish(element: TraceElement) -> None:
+    """Finish tracing a step started with async_trace_step_start."""
+    # pylint: disable=protected-access
+    path_token, element_token = element._tokens
+    trace_element_cv.reset(element_token)
+    trace_path_cv.reset(path_token)
+    element._tokens = ()
+    element.finish()
+
+
+@callback
+def async_trace_set_result(**kwargs: Any) -> None:
+    """Set the result of the step currently traced."""
+    element = trace_element_cv.get()
+    if element is not None:
+        element.set_result(**kwargs)
@@ -13,7 +13,7 @@ from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_dumps
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -388,6 +388,73 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def json_serialize_states_stdlib(hass):
+    """Serialize million states with the standard library encoder.
+
+    Compare with json_serialize_states to see the gain of the JSON backend.
+    """
+    states = [
+        core.State("light.kitchen", "on", {"friendly_name": "Kitchen Lights"})
+        for _ in range(10 ** 6)
+    ]
+
+    start = timer()
+    json.dumps(states, cls=JSONEncoder, allow_nan=False)
+    return timer() - start
+
+
+@benchmark
+async def json_serialize_events(hass):
+    """Serialize 100k state changed events with the JSON backend."""
+    old_state = core.State("light.kitchen", "off", {"friendly_name": "Kitchen"})
+    new_state = core.State("light.kitchen", "on", {"friendly_name": "Kitchen"})
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "light.kitchen",
+                "old_state": old_state,
+                "new_state": new_state,
+            },
+        )
+        for _ in range(10 ** 5)
+    ]
+
+    start = timer()
+    for event in events:
+        json_dumps(event)
+    return timer() - start
+
+
+@benchmark
+async def statistics_sensor(hass):
+    """Update a statistics sensor with 10k samples 100k times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.statistics.sensor import StatisticsSensor
+
+    sampling_size = 10 ** 4
+    sensor = StatisticsSensor("sensor.benchmark", "benchmark", sampling_size, None, 2)
+    sensor.hass = hass
+    now = dt_util.utcnow()
+    states = [
+        core.State("sensor.benchmark", str(i % 97), last_updated=now)
+        for i in range(10 ** 5 + sampling_size)
+    ]
+    for state in states[:sampling_size]:
+        # pylint: disable=protected-access
+        sensor._add_state_to_queue(state)
+
+    start = timer()
+
+    for state in states[sampling_size:]:
+        # pylint: disable=protected-access
+        sensor._add_state_to_queue(state)
+        await sensor.async_update()
+
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -401,9 +468,11 @@ def _create_state_changed_event_from_old_new(
     row = collections.namedtuple(
         "Row",
         [
+            "event_id"
             "event_type"
             "event_data"
             "time_fired"
+            "time_fired_ts"
             "context_id"
             "context_user_id"
             "state"
@@ -415,10 +484,12 @@ def _create_state_changed_event_from_old_new(
         ],
     )
 
+    row.event_id = 1
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
     row.time_fired = event_time_fired
+    row.time_fired_ts = event_time_fired.timestamp()
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and core.split_entity_id(entity_id)[0]
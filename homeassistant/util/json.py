@@ -8,6 +8,7 @@ from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_dumps_pretty
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -54,7 +55,10 @@ def save_json(
     Returns True on success.
     """
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        if encoder is None:
+            json_data = json_dumps_pretty(data)
+        else:
+            json_data = json.dumps(data, indent=4, cls=encoder)
     except TypeError as error:
         msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
         _LOGGER.error(msg)
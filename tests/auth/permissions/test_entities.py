@@ -2,6 +2,7 @@
 import pytest
 import voluptuous as vol
 
+from homeassistant.auth.permissions import PolicyPermissions
 from homeassistant.auth.permissions.entities import (
     ENTITY_POLICY_SCHEMA,
     compile_entities,
@@ -215,3 +216,36 @@ def test_entities_areas_area_true(hass):
     assert compiled("light.kitchen", "control") is True
     assert compiled("light.kitchen", "edit") is False
     assert compiled("switch.kitchen", "read") is False
+
+
+def test_policy_permissions_cache_registry_changes(hass):
+    """Test cached entity checks are dropped when the registries change."""
+    entity_registry = mock_registry(
+        hass,
+        {
+            "light.kitchen": RegistryEntry(
+                entity_id="light.kitchen",
+                unique_id="1234",
+                platform="test_platform",
+                device_id="mock-dev-id",
+            )
+        },
+    )
+    device_registry = mock_device_registry(
+        hass, {"mock-dev-id": DeviceEntry(id="mock-dev-id", area_id="mock-area-id")}
+    )
+    perm_lookup = PermissionLookup(entity_registry, device_registry)
+    permissions = PolicyPermissions(
+        {"entities": {"area_ids": {"mock-area-id": {"read": True}}}}, perm_lookup
+    )
+    assert permissions.check_entity("light.kitchen", "read") is True
+
+    # The results are dropped before the registry update events are handled
+    device_registry.async_update_device("mock-dev-id", area_id="other-area-id")
+    assert permissions.check_entity("light.kitchen", "read") is False
+
+    device_registry.async_update_device("mock-dev-id", area_id="mock-area-id")
+    assert permissions.check_entity("light.kitchen", "read") is True
+
+    entity_registry.async_remove("light.kitchen")
+    assert permissions.check_entity("light.kitchen", "read") is False
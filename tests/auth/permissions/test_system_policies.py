@@ -1,39 +1,47 @@
 """Test system policies."""
 from homeassistant.auth.permissions import (
     POLICY_SCHEMA,
+    PermissionLookup,
     PolicyPermissions,
     system_policies,
 )
 
+from tests.common import mock_device_registry, mock_registry
 
-def test_admin_policy():
+
+def _perm_lookup(hass):
+    """Return a permission lookup with empty registries."""
+    return PermissionLookup(mock_registry(hass), mock_device_registry(hass))
+
+
+def test_admin_policy(hass):
     """Test admin policy works."""
     # Make sure it's valid
     POLICY_SCHEMA(system_policies.ADMIN_POLICY)
 
-    perms = PolicyPermissions(system_policies.ADMIN_POLICY, None)
+    perms = PolicyPermissions(system_policies.ADMIN_POLICY, _perm_lookup(hass))
     assert perms.check_entity("light.kitchen", "read")
     assert perms.check_entity("light.kitchen", "control")
     assert perms.check_entity("light.kitchen", "edit")
 
 
-def test_user_policy():
+def test_user_policy(hass):
     """Test user policy works."""
     # Make sure it's valid
     POLICY_SCHEMA(system_policies.USER_POLICY)
 
-    perms = PolicyPermissions(system_policies.USER_POLICY, None)
+    perms = PolicyPermissions(system_policies.USER_POLICY, _perm_lookup(hass))
     assert perms.check_entity("light.kitchen", "read")
     assert perms.check_entity("light.kitchen", "control")
     assert perms.check_entity("light.kitchen", "edit")
 
 
-def test_read_only_policy():
+def test_read_only_policy(hass):
     """Test read only policy works."""
     # Make sure it's valid
     POLICY_SCHEMA(system_policies.READ_ONLY_POLICY)
 
-    perms = PolicyPermissions(system_policies.READ_ONLY_POLICY, None)
+    perms = PolicyPermissions(system_policies.READ_ONLY_POLICY, _perm_lookup(hass))
     assert perms.check_entity("light.kitchen", "read")
     assert not perms.check_entity("light.kitchen", "control")
     assert not perms.check_entity("light.kitchen", "edit")
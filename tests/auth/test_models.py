@@ -1,6 +1,8 @@
 """Tests for the auth models."""
 from homeassistant.auth import models, permissions
 
+from tests.common import mock_device_registry, mock_registry
+
 
 def test_owner_fetching_owner_permissions():
     """Test we fetch the owner permissions for an owner user."""
@@ -11,7 +13,7 @@ def test_owner_fetching_owner_permissions():
     assert owner.permissions is permissions.OwnerPermissions
 
 
-def test_permissions_merged():
+def test_permissions_merged(hass):
     """Test we merge the groups permissions."""
     group = models.Group(
         name="Test Group", policy={"entities": {"domains": {"switch": True}}}
@@ -19,7 +21,12 @@ def test_permissions_merged():
     group2 = models.Group(
         name="Test Group", policy={"entities": {"entity_ids": {"light.kitchen": True}}}
     )
-    user = models.User(name="Test User", perm_lookup=None, groups=[group, group2])
+    perm_lookup = permissions.PermissionLookup(
+        mock_registry(hass), mock_device_registry(hass)
+    )
+    user = models.User(
+        name="Test User", perm_lookup=perm_lookup, groups=[group, group2]
+    )
     # Make sure we cache instance
     assert user.permissions is user.permissions
 
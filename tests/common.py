@@ -494,6 +494,7 @@ class MockUser(auth_models.User):
     def add_to_auth_manager(self, auth_mgr):
         """Test helper to add entry to hass."""
         ensure_auth_manager_loaded(auth_mgr)
+        self.perm_lookup = auth_mgr._store._perm_lookup
         auth_mgr._store._users[self.id] = self
         return self
 
@@ -524,6 +525,14 @@ def ensure_auth_manager_loaded(auth_mgr):
     store = auth_mgr._store
     if store._users is None:
         store._set_defaults()
+    if store._perm_lookup is None:
+        # Policies look entities up in registries without entries
+        ent_reg = entity_registry.EntityRegistry(auth_mgr.hass)
+        ent_reg.entities = OrderedDict()
+        dev_reg = device_registry.DeviceRegistry(auth_mgr.hass)
+        dev_reg.devices = OrderedDict()
+        dev_reg.deleted_devices = OrderedDict()
+        store._perm_lookup = auth_permissions.PermissionLookup(ent_reg, dev_reg)
 
 
 class MockModule:
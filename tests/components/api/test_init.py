@@ -33,6 +33,21 @@ async def test_api_list_state_entities(hass, mock_api_client):
     assert remote_data == hass.states.async_all()
 
 
+async def test_api_list_states_compression(hass, mock_api_client):
+    """Test only a large list of states is compressed."""
+    hass.states.async_set("test.entity", "hello")
+    resp = await mock_api_client.get(const.URL_API_STATES)
+    assert resp.status == 200
+    assert "Content-Encoding" not in resp.headers
+
+    hass.states.async_set("test.entity", "hello", {"large": "x" * 2048})
+    resp = await mock_api_client.get(const.URL_API_STATES)
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "deflate"
+    json = await resp.json()
+    assert json[0]["attributes"]["large"] == "x" * 2048
+
+
 async def test_api_get_state(hass, mock_api_client):
     """Test if the debug interface allows us to get a state."""
     hass.states.async_set("hello.world", "nice", {"attr": 1})
@@ -351,6 +366,78 @@ async def test_stream_with_restricted(hass, mock_api_client):
     assert data["event_type"] == "test_event3"
 
 
+async def test_stream_with_entity_filters(hass, mock_api_client):
+    """Test the stream only forwards events of the requested entities."""
+    resp = await mock_api_client.get(
+        f"{const.URL_API_STREAM}?entity_id=light.kitchen&domain=switch"
+    )
+    assert resp.status == 200
+
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("light.kitchen", "on")
+    data = await _stream_next_event(resp.content)
+    assert data["data"]["entity_id"] == "light.kitchen"
+
+    hass.states.async_set("light.bedroom", "off")
+    hass.states.async_set("switch.fan", "on")
+    data = await _stream_next_event(resp.content)
+    assert data["data"]["entity_id"] == "switch.fan"
+
+    # Events that are not about an entity are not filtered
+    hass.bus.async_fire("test_event")
+    data = await _stream_next_event(resp.content)
+    assert data["event_type"] == "test_event"
+
+
+async def test_stream_coalesces_state_changes(hass, mock_api_client):
+    """Test waiting state changes of an entity are merged."""
+    hass.states.async_set("light.kitchen", "off")
+    resp = await mock_api_client.get(const.URL_API_STREAM)
+    assert resp.status == 200
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 20})
+    hass.bus.async_fire("test_event")
+
+    data = await _stream_next_event(resp.content)
+    assert data["event_type"] == const.EVENT_STATE_CHANGED
+    assert data["data"]["old_state"]["state"] == "off"
+    assert data["data"]["old_state"]["attributes"] == {}
+    assert data["data"]["new_state"]["state"] == "on"
+    assert data["data"]["new_state"]["attributes"] == {"brightness": 20}
+
+    data = await _stream_next_event(resp.content)
+    assert data["event_type"] == "test_event"
+
+
+async def test_stream_drops_oldest_when_full(hass, mock_api_client):
+    """Test the oldest waiting events are dropped when the queue is full."""
+    with patch("homeassistant.components.api.STREAM_MAX_PENDING", 2):
+        resp = await mock_api_client.get(const.URL_API_STREAM)
+    assert resp.status == 200
+
+    for idx in range(5):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    data = await _stream_next_event(resp.content)
+    assert data["data"]["idx"] == 3
+    data = await _stream_next_event(resp.content)
+    assert data["data"]["idx"] == 4
+
+
+async def test_stream_disconnects_when_full(hass, mock_api_client):
+    """Test the stream is closed when the queue is full and asked to."""
+    with patch("homeassistant.components.api.STREAM_MAX_PENDING", 2):
+        resp = await mock_api_client.get(f"{const.URL_API_STREAM}?overflow=disconnect")
+    assert resp.status == 200
+
+    for idx in range(5):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    assert await resp.content.read() in (b"", b"data: ping\n\n")
+
+
 async def _stream_next_event(stream):
     """Read the stream for next event while ignoring ping."""
     while True:
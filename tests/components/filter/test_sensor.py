@@ -114,26 +114,22 @@ async def test_chain_history(hass, values, missing=False):
         }
 
     with patch(
-        "homeassistant.components.history.state_changes_during_period",
-        return_value=fake_states,
+        "homeassistant.components.recorder.preload.async_get_states",
+        return_value=fake_states.get("sensor.test_monitored", []),
     ):
-        with patch(
-            "homeassistant.components.history.get_last_state_changes",
-            return_value=fake_states,
-        ):
-            with assert_setup_component(1, "sensor"):
-                assert await async_setup_component(hass, "sensor", config)
-                await hass.async_block_till_done()
+        with assert_setup_component(1, "sensor"):
+            assert await async_setup_component(hass, "sensor", config)
+            await hass.async_block_till_done()
 
-            for value in values:
-                hass.states.async_set(config["sensor"]["entity_id"], value.state)
-                await hass.async_block_till_done()
+        for value in values:
+            hass.states.async_set(config["sensor"]["entity_id"], value.state)
+            await hass.async_block_till_done()
 
-            state = hass.states.get("sensor.test")
-            if missing:
-                assert "18.05" == state.state
-            else:
-                assert "17.05" == state.state
+        state = hass.states.get("sensor.test")
+        if missing:
+            assert "18.05" == state.state
+        else:
+            assert "17.05" == state.state
 
 
 async def test_source_state_none(hass, values):
@@ -232,20 +228,16 @@ async def test_history_time(hass):
         ]
     }
     with patch(
-        "homeassistant.components.history.state_changes_during_period",
-        return_value=fake_states,
+        "homeassistant.components.recorder.preload.async_get_states",
+        return_value=fake_states["sensor.test_monitored"],
     ):
-        with patch(
-            "homeassistant.components.history.get_last_state_changes",
-            return_value=fake_states,
-        ):
-            with assert_setup_component(1, "sensor"):
-                assert await async_setup_component(hass, "sensor", config)
-                await hass.async_block_till_done()
-
+        with assert_setup_component(1, "sensor"):
+            assert await async_setup_component(hass, "sensor", config)
             await hass.async_block_till_done()
-            state = hass.states.get("sensor.test")
-            assert "18.0" == state.state
+
+        await hass.async_block_till_done()
+        state = hass.states.get("sensor.test")
+        assert "18.0" == state.state
 
 
 async def test_setup(hass):
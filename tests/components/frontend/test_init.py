@@ -9,6 +9,7 @@ from homeassistant.components.frontend import (
     CONF_EXTRA_HTML_URL,
     CONF_EXTRA_HTML_URL_ES5,
     CONF_JS_VERSION,
+    CONF_PRECOMPRESS_LOCAL,
     CONF_THEMES,
     DOMAIN,
     EVENT_PANELS_UPDATED,
@@ -105,6 +106,21 @@ def mock_onboarded():
         yield
 
 
+@pytest.mark.parametrize("precompress", [False, True])
+async def test_precompress_local(hass, ignore_frontend_deps, tmp_path, precompress):
+    """Test the local folder is only precompressed when enabled."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www").mkdir()
+    (tmp_path / "www" / "app.js").write_bytes(b"console.log('hello');\n" * 100)
+
+    assert await async_setup_component(
+        hass, "frontend", {DOMAIN: {CONF_PRECOMPRESS_LOCAL: precompress}}
+    )
+    await hass.async_block_till_done()
+
+    assert (tmp_path / "www" / "app.js.gz").exists() is precompress
+
+
 async def test_frontend_and_static(mock_http_client, mock_onboarded):
     """Test if we can get the frontend."""
     resp = await mock_http_client.get("")
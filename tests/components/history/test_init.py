@@ -7,13 +7,15 @@ import unittest
 from unittest.mock import patch, sentinel
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import StateCheckpoints, process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
+    fire_time_changed,
     get_test_home_assistant,
     init_recorder_component,
     mock_state_change_event,
@@ -113,6 +115,50 @@ class TestComponentHistory(unittest.TestCase):
 
         assert history.get_state(self.hass, time_before_recorder_ran, "demo.id") is None
 
+    def test_get_states_with_checkpoint(self):
+        """Test getting states at a point in time after a state checkpoint."""
+        self.test_setup()
+        entity_ids = [f"test.point_in_time_{i}" for i in range(3)]
+
+        now = dt_util.utcnow()
+        for entity_id in entity_ids:
+            self.hass.states.set(entity_id, "before")
+        wait_recording_done(self.hass)
+
+        checkpoint_time = now + timedelta(hours=2)
+        fire_time_changed(self.hass, checkpoint_time)
+        wait_recording_done(self.hass)
+
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=checkpoint_time,
+        ):
+            self.hass.states.set(entity_ids[0], "after")
+            wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(StateCheckpoints).count() == 3
+
+        def _get_states(point_in_time, entity_ids=None):
+            return {
+                state.entity_id: state.state
+                for state in history.get_states(self.hass, point_in_time, entity_ids)
+            }
+
+        assert _get_states(checkpoint_time - timedelta(minutes=1)) == {
+            entity_ids[0]: "before",
+            entity_ids[1]: "before",
+            entity_ids[2]: "before",
+        }
+        assert _get_states(checkpoint_time + timedelta(minutes=1)) == {
+            entity_ids[0]: "after",
+            entity_ids[1]: "before",
+            entity_ids[2]: "before",
+        }
+        assert _get_states(
+            checkpoint_time + timedelta(minutes=1), [entity_ids[0], entity_ids[2]]
+        ) == {entity_ids[0]: "after", entity_ids[2]: "before"}
+
     def test_state_changes_during_period(self):
         """Test state change during period."""
         self.test_setup()
@@ -663,6 +709,152 @@ class TestComponentHistory(unittest.TestCase):
         assert len(hist[entity_id]) == 3
         assert states == hist[entity_id]
 
+    def test_history_result_cache(self):
+        """Test repeated requests only read the rows after the cached ones."""
+        self.test_setup()
+        entity_id = "sensor.test"
+        start = dt_util.utcnow() - timedelta(minutes=10)
+        points = [start + timedelta(minutes=i) for i in range(1, 6)]
+
+        for point in points:
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow", return_value=point
+            ):
+                self.hass.states.set(entity_id, point.isoformat())
+                wait_recording_done(self.hass)
+
+        def query(start_time, end_time):
+            """Return the uncached rows of the period."""
+            return list(
+                history._query_significant_states(
+                    self.hass, session, start_time, end_time, None, None, True
+                )
+            )
+
+        cache = history.HistoryResultCache()
+        committed = dt_util.utcnow()
+        with session_scope(hass=self.hass) as session:
+            rows = cache.get_significant_states(
+                self.hass, session, start, points[3], None, None, True, committed
+            )
+            assert rows == query(start, points[3])
+            assert len(rows) == 3
+
+            with patch(
+                "homeassistant.components.history._query_significant_states",
+                wraps=history._query_significant_states,
+            ) as query_mock:
+                rows = cache.get_significant_states(
+                    self.hass, session, points[1], None, None, None, True, committed
+                )
+                assert query_mock.call_args[0][2] == points[2]
+                assert rows == query(points[1], None)
+                assert [row.state for row in rows] == [
+                    point.isoformat() for point in points[2:]
+                ]
+
+                # The rows up to the commit are cached
+                rows = cache.get_significant_states(
+                    self.hass, session, points[1], None, None, None, True
+                )
+                assert query_mock.call_args[0][2] == committed
+                assert rows == query(points[1], None)
+
+            # The period before the cached period is read again
+            rows = cache.get_significant_states(
+                self.hass, session, start, points[2], None, None, True
+            )
+            assert rows == query(start, points[2])
+
+    def test_history_result_cache_late_commit(self):
+        """Test states committed after a request are read by the next one."""
+        self.test_setup()
+        entity_id = "sensor.test"
+        start = dt_util.utcnow() - timedelta(minutes=10)
+        points = [start + timedelta(minutes=i) for i in range(1, 4)]
+
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=points[0]
+        ):
+            self.hass.states.set(entity_id, "one")
+            wait_recording_done(self.hass)
+
+        cache = history.HistoryResultCache()
+        with session_scope(hass=self.hass) as session:
+            # The recorder didn't commit the states in time
+            rows = cache.get_significant_states(
+                self.hass, session, start, None, None, None, True
+            )
+            assert [row.state for row in rows] == ["one"]
+
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=points[1]
+        ):
+            self.hass.states.set(entity_id, "two")
+            wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            rows = cache.get_significant_states(
+                self.hass, session, start, None, None, None, True, points[2]
+            )
+            assert [row.state for row in rows] == ["one", "two"]
+            assert cache._windows[(None, True)].tail_time == points[2]
+
+    def test_history_result_cache_eviction(self):
+        """Test the least recently used periods are evicted."""
+        self.test_setup()
+        start = dt_util.utcnow() - timedelta(minutes=10)
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=start + timedelta(minutes=1),
+        ):
+            for entity_id in ("sensor.one", "sensor.two", "sensor.three"):
+                self.hass.states.set(entity_id, "on", {"text": "x" * 1000})
+            wait_recording_done(self.hass)
+
+        committed = dt_util.utcnow()
+        cache = history.HistoryResultCache()
+        with session_scope(hass=self.hass) as session:
+            cache.get_significant_states(
+                self.hass, session, start, None, ["sensor.one"], None, True, committed
+            )
+            window_size = cache._size
+            assert window_size > history.HISTORY_CACHE_ROW_SIZE + 1000
+
+            # Two periods of one entity fit, the period of all of them doesn't
+            cache.max_bytes = window_size * 2 + 100
+            for entity_ids in (["sensor.two"], ["sensor.three"]):
+                cache.get_significant_states(
+                    self.hass, session, start, None, entity_ids, None, True, committed
+                )
+            cache.get_significant_states(
+                self.hass, session, start, None, None, None, True, committed
+            )
+
+        assert list(cache._windows) == [
+            (("sensor.two",), True),
+            (("sensor.three",), True),
+        ]
+        assert cache._size <= cache.max_bytes
+
+    def test_history_result_cache_empty_windows(self):
+        """Test periods without rows count to the size of the cache."""
+        self.test_setup()
+        start = dt_util.utcnow() - timedelta(minutes=10)
+        cache = history.HistoryResultCache(
+            max_bytes=2 * history.HISTORY_CACHE_WINDOW_SIZE + 100
+        )
+        with session_scope(hass=self.hass) as session:
+            for entity_id in ("sensor.one", "sensor.two", "sensor.three"):
+                cache.get_significant_states(
+                    self.hass, session, start, None, [entity_id], None, True
+                )
+
+        assert list(cache._windows) == [
+            (("sensor.two",), True),
+            (("sensor.three",), True),
+        ]
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
@@ -1,5 +1,6 @@
 """The test for the History Statistics sensor platform."""
 # pylint: disable=protected-access
+import asyncio
 from datetime import datetime, timedelta
 from os import path
 import unittest
@@ -9,15 +10,19 @@ import pytest
 import pytz
 
 from homeassistant import config as hass_config
+from homeassistant.components import history
 from homeassistant.components.history_stats import DOMAIN
 from homeassistant.components.history_stats.sensor import HistoryStatsSensor
 from homeassistant.const import SERVICE_RELOAD, STATE_UNKNOWN
 import homeassistant.core as ha
+from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.helpers.template import Template
 from homeassistant.setup import async_setup_component, setup_component
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 from tests.common import get_test_home_assistant, init_recorder_component
+from tests.components.recorder.common import async_wait_recording_done
 
 
 class TestHistoryStatsSensor(unittest.TestCase):
@@ -93,9 +98,13 @@ class TestHistoryStatsSensor(unittest.TestCase):
                 self.hass, "test", "on", None, today, duration, "time", "test"
             )
 
-            sensor1.update_period()
+            run_callback_threadsafe(
+                self.hass.loop, sensor1.async_update_period
+            ).result()
             sensor1_start, sensor1_end = sensor1._period
-            sensor2.update_period()
+            run_callback_threadsafe(
+                self.hass.loop, sensor2.async_update_period
+            ).result()
             sensor2_start, sensor2_end = sensor2._period
 
         # Start = 00:00:00
@@ -163,11 +172,10 @@ class TestHistoryStatsSensor(unittest.TestCase):
             "homeassistant.components.history.state_changes_during_period",
             return_value=fake_states,
         ):
-            with patch("homeassistant.components.history.get_state", return_value=None):
-                sensor1.update()
-                sensor2.update()
-                sensor3.update()
-                sensor4.update()
+            for sensor in (sensor1, sensor2, sensor3, sensor4):
+                asyncio.run_coroutine_threadsafe(
+                    sensor.async_update(), self.hass.loop
+                ).result()
 
         assert sensor1.state == 0.5
         assert sensor2.state is None
@@ -247,11 +255,10 @@ class TestHistoryStatsSensor(unittest.TestCase):
             "homeassistant.components.history.state_changes_during_period",
             return_value=fake_states,
         ):
-            with patch("homeassistant.components.history.get_state", return_value=None):
-                sensor1.update()
-                sensor2.update()
-                sensor3.update()
-                sensor4.update()
+            for sensor in (sensor1, sensor2, sensor3, sensor4):
+                asyncio.run_coroutine_threadsafe(
+                    sensor.async_update(), self.hass.loop
+                ).result()
 
         assert sensor1.state == 0.5
         assert sensor2.state is None
@@ -273,8 +280,8 @@ class TestHistoryStatsSensor(unittest.TestCase):
         before_update1 = sensor1._period
         before_update2 = sensor2._period
 
-        sensor1.update_period()
-        sensor2.update_period()
+        run_callback_threadsafe(self.hass.loop, sensor1.async_update_period).result()
+        run_callback_threadsafe(self.hass.loop, sensor2.async_update_period).result()
 
         assert before_update1 == sensor1._period
         assert before_update2 == sensor2._period
@@ -314,8 +321,8 @@ class TestHistoryStatsSensor(unittest.TestCase):
         before_update1 = sensor1._period
         before_update2 = sensor2._period
 
-        sensor1.update_period()
-        sensor2.update_period()
+        run_callback_threadsafe(self.hass.loop, sensor1.async_update_period).result()
+        run_callback_threadsafe(self.hass.loop, sensor2.async_update_period).result()
 
         assert before_update1 == sensor1._period
         assert before_update2 == sensor2._period
@@ -366,6 +373,108 @@ class TestHistoryStatsSensor(unittest.TestCase):
         self.hass.start()
 
 
+async def test_measure_from_state_changes(hass):
+    """Test the history is loaded once and then kept from state changes."""
+    await hass.async_add_executor_job(
+        init_recorder_component, hass
+    )  # force in memory db
+
+    hass.state = ha.CoreState.not_running
+    hass.states.async_set("binary_sensor.test_id", "off")
+    await async_wait_recording_done(hass)
+
+    await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "history_stats",
+                "entity_id": "binary_sensor.test_id",
+                "name": "test",
+                "state": "on",
+                "type": "count",
+                "start": "{{ as_timestamp(now()) - 3600 }}",
+                "end": "{{ now() }}",
+            },
+        },
+    )
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.components.history.state_changes_during_period",
+        wraps=history.state_changes_during_period,
+    ) as state_changes_mock:
+        await hass.async_start()
+        await hass.async_block_till_done()
+        assert hass.states.get("sensor.test").state == "0"
+
+        now = dt_util.utcnow()
+        for seconds, state in enumerate(("on", "off", "on", "on"), 1):
+            later = now + timedelta(seconds=seconds)
+            with patch("homeassistant.util.dt.utcnow", return_value=later), patch(
+                "homeassistant.util.dt.now", return_value=later
+            ):
+                # The last one is an attribute change, not a state change
+                hass.states.async_set("binary_sensor.test_id", state, {"attr": seconds})
+                await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test").state == "2"
+    assert len(state_changes_mock.mock_calls) == 1
+
+
+async def test_measure_entity_removed(hass):
+    """Test the time stops adding up when the entity is removed."""
+    await hass.async_add_executor_job(
+        init_recorder_component, hass
+    )  # force in memory db
+
+    hass.state = ha.CoreState.not_running
+    hass.states.async_set("binary_sensor.test_id", "off")
+    await async_wait_recording_done(hass)
+
+    await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "history_stats",
+                "entity_id": "binary_sensor.test_id",
+                "name": "test",
+                "state": "on",
+                "type": "time",
+                "start": "{{ as_timestamp(now()) - 3600 }}",
+                "end": "{{ now() }}",
+            },
+        },
+    )
+    await hass.async_block_till_done()
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    now = dt_util.utcnow()
+    with patch("homeassistant.util.dt.utcnow", return_value=now), patch(
+        "homeassistant.util.dt.now", return_value=now
+    ):
+        hass.states.async_set("binary_sensor.test_id", "on")
+        await hass.async_block_till_done()
+
+    later = now + timedelta(minutes=6)
+    with patch("homeassistant.util.dt.utcnow", return_value=later), patch(
+        "homeassistant.util.dt.now", return_value=later
+    ):
+        hass.states.async_remove("binary_sensor.test_id")
+        await hass.async_block_till_done()
+
+    later = now + timedelta(minutes=12)
+    with patch("homeassistant.util.dt.utcnow", return_value=later), patch(
+        "homeassistant.util.dt.now", return_value=later
+    ):
+        await async_update_entity(hass, "sensor.test")
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test").state == "0.1"
+
+
 async def test_reload(hass):
     """Verify we can reload history_stats sensors."""
     await hass.async_add_executor_job(
@@ -188,6 +188,74 @@ async def test_auth_active_access_with_access_token_in_header(
     assert req.status == 401
 
 
+async def test_auth_access_token_cached(hass, app, aiohttp_client, hass_access_token):
+    """Test validated access tokens are not validated again."""
+    setup_auth(hass, app)
+    client = await aiohttp_client(app)
+    refresh_token = await hass.auth.async_validate_access_token(hass_access_token)
+    headers = {"Authorization": f"Bearer {hass_access_token}"}
+
+    with patch.object(
+        hass.auth,
+        "async_validate_access_token",
+        wraps=hass.auth.async_validate_access_token,
+    ) as mock_validate:
+        req = await client.get("/", headers=headers)
+        assert req.status == 200
+        req = await client.get("/", headers=headers)
+        assert req.status == 200
+
+    assert len(mock_validate.mock_calls) == 1
+    assert await req.json() == {"user_id": refresh_token.user.id}
+
+
+async def test_auth_access_token_cache_invalidated(
+    hass, app, aiohttp_client, hass_access_token
+):
+    """Test cached access tokens stop working when they are revoked."""
+    setup_auth(hass, app)
+    client = await aiohttp_client(app)
+    refresh_token = await hass.auth.async_validate_access_token(hass_access_token)
+    headers = {"Authorization": f"Bearer {hass_access_token}"}
+
+    req = await client.get("/", headers=headers)
+    assert req.status == 200
+
+    refresh_token.user.is_active = False
+    req = await client.get("/", headers=headers)
+    assert req.status == 401
+
+    refresh_token.user.is_active = True
+    req = await client.get("/", headers=headers)
+    assert req.status == 200
+
+    await hass.auth.async_remove_refresh_token(refresh_token)
+    req = await client.get("/", headers=headers)
+    assert req.status == 401
+
+
+async def test_auth_access_token_cache_expired(
+    hass, app, aiohttp_client, hass_access_token
+):
+    """Test cached access tokens are not used after they expire."""
+    setup_auth(hass, app)
+    client = await aiohttp_client(app)
+    headers = {"Authorization": f"Bearer {hass_access_token}"}
+
+    req = await client.get("/", headers=headers)
+    assert req.status == 200
+
+    with patch(
+        "homeassistant.components.http.auth.time.time", return_value=1e12
+    ), patch.object(
+        hass.auth, "async_validate_access_token", return_value=None
+    ) as mock_validate:
+        req = await client.get("/", headers=headers)
+        assert req.status == 401
+
+    assert len(mock_validate.mock_calls) == 1
+
+
 async def test_auth_active_access_with_trusted_ip(
     hass, app2, trusted_networks_auth, aiohttp_client, hass_owner_user
 ):
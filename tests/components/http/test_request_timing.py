@@ -0,0 +1,48 @@
+"""Test request timing middleware."""
+from unittest.mock import patch
+
+from aiohttp import web
+
+from homeassistant.components.http.request_timing import setup_request_timing
+
+
+async def test_request_timing_middleware(aiohttp_client, caplog):
+    """Test requests are counted per route and slow requests are logged."""
+    app = web.Application()
+
+    async def mock_handler(request):
+        """Return a response."""
+        return web.Response(text="hello")
+
+    async def mock_not_found(request):
+        """Raise not found."""
+        raise web.HTTPNotFound()
+
+    app.router.add_get("/item/{item_id}", mock_handler)
+    app.router.add_get("/missing", mock_not_found)
+    stats = setup_request_timing(app, 5)
+    client = await aiohttp_client(app)
+
+    assert (await client.get("/item/1")).status == 200
+    assert (await client.get("/item/2")).status == 200
+    assert (await client.get("/missing")).status == 404
+
+    item_stats = stats.as_dict()["/item/{item_id}"]
+    assert item_stats["count"] == 2
+    assert item_stats["bytes_sent"] == 10
+    assert item_stats["status"] == {"2xx": 2}
+    assert item_stats["buckets"]["+Inf"] == 2
+    assert stats.as_dict()["/missing"]["status"] == {"4xx": 1}
+    assert "Slow request" not in caplog.text
+
+    with patch(
+        "homeassistant.components.http.request_timing.monotonic",
+        side_effect=[0, 7.5],
+    ):
+        assert (await client.get("/item/3")).status == 200
+
+    item_stats = stats.as_dict()["/item/{item_id}"]
+    assert item_stats["duration_max"] == 7.5
+    assert item_stats["buckets"]["5.0"] == 2
+    assert item_stats["buckets"]["10.0"] == 3
+    assert "Slow request GET /item/3 (route /item/{item_id}) took 7.500" in caplog.text
@@ -0,0 +1,99 @@
+"""Test static file handling of the HTTP component."""
+import gzip
+import mimetypes
+import os
+
+from aiohttp import hdrs
+
+from homeassistant.components.http.static import precompress_directory
+from homeassistant.setup import async_setup_component
+
+CONTENT = b"console.log('hello');\n" * 100
+
+
+async def test_precompress_directory(tmp_path):
+    """Test compressible files are precompressed once."""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "app.js").write_bytes(CONTENT)
+    (tmp_path / "small.js").write_bytes(b"1;")
+    (tmp_path / "image.png").write_bytes(CONTENT)
+
+    assert precompress_directory(tmp_path) >= 1
+    assert gzip.decompress((tmp_path / "sub" / "app.js.gz").read_bytes()) == CONTENT
+    assert not (tmp_path / "small.js.gz").exists()
+    assert not (tmp_path / "image.png.gz").exists()
+
+    assert precompress_directory(tmp_path) == 0
+
+
+async def test_serve_precompressed_file(hass, hass_client, tmp_path):
+    """Test precompressed files are served with an ETag."""
+    (tmp_path / "app.js").write_bytes(CONTENT)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(b"compressed"))
+    assert await async_setup_component(hass, "http", {})
+    hass.http.register_static_path("/static_test", str(tmp_path))
+    client = await hass_client()
+
+    resp = await client.get(
+        "/static_test/app.js", headers={hdrs.ACCEPT_ENCODING: "gzip"}
+    )
+    assert resp.status == 200
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "gzip"
+    assert resp.headers[hdrs.CONTENT_TYPE] == mimetypes.guess_type("app.js")[0]
+    assert await resp.read() == b"compressed"
+    etag = resp.headers[hdrs.ETAG]
+
+    resp = await client.get(
+        "/static_test/app.js", headers={hdrs.IF_NONE_MATCH: f"W/{etag}"}
+    )
+    assert resp.status == 304
+
+    # A copy older than the file is not used
+    os.utime(tmp_path / "app.js.gz", (0, 0))
+    resp = await client.get(
+        "/static_test/app.js", headers={hdrs.ACCEPT_ENCODING: "gzip"}
+    )
+    assert resp.status == 200
+    assert await resp.read() == CONTENT
+    assert resp.headers[hdrs.ETAG] == etag
+
+
+async def test_serve_refused_encoding(hass, hass_client, tmp_path):
+    """Test precompressed copies of a refused encoding are not served."""
+    (tmp_path / "app.js").write_bytes(CONTENT)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(b"compressed"))
+    assert await async_setup_component(hass, "http", {})
+    hass.http.register_static_path("/static_test", str(tmp_path))
+    client = await hass_client()
+
+    for accept_encoding in ("gzip;q=0", "identity, gzip; q=0.0", "br"):
+        resp = await client.get(
+            "/static_test/app.js", headers={hdrs.ACCEPT_ENCODING: accept_encoding}
+        )
+        assert resp.status == 200
+        assert hdrs.CONTENT_ENCODING not in resp.headers
+        assert await resp.read() == CONTENT
+
+    resp = await client.get(
+        "/static_test/app.js", headers={hdrs.ACCEPT_ENCODING: "br;q=0, gzip;q=0.5"}
+    )
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "gzip"
+
+
+async def test_register_static_path_precompress(hass, tmp_path):
+    """Test folders can be precompressed when registered."""
+    (tmp_path / "app.js").write_bytes(CONTENT)
+    assert await async_setup_component(hass, "http", {})
+
+    hass.http.register_static_path(
+        "/no_cache_test", str(tmp_path), cache_headers=False, precompress=True
+    )
+    await hass.async_block_till_done()
+
+    # Without cache headers the copies would be served without checking them
+    assert not (tmp_path / "app.js.gz").exists()
+
+    hass.http.register_static_path("/static_test", str(tmp_path), precompress=True)
+    await hass.async_block_till_done()
+
+    assert (tmp_path / "app.js.gz").exists()
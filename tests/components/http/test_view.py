@@ -32,10 +32,12 @@ async def test_invalid_json(caplog):
     """Test trying to return invalid JSON."""
     view = HomeAssistantView()
 
+    assert view.json(float("NaN")).body == b"null"
+
     with pytest.raises(HTTPInternalServerError):
-        view.json(float("NaN"))
+        view.json(object())
 
-    assert str(float("NaN")) in caplog.text
+    assert "object" in caplog.text
 
 
 async def test_handling_unauthorized(mock_request):
@@ -69,3 +71,11 @@ async def test_not_running(mock_request_with_stopping):
         Mock(requires_auth=False), AsyncMock(side_effect=Unauthorized)
     )(mock_request_with_stopping)
     assert response.status == 503
+
+
+async def test_json_compression_threshold():
+    """Test only larger JSON responses are compressed."""
+    view = HomeAssistantView()
+
+    assert view.json({"small": True})._compression is False
+    assert view.json({"large": "x" * 2048})._compression is True
@@ -1,5 +1,6 @@
 """The tests for the logbook component."""
 # pylint: disable=protected-access,invalid-name
+import asyncio
 import collections
 from datetime import datetime, timedelta
 import json
@@ -8,10 +9,13 @@ from unittest.mock import Mock, patch
 import pytest
 import voluptuous as vol
 
-from homeassistant.components import logbook, recorder
+from homeassistant.components import logbook, recorder, websocket_api
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    process_datetime_to_timestamp,
+    process_timestamp_to_utc_isoformat,
+)
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.const import (
     ATTR_DOMAIN,
@@ -277,9 +281,11 @@ def create_state_changed_event_from_old_new(
     row = collections.namedtuple(
         "Row",
         [
+            "event_id"
             "event_type"
             "event_data"
             "time_fired"
+            "time_fired_ts"
             "context_id"
             "context_user_id"
             "context_parent_id"
@@ -292,10 +298,12 @@ def create_state_changed_event_from_old_new(
         ],
     )
 
+    row.event_id = 1
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
     row.time_fired = event_time_fired
+    row.time_fired_ts = process_datetime_to_timestamp(event_time_fired)
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and ha.split_entity_id(entity_id)[0]
@@ -1215,6 +1223,50 @@ async def test_logbook_context_from_template(hass, hass_client):
     assert json_dict[5]["context_user_id"] == "9400facee45711eaa9308bfd3d19e474"
 
 
+async def test_logbook_context_started_before_period(hass, hass_client):
+    """Test the context of an entry is found when it started before the period."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("light.switch", STATE_OFF)
+    await hass.async_block_till_done()
+
+    service_context = ha.Context(
+        id="ac5bd62de45711eaaeb351041eec8dd9",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {ATTR_DOMAIN: "light", ATTR_SERVICE: "turn_on"},
+        context=service_context,
+    )
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("light.switch", STATE_ON, context=service_context)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    end_time = start + timedelta(hours=1)
+    response = await client.get(
+        f"/api/logbook/{start.isoformat()}", params={"end_time": end_time.isoformat()}
+    )
+    assert response.status == 200
+    json_dict = await response.json()
+
+    assert len(json_dict) == 1
+    assert json_dict[0]["entity_id"] == "light.switch"
+    assert json_dict[0]["context_event_type"] == EVENT_CALL_SERVICE
+    assert json_dict[0]["context_domain"] == "light"
+    assert json_dict[0]["context_service"] == "turn_on"
+
+
 async def test_logbook_entity_matches_only(hass, hass_client):
     """Test the logbook view with a single entity and entity_matches_only."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1816,6 +1868,102 @@ async def _async_fetch_logbook(client):
     return await response.json()
 
 
+async def test_logbook_event_stream(hass, hass_ws_client):
+    """Test the logbook stream sends stored entries, then new entries."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("light.switch", STATE_OFF)
+    hass.states.async_set("light.switch", STATE_ON)
+    hass.states.async_set("sensor.temperature", "20", {"unit_of_measurement": "°C"})
+    hass.states.async_set("sensor.temperature", "21", {"unit_of_measurement": "°C"})
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 7, "type": "logbook/event_stream", "start_time": start.isoformat()}
+    )
+    msg = await client.receive_json()
+    assert msg["id"] == 7
+    assert msg["success"]
+
+    msg = await client.receive_json()
+    assert msg["type"] == "event"
+    assert [
+        (entry["entity_id"], entry["state"]) for entry in msg["event"]["events"]
+    ] == [("light.switch", STATE_ON)]
+
+    service_context = ha.Context(user_id="b400facee45711eaa9308bfd3d19e474")
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {ATTR_DOMAIN: "light", ATTR_SERVICE: "turn_off"},
+        context=service_context,
+    )
+    hass.states.async_set("light.switch", STATE_OFF, context=service_context)
+    hass.states.async_set("sensor.temperature", "22", {"unit_of_measurement": "°C"})
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert msg["type"] == "event"
+    entries = msg["event"]["events"]
+    assert len(entries) == 1
+    assert entries[0]["entity_id"] == "light.switch"
+    assert entries[0]["state"] == STATE_OFF
+    assert entries[0]["context_service"] == "turn_off"
+    assert entries[0]["context_user_id"] == "b400facee45711eaa9308bfd3d19e474"
+
+    await client.send_json({"id": 8, "type": "unsubscribe_events", "subscription": 7})
+    msg = await client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+
+async def test_logbook_event_stream_limit_concurrency(hass, hass_ws_client):
+    """Test the stored entries are only read once there is a free slot."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    semaphore = hass.data[
+        websocket_api.const.DATA_EXPENSIVE_SEMAPHORE
+    ] = asyncio.Semaphore(0)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 7,
+            "type": "logbook/event_stream",
+            "start_time": dt_util.utcnow().isoformat(),
+        }
+    )
+    await client.send_json({"id": 8, "type": "ping"})
+    msg = await client.receive_json()
+    assert msg["id"] == 8
+    await hass.async_block_till_done()
+    await client.send_json({"id": 9, "type": "ping"})
+    msg = await client.receive_json()
+    assert msg["id"] == 9
+
+    semaphore.release()
+    msg = await client.receive_json()
+    assert msg["id"] == 7
+    assert msg["success"]
+
+
+async def test_logbook_event_stream_invalid_start_time(hass, hass_ws_client):
+    """Test the logbook stream with an invalid start time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 7, "type": "logbook/event_stream", "start_time": "invalid"}
+    )
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "invalid_start_time"
+
+
 async def _async_commit_and_wait(hass):
     await hass.async_block_till_done()
     await hass.async_add_executor_job(trigger_db_commit, hass)
@@ -201,6 +201,25 @@ async def test_view(hass, hass_client):
     )
 
 
+async def test_view_http_metrics(hass, hass_client):
+    """Test the timing statistics of the HTTP server are exported."""
+    assert await async_setup_component(
+        hass, prometheus.DOMAIN, {prometheus.DOMAIN: {"http_metrics": True}}
+    )
+    client = await hass_client()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    assert resp.status == 200
+    resp = await client.get(prometheus.API_ENDPOINT)
+    body = (await resp.text()).split("\n")
+
+    assert (
+        'http_request_duration_seconds_bucket{le="+Inf",route="/api/prometheus"} 1.0'
+        in body
+    )
+    assert 'http_responses_total{route="/api/prometheus",status="2xx"} 1.0' in body
+
+
 @pytest.fixture(name="mock_client")
 def mock_client_fixture():
     """Mock the prometheus client."""
@@ -1,25 +1,35 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
 from datetime import datetime, timedelta
+import time
 from unittest.mock import patch
 
+import pytest
 from sqlalchemy.exc import OperationalError
 
 from homeassistant.components.recorder import (
     CONF_DB_URL,
     CONFIG_SCHEMA,
     DATA_INSTANCE,
+    DB_READ_POOL_SIZE,
     DOMAIN,
     SERVICE_DISABLE,
     SERVICE_ENABLE,
     SERVICE_PURGE,
+    SQLITE_READ_MMAP_SIZE,
     SQLITE_URL_PREFIX,
     Recorder,
     run_information,
     run_information_from_instance,
     run_information_with_session,
 )
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Contexts,
+    Events,
+    RecorderRuns,
+    StateCheckpoints,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
@@ -671,6 +681,147 @@ def test_service_disable_run_information_recorded(tmpdir):
     hass.stop()
 
 
+def test_read_sessions_use_pooled_read_only_connections(tmpdir):
+    """Test read sessions of a file database use tuned read only connections."""
+    test_db_file = tmpdir.mkdir("sqlite").join("test_read_pool.db")
+    dburl = f"{SQLITE_URL_PREFIX}//{test_db_file}"
+
+    hass = get_test_home_assistant()
+    setup_component(hass, DOMAIN, {DOMAIN: {CONF_DB_URL: dburl}})
+    hass.start()
+    hass.states.set("test.read", "on")
+    wait_recording_done(hass)
+
+    instance = hass.data[DATA_INSTANCE]
+    assert instance.read_engine is not None
+    assert instance.read_engine.pool.size() == DB_READ_POOL_SIZE
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.bind is instance.read_engine
+        assert session.execute("PRAGMA query_only").scalar() == 1
+        assert session.execute("PRAGMA mmap_size").scalar() == SQLITE_READ_MMAP_SIZE
+        states = list(session.query(States))
+        assert len(states) == 1
+        assert states[0].entity_id == "test.read"
+        with pytest.raises(OperationalError):
+            session.execute("DELETE FROM states")
+        connection = session.connection().connection.connection
+
+    with session_scope(hass=hass, read_only=True) as session:
+        # The connection is kept open and reused
+        assert session.connection().connection.connection is connection
+
+    with session_scope(hass=hass) as session:
+        assert session.bind is instance.engine
+        assert session.execute("PRAGMA query_only").scalar() == 0
+
+    hass.stop()
+    assert instance.read_engine is None
+
+
+async def test_async_commit(hass):
+    """Test waiting for the recorded events to be committed."""
+    await async_init_recorder_component(hass)
+    instance = hass.data[DATA_INSTANCE]
+    hass.states.async_set("test.one", "on")
+    await hass.async_block_till_done()
+
+    await instance.async_commit()
+
+    def _count_states():
+        with session_scope(hass=hass) as session:
+            return session.query(States).filter_by(entity_id="test.one").count()
+
+    assert await hass.async_add_executor_job(_count_states) == 1
+
+
+async def test_read_sessions_in_memory_database(hass):
+    """Test read sessions of an in memory database use the recorder engine."""
+    await async_init_recorder_component(hass)
+    instance = hass.data[DATA_INSTANCE]
+
+    assert instance.read_engine is None
+    assert instance.get_read_session is instance.get_session
+
+
+def test_saving_contexts(hass_recorder):
+    """Test the first event of the contexts other events refer to is recorded."""
+    hass = hass_recorder()
+    context = Context(user_id="b400facee45711eaa9308bfd3d19e474")
+    child_context = Context(parent_id=context.id)
+    single_context = Context()
+
+    hass.bus.fire("EVENT_TEST", context=context)
+    hass.states.set("test.one", "on", context=child_context)
+    hass.states.set("test.two", "on", context=child_context)
+    hass.bus.fire("EVENT_TEST", context=single_context)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        contexts = {
+            row.context_id: (row.event.event_type, row)
+            for row in session.query(Contexts)
+        }
+        assert len(contexts) == 2
+        event_type, row = contexts[context.id]
+        assert event_type == "EVENT_TEST"
+        assert row.context_user_id == context.user_id
+        event_type, row = contexts[child_context.id]
+        assert event_type == "state_changed"
+        assert row.context_parent_id == context.id
+        assert row.time_fired_ts == row.event.time_fired_ts
+        dbstate = session.query(States).filter_by(event_id=row.event_id).one()
+        assert dbstate.entity_id == "test.one"
+
+
+def test_checkpoint_states(hass_recorder):
+    """Test the most recent state of each entity is checkpointed every hour."""
+    hass = hass_recorder()
+
+    def _get_checkpoints():
+        with session_scope(hass=hass) as session:
+            checkpoints = {}
+            for row in session.query(StateCheckpoints):
+                state = session.query(States).get(row.state_id)
+                checkpoints.setdefault(row.checkpoint_ts, {})[
+                    row.entity_id
+                ] = state.state
+            return checkpoints
+
+    hass.states.set("test.one", "on")
+    hass.states.set("test.two", "on")
+    hass.states.set("test.two", "off")
+    wait_recording_done(hass)
+
+    test_time = dt_util.utcnow() + timedelta(minutes=30)
+    run_tasks_at_time(hass, test_time)
+    assert _get_checkpoints() == {}
+
+    test_time = test_time + timedelta(hours=1)
+    run_tasks_at_time(hass, test_time)
+    first_checkpoint_ts = (test_time - timedelta(seconds=10)).timestamp()
+    assert _get_checkpoints() == {
+        first_checkpoint_ts: {"test.one": "on", "test.two": "off"}
+    }
+
+    # The next checkpoint extends the previous one
+    with patch(
+        "homeassistant.components.recorder.dt_util.utcnow",
+        return_value=test_time + timedelta(minutes=1),
+    ):
+        hass.states.set("test.two", "on")
+        hass.states.set("test.three", "on")
+        wait_recording_done(hass)
+
+    test_time = test_time + timedelta(hours=1)
+    run_tasks_at_time(hass, test_time)
+    second_checkpoint_ts = (test_time - timedelta(seconds=10)).timestamp()
+    assert _get_checkpoints() == {
+        first_checkpoint_ts: {"test.one": "on", "test.two": "off"},
+        second_checkpoint_ts: {"test.one": "on", "test.two": "on", "test.three": "on"},
+    }
+
+
 class CannotSerializeMe:
     """A class that the JSONEncoder cannot serialize."""
 
@@ -722,3 +873,40 @@ async def test_database_corruption_while_running(hass, tmpdir, caplog):
     hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
     await hass.async_block_till_done()
     hass.stop()
+
+
+def test_recording_spooled_events(hass_recorder, tmp_path):
+    """Test the events spooled while the queue is full are recorded in order."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    spool_path = tmp_path / "recorder.spool"
+    instance.queue.spool_path = str(spool_path)
+    instance.queue.max_backlog = 0
+
+    context = Context(user_id="b400facee45711eaa9308bfd3d19e474")
+    for state in ("1", "2", "3"):
+        hass.states.set("test.one", state, {"unit": "W"}, context=context)
+    wait_recording_done(hass)
+
+    assert instance.queue.spooled == 0
+    # The writer thread removes the spool file once it was read
+    for _ in range(100):
+        if not spool_path.exists():
+            break
+        time.sleep(0.01)
+    assert not spool_path.exists()
+
+    with session_scope(hass=hass) as session:
+        states = list(
+            session.query(States)
+            .filter_by(entity_id="test.one")
+            .order_by(States.state_id)
+        )
+        assert [state.to_native().state for state in states] == ["1", "2", "3"]
+        assert [state.old_state_id for state in states] == [
+            None,
+            states[0].state_id,
+            states[1].state_id,
+        ]
+        assert states[2].to_native().attributes == {"unit": "W"}
+        assert states[2].event.context_user_id == context.user_id
@@ -1,5 +1,6 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
+from datetime import datetime, timedelta
 from unittest.mock import Mock, PropertyMock, call, patch
 
 import pytest
@@ -9,6 +10,7 @@ from sqlalchemy.pool import StaticPool
 
 from homeassistant.bootstrap import async_setup_component
 from homeassistant.components.recorder import const, migration, models
+import homeassistant.util.dt as dt_util
 
 from tests.components.recorder import models_original
 
@@ -61,6 +63,84 @@ async def test_schema_migrate(hass):
         assert setup_run.called
 
 
+def test_migrate_timestamp_columns():
+    """Test the epoch timestamp columns are filled from the datetime columns."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models_original.Base.metadata.create_all(engine)
+    time_fired = datetime(2021, 3, 1, 12, 30, 15, 123456, tzinfo=dt_util.UTC)
+    last_changed = time_fired - timedelta(hours=1)
+    engine.execute(
+        models_original.Events.__table__.insert(),
+        [
+            {
+                "event_id": event_id,
+                "event_type": "state_changed",
+                "time_fired": time_fired,
+            }
+            for event_id in (1, 2, 3)
+        ],
+    )
+    engine.execute(
+        models_original.States.__table__.insert(),
+        [
+            {
+                "state_id": state_id,
+                "entity_id": "sensor.test",
+                "last_changed": last_changed,
+                "last_updated": time_fired,
+            }
+            for state_id in (1, 2, 3)
+        ],
+    )
+
+    with patch.object(migration, "TIMESTAMP_BACKFILL_BATCH_SIZE", 2):
+        migration._apply_update(engine, 12, 11)
+
+    assert (
+        list(engine.execute("SELECT last_changed_ts, last_updated_ts FROM states"))
+        == [(last_changed.timestamp(), time_fired.timestamp())] * 3
+    )
+    assert (
+        list(engine.execute("SELECT time_fired_ts FROM events"))
+        == [(time_fired.timestamp(),)] * 3
+    )
+
+
+def test_migrate_contexts():
+    """Test the contexts other events refer to are recorded in the contexts table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    engine.execute(
+        models.Events.__table__.insert(),
+        [
+            {
+                "event_id": event_id,
+                "context_id": context_id,
+                "context_parent_id": context_parent_id,
+                "time_fired_ts": float(event_id),
+            }
+            for event_id, context_id, context_parent_id in (
+                (1, "a", None),
+                (2, "b", "a"),
+                (3, "a", None),
+                (4, None, None),
+                (5, "b", "a"),
+                (6, "c", None),
+                (7, "d", "c"),
+            )
+        ],
+    )
+
+    migration._apply_update(engine, 14, 13)
+
+    assert sorted(
+        engine.execute(
+            "SELECT context_id, event_id, context_parent_id, time_fired_ts "
+            "FROM contexts"
+        )
+    ) == [("a", 1, None, 1.0), ("b", 2, "a", 2.0), ("c", 6, None, 6.0)]
+
+
 def test_invalid_update():
     """Test that an invalid new version raises an exception."""
     with pytest.raises(ValueError):
@@ -11,6 +11,9 @@ from homeassistant.components.recorder.models import (
     Events,
     RecorderRuns,
     States,
+    process_datetime_to_timestamp,
+    process_epoch_timestamp,
+    process_epoch_timestamp_to_utc_isoformat,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
@@ -41,6 +44,22 @@ def test_from_event_to_db_state():
     assert state == States.from_event(event).to_native()
 
 
+def test_from_event_json_format():
+    """Test event data and attributes are stored in the format the logbook matches."""
+    state = ha.State("light.kitchen", "on", {"icon": "mdi:lamp", "value": float("nan")})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.kitchen", "old_state": None, "new_state": state},
+    )
+    assert '"icon": "mdi:lamp"' in States.from_event(event).attributes
+    assert "NaN" in States.from_event(event).attributes
+
+    event = ha.Event("call_service", {"entity_id": "light.kitchen", "domain": "light"})
+    event_data = Events.from_event(event).event_data
+    assert '"entity_id": "light.kitchen"' in event_data
+    assert '"domain": "light"' in event_data
+
+
 def test_from_event_to_delete_state():
     """Test converting deleting state event to db state."""
     event = ha.Event(
@@ -205,6 +224,52 @@ async def test_process_timestamp_to_utc_isoformat():
     assert process_timestamp_to_utc_isoformat(None) is None
 
 
+async def test_process_epoch_timestamps():
+    """Test converting datetimes to and from seconds since the epoch."""
+    now = dt_util.utcnow()
+    datetime_without_tzinfo = datetime(2016, 7, 9, 11, 0, 0)
+    datetime_est_timezone = datetime(
+        2016, 7, 9, 11, 0, 0, tzinfo=pytz.timezone("US/Eastern")
+    )
+
+    assert process_epoch_timestamp(process_datetime_to_timestamp(now)) == now
+    assert process_datetime_to_timestamp(datetime_without_tzinfo) == 1468062000.0
+    assert (
+        process_epoch_timestamp_to_utc_isoformat(
+            process_datetime_to_timestamp(datetime_est_timezone)
+        )
+        == "2016-07-09T15:56:00+00:00"
+    )
+    assert process_datetime_to_timestamp(None) is None
+    assert process_epoch_timestamp(None) is None
+    assert process_epoch_timestamp_to_utc_isoformat(None) is None
+
+
+def test_epoch_timestamp_defaults():
+    """Test the epoch timestamp columns default to their datetime columns."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    last_changed = datetime(2016, 7, 9, 11, 0, 0, tzinfo=dt.UTC)
+    last_updated = datetime(2016, 7, 9, 12, 0, 0, tzinfo=dt.UTC)
+
+    session.add(
+        States(
+            entity_id="sensor.temperature",
+            state="20",
+            last_changed=last_changed,
+            last_updated=last_updated,
+        )
+    )
+    session.add(Events(event_type="test_event", time_fired=last_updated))
+    session.commit()
+
+    db_state = session.query(States).one()
+    assert db_state.last_changed_ts == last_changed.timestamp()
+    assert db_state.last_updated_ts == last_updated.timestamp()
+    assert session.query(Events).one().time_fired_ts == last_updated.timestamp()
+
+
 async def test_event_to_db_model():
     """Test we can round trip Event conversion."""
     event = ha.Event(
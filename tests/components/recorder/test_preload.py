@@ -0,0 +1,57 @@
+"""The tests for loading the recorded states of many entities."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.recorder import preload
+import homeassistant.util.dt as dt_util
+
+from tests.common import async_init_recorder_component
+from tests.components.recorder.common import async_wait_recording_done
+
+
+async def test_get_states(hass):
+    """Test the states of requests made together are read in one query."""
+    await async_init_recorder_component(hass)
+    start = dt_util.utcnow() - timedelta(minutes=10)
+    times = [start + timedelta(minutes=minutes) for minutes in range(5)]
+
+    for point, state, attributes in zip(
+        times,
+        ["1", "2", "2", "3", "4"],
+        [{}, {}, {"changed": True}, {}, {}],
+    ):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=point
+        ):
+            hass.states.async_set("sensor.one", state, attributes)
+            hass.states.async_set("sensor.two", state)
+            await async_wait_recording_done(hass)
+
+    # The requests are split in two compound selects
+    with patch.object(preload, "MAX_REQUESTS_PER_QUERY", 4), patch(
+        "homeassistant.components.recorder.preload._get_states",
+        wraps=preload._get_states,
+    ) as get_states_mock:
+        results = await asyncio.gather(
+            preload.async_get_states(hass, "sensor.one"),
+            preload.async_get_states(hass, "sensor.one", limit=2),
+            preload.async_get_states(hass, "sensor.one", state_changes_only=True),
+            preload.async_get_states(
+                hass, "sensor.TWO", start_time=times[1], end_time=times[4]
+            ),
+            preload.async_get_states(hass, "sensor.two", end_time=times[2], limit=1),
+            preload.async_get_states(hass, "sensor.missing"),
+        )
+
+    assert len(get_states_mock.mock_calls) == 1
+    assert [[state.state for state in states] for states in results] == [
+        ["1", "2", "2", "3", "4"],
+        ["3", "4"],
+        ["1", "2", "3", "4"],
+        ["2", "3"],
+        ["2"],
+        [],
+    ]
+    assert results[0][2].attributes == {"changed": True}
+    assert [state.last_updated for state in results[0]] == times
@@ -0,0 +1,24 @@
+"""The tests for the recorder queue sensors."""
+from unittest.mock import Mock, patch
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.setup import async_setup_component
+
+from tests.common import async_init_recorder_component
+
+
+async def test_queue_sensors(hass):
+    """Test the sensors of the number of events waiting to be recorded."""
+    await async_init_recorder_component(hass)
+    queue = Mock(backlog=5, spooled=10)
+
+    with patch.dict(hass.data, {DATA_INSTANCE: Mock(queue=queue)}):
+        assert await async_setup_component(
+            hass, "sensor", {"sensor": {"platform": "recorder"}}
+        )
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.recorder_queue")
+    assert state.state == "5"
+    assert state.attributes["unit_of_measurement"] == "events"
+    assert hass.states.get("sensor.recorder_spool").state == "10"
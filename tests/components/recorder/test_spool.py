@@ -0,0 +1,145 @@
+"""The tests for the spooling queue of the recorder."""
+from datetime import timedelta
+import math
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from homeassistant.components.recorder import spool
+from homeassistant.components.recorder.spool import SpoolingQueue
+from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.core import Context, Event, State
+import homeassistant.util.dt as dt_util
+
+
+def _wait_for_writer(queue, spool_exists):
+    """Wait until the writer thread wrote or removed the spool file."""
+    for _ in range(500):
+        with queue._lock:
+            if (
+                not queue._to_write
+                and not queue._writing
+                and not queue._remove_spool
+                and os.path.exists(queue.spool_path) == spool_exists
+            ):
+                return
+        time.sleep(0.01)
+    raise AssertionError("The writer thread did not catch up")
+
+
+def test_spooling_queue(tmp_path):
+    """Test events above the backlog are spooled and read back in order."""
+    spool_path = str(tmp_path / "recorder.spool")
+    queue = SpoolingQueue(spool_path, max_backlog=2)
+    now = dt_util.utcnow()
+    context = Context(user_id="user", parent_id="parent")
+    old_state = State("sensor.test", "1", {"unit": "W"}, now - timedelta(hours=1))
+    new_state = State("sensor.test", "2", {"unit": "W"}, now, now, context)
+    events = [Event("test_event", {"number": number}) for number in range(3)]
+    events.append(
+        Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "sensor.test",
+                "old_state": old_state,
+                "new_state": new_state,
+            },
+            time_fired=now,
+            context=context,
+        )
+    )
+    events.append(Event(EVENT_TIME_CHANGED, {ATTR_NOW: now}))
+
+    task = object()
+    for event in events[:3]:
+        queue.put(event)
+    queue.put(task)
+    for event in events[3:]:
+        queue.put(event)
+
+    assert queue.backlog == 2
+    assert queue.spooled == 3
+    _wait_for_writer(queue, True)
+
+    items = [queue.get() for _ in range(6)]
+    assert items[:2] == events[:2]
+    assert items[3] is task
+    spooled = items[2:3] + items[4:]
+    assert spooled == [events[2], events[3], events[4]]
+    assert [event.time_fired for event in spooled] == [
+        event.time_fired for event in events[2:]
+    ]
+    assert spooled[1].data["old_state"] == old_state
+    assert spooled[1].data["new_state"] == new_state
+    assert spooled[1].data["new_state"].last_updated == now
+    assert spooled[1].context.parent_id == "parent"
+    assert spooled[2].data[ATTR_NOW] == now
+
+    assert queue.backlog == 0
+    assert queue.spooled == 0
+    _wait_for_writer(queue, False)
+
+    # Spooling starts over once the spooled events were read
+    for event in events[:3]:
+        queue.put(event)
+    assert queue.spooled == 1
+    _wait_for_writer(queue, True)
+    assert [queue.get() for _ in range(3)] == events[:3]
+
+    queue.close()
+    assert not os.path.exists(spool_path)
+
+
+def test_spooling_queue_put_does_not_wait_for_writer(tmp_path):
+    """Test events are put while the writer is busy and read back in order."""
+    queue = SpoolingQueue(str(tmp_path / "recorder.spool"), max_backlog=1)
+    events = [Event("test_event", {"number": number}) for number in range(100)]
+    writing = threading.Event()
+    release = threading.Event()
+    encode_event = spool._encode_event
+
+    def blocked_encode_event(event):
+        writing.set()
+        release.wait()
+        return encode_event(event)
+
+    with patch.object(spool, "_encode_event", blocked_encode_event):
+        queue.put(events[0])
+        queue.put(events[1])
+        assert writing.wait(5)
+        for event in events[2:]:
+            queue.put(event)
+        assert queue.spooled == 99
+
+        release.set()
+        assert [queue.get() for _ in range(100)] == events
+
+    assert queue.spooled == 0
+    queue.close()
+
+
+def test_spooling_queue_write_error(tmp_path, caplog):
+    """Test spooled events are kept in memory when they can't be written."""
+    queue = SpoolingQueue(str(tmp_path / "missing" / "recorder.spool"), max_backlog=1)
+    events = [Event("test_event", {"number": number}) for number in range(3)]
+    for event in events:
+        queue.put(event)
+    queue._writer_thread.join(5)
+    assert "Error spooling events" in caplog.text
+
+    assert [queue.get() for _ in range(3)] == events
+    queue.close()
+
+
+def test_spooling_queue_not_serializable(tmp_path, caplog):
+    """Test events that can't be spooled are dropped and NaN values are kept."""
+    queue = SpoolingQueue(str(tmp_path / "recorder.spool"), max_backlog=0)
+    queue.put(Event("test_event", {"value": object()}))
+    queue.put(Event("test_event", {"value": float("nan")}))
+    _wait_for_writer(queue, True)
+
+    assert math.isnan(queue.get().data["value"])
+    assert queue.spooled == 0
+    assert "Event is not JSON serializable" in caplog.text
+    queue.close()
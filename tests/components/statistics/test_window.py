@@ -0,0 +1,61 @@
+"""The tests for the sliding window of the statistics sensor."""
+import random
+import statistics
+
+import pytest
+
+from homeassistant.components.statistics.window import SlidingWindow
+
+
+@pytest.mark.parametrize("maxlen", [1, 2, 5, 50])
+def test_aggregates_match_statistics(maxlen):
+    """Test the aggregates match the ones computed over all the samples."""
+    rand = random.Random(maxlen)
+    window = SlidingWindow(maxlen)
+
+    for age in range(500):
+        # Few distinct values to have duplicates in the window
+        window.append(rand.choice([rand.randint(-3, 3), rand.uniform(-1e3, 1e3)]), age)
+        if rand.random() < 0.2:
+            window.popleft()
+        values = list(window.values)
+        assert list(window.ages) == list(range(age - len(values) + 1, age + 1))
+
+        if not values:
+            with pytest.raises(statistics.StatisticsError):
+                window.mean()
+            with pytest.raises(statistics.StatisticsError):
+                window.median()
+            continue
+
+        assert window.mean() == pytest.approx(statistics.mean(values), abs=1e-9)
+        assert window.median() == statistics.median(values)
+        assert window.total() == pytest.approx(sum(values), abs=1e-9)
+        assert window.min() == min(values)
+        assert window.max() == max(values)
+
+        if len(values) < 2:
+            with pytest.raises(statistics.StatisticsError):
+                window.variance()
+            continue
+
+        assert window.variance() == pytest.approx(
+            statistics.variance(values), rel=1e-9, abs=1e-9
+        )
+        assert window.stdev() == pytest.approx(
+            statistics.stdev(values), rel=1e-9, abs=1e-9
+        )
+
+
+def test_window_not_numeric():
+    """Test a window of values that are not numbers."""
+    window = SlidingWindow(2, numeric=False)
+    for age, value in enumerate(["on", "off", "on"]):
+        window.append(value, age)
+
+    assert list(window.values) == ["off", "on"]
+    assert list(window.ages) == [1, 2]
+
+    window.popleft()
+    assert list(window.values) == ["on"]
+    assert len(window) == 1
@@ -0,0 +1,165 @@
+"""Test the trace integration."""
+from homeassistant.setup import async_setup_component
+
+from tests.common import async_mock_service
+from tests.components.blueprint.conftest import stub_blueprint_populate  # noqa
+
+
+async def _setup(hass):
+    """Set up traced and untraced automations and a traced script."""
+    assert await async_setup_component(hass, "trace", {})
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": [
+                {
+                    "id": "sun",
+                    "alias": "traced",
+                    "trigger": {"platform": "event", "event_type": "test_event"},
+                    "condition": {
+                        "condition": "template",
+                        "value_template": "{{ trigger.event.data.run }}",
+                    },
+                    "action": [
+                        {"service": "test.automation", "data": {"hello": "world"}},
+                        {
+                            "choose": {
+                                "conditions": "{{ true }}",
+                                "sequence": {"event": "chosen"},
+                            }
+                        },
+                    ],
+                    "trace": {"stored_traces": 2},
+                },
+                {
+                    "id": "moon",
+                    "alias": "untraced",
+                    "trigger": {"platform": "event", "event_type": "test_event"},
+                    "action": {"service": "script.traced"},
+                },
+            ]
+        },
+    )
+    assert await async_setup_component(
+        hass,
+        "script",
+        {
+            "script": {
+                "traced": {
+                    "sequence": {"condition": "template", "value_template": "false"},
+                    "trace": {},
+                }
+            }
+        },
+    )
+
+
+async def test_list_and_get(hass, hass_ws_client):
+    """Test listing and getting traces."""
+    calls = async_mock_service(hass, "test", "automation")
+    await _setup(hass)
+    client = await hass_ws_client()
+
+    await client.send_json({"id": 1, "type": "trace/list"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == []
+
+    hass.bus.async_fire("test_event", {"run": True})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    await client.send_json({"id": 2, "type": "trace/list"})
+    response = await client.receive_json()
+    assert response["success"]
+    traces = response["result"]
+    assert {trace["entity_id"] for trace in traces} == {
+        "automation.traced",
+        "script.traced",
+    }
+    assert all(trace["state"] == "stopped" for trace in traces)
+
+    trace = next(trace for trace in traces if trace["entity_id"] == "automation.traced")
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "trace/get",
+            "entity_id": "automation.traced",
+            "run_id": trace["run_id"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    steps = response["result"]["trace"]
+    assert set(steps) == {
+        "condition",
+        "sequence/0",
+        "sequence/1",
+        "sequence/1/choose/0/sequence/0",
+    }
+    assert steps["condition"][0]["result"] == {"result": True}
+    assert "trigger" in steps["condition"][0]["changed_variables"]
+    assert steps["sequence/0"][0]["result"]["params"]["service_data"] == {
+        "hello": "world"
+    }
+    assert steps["sequence/1"][0]["result"] == {"choice": 0}
+    assert steps["sequence/1/choose/0/sequence/0"][0]["result"] == {
+        "event": "chosen",
+        "event_data": {},
+    }
+
+    # The script called by the untraced automation has its own trace
+    await client.send_json(
+        {"id": 4, "type": "trace/list", "entity_id": "script.traced"}
+    )
+    response = await client.receive_json()
+    assert len(response["result"]) == 1
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "trace/get",
+            "entity_id": "script.traced",
+            "run_id": response["result"][0]["run_id"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["trace"]["sequence/0"][0]["result"] == {"result": False}
+
+    await client.send_json(
+        {"id": 6, "type": "trace/get", "entity_id": "script.traced", "run_id": "abc"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+
+async def test_stored_traces(hass, hass_ws_client):
+    """Test only the configured number of traces is stored."""
+    async_mock_service(hass, "test", "automation")
+    await _setup(hass)
+    client = await hass_ws_client()
+
+    for run in (True, False, True):
+        hass.bus.async_fire("test_event", {"run": run})
+        await hass.async_block_till_done()
+
+    await client.send_json(
+        {"id": 1, "type": "trace/list", "entity_id": "automation.traced"}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(response["result"]) == 2
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "trace/get",
+            "entity_id": "automation.traced",
+            "run_id": response["result"][0]["run_id"],
+        }
+    )
+    response = await client.receive_json()
+    # Conditions did not pass, so no actions were run
+    assert set(response["result"]["trace"]) == {"condition"}
@@ -358,6 +358,33 @@ async def test_get_config(hass, websocket_client):
     assert msg["result"] == hass.config.as_dict()
 
 
+async def test_http_request_stats(hass, websocket_client):
+    """Test getting the timing statistics of the HTTP server."""
+    hass.http.request_stats.async_add("/api/test", 0.02, 200, 10)
+
+    await websocket_client.send_json({"id": 5, "type": "http/request_stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+    assert msg["result"]["/api/test"]["count"] == 1
+    assert msg["result"]["/api/test"]["bytes_sent"] == 10
+    assert msg["result"]["/api/test"]["buckets"]["0.025"] == 1
+
+
+async def test_http_request_stats_requires_admin(
+    hass, websocket_client, hass_admin_user
+):
+    """Test the HTTP statistics are only available to admins."""
+    hass_admin_user.groups = []
+
+    await websocket_client.send_json({"id": 5, "type": "http/request_stats"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
 async def test_ping(websocket_client):
     """Test get_panels command."""
     await websocket_client.send_json({"id": 5, "type": "ping"})
@@ -434,15 +461,15 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
     assert msg["result"][0]["entity_id"] == "test.entity"
 
 
-async def test_get_states_not_allows_nan(hass, websocket_client):
-    """Test get_states command not allows NaN floats."""
+async def test_get_states_nan_as_null(hass, websocket_client):
+    """Test get_states command sends NaN floats as null."""
     hass.states.async_set("greeting.hello", "world", {"hello": float("NaN")})
 
     await websocket_client.send_json({"id": 5, "type": "get_states"})
 
     msg = await websocket_client.receive_json()
-    assert not msg["success"]
-    assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
+    assert msg["success"]
+    assert msg["result"][0]["attributes"]["hello"] is None
 
 
 async def test_subscribe_unsubscribe_events_whitelist(
@@ -508,6 +535,117 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities sends a snapshot followed by compact diffs."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+    hass.states.async_set("light.permitted", "off", {"color": "red", "old": 1})
+    hass.states.async_set("light.not_permitted", "off")
+    hass.states.async_set("light.other", "off")
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.permitted", "light.not_permitted"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    state = hass.states.get("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "s": "off",
+                "a": {"color": "red", "old": 1},
+                "c": state.context.id,
+                "lu": state.last_updated.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "on", {"color": "blue", "new": 2})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "s": "on",
+                    "a": {"color": "blue", "new": 2},
+                    "c": state.context.id,
+                    "lc": state.last_changed.timestamp(),
+                },
+                "-": {"a": ["old"]},
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+    await hass.async_block_till_done()
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+    hass.states.async_set("light.permitted", "on")
+    await hass.async_block_till_done()
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"]["a"]["light.permitted"]["s"] == "on"
+
+
+async def test_subscribe_entities_all(hass, websocket_client):
+    """Test subscribe entities without entity ids follows all entities."""
+    hass.states.async_set("light.one", "off")
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.one"]
+
+    context = Context()
+    hass.states.async_set("light.two", "off")
+    hass.states.async_set("light.one", "off", {"brightness": 3}, context=context)
+    await hass.async_block_till_done()
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.two"]
+
+    state = hass.states.get("light.one")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.one": {
+                "+": {
+                    "a": {"brightness": 3},
+                    "c": context.id,
+                    "lu": state.last_updated.timestamp(),
+                }
+            }
+        }
+    }
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
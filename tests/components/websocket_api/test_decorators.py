@@ -1,5 +1,8 @@
 """Test decorators."""
+import asyncio
+
 from homeassistant.components import http, websocket_api
+from homeassistant.components.websocket_api import const
 
 
 async def test_async_response_request_context(hass, websocket_client):
@@ -66,3 +69,77 @@ async def test_async_response_request_context(hass, websocket_client):
     assert msg["id"] == 7
     assert not msg["success"]
     assert msg["error"]["code"] == "not_found"
+
+
+async def test_limit_concurrency(hass, websocket_client):
+    """Test expensive commands wait for a slot and can be cancelled."""
+    started = []
+    release = asyncio.Event()
+
+    @websocket_api.websocket_command({"type": "test-expensive"})
+    @websocket_api.async_response
+    @websocket_api.limit_concurrency
+    async def expensive(hass, connection, msg):
+        started.append(msg["id"])
+        await release.wait()
+        connection.send_result(msg["id"])
+
+    websocket_api.async_register_command(hass, expensive)
+
+    for msg_id in (5, 6, 7, 8):
+        await websocket_client.send_json({"id": msg_id, "type": "test-expensive"})
+    await websocket_client.send_json({"id": 9, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 9
+    assert started == [5, 6]
+
+    await websocket_client.send_json(
+        {"id": 10, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 10
+    assert msg["success"]
+
+    release.set()
+    results = [(await websocket_client.receive_json())["id"] for _ in range(3)]
+    assert sorted(results) == [5, 6, 8]
+    assert started == [5, 6, 8]
+
+
+async def test_limit_concurrency_global(hass, hass_ws_client):
+    """Test expensive commands of all connections share a limit."""
+    started = []
+    release = asyncio.Event()
+
+    @websocket_api.websocket_command({"type": "test-expensive"})
+    @websocket_api.async_response
+    @websocket_api.limit_concurrency
+    async def expensive(hass, connection, msg):
+        started.append(msg["id"])
+        await release.wait()
+        connection.send_result(msg["id"])
+
+    websocket_api.async_register_command(hass, expensive)
+    clients = [await hass_ws_client(hass) for _ in range(3)]
+
+    msg_id = 5
+    for client in clients:
+        for _ in range(2):
+            await client.send_json({"id": msg_id, "type": "test-expensive"})
+            msg_id += 1
+    for client in clients:
+        await client.send_json({"id": 100, "type": "ping"})
+        assert (await client.receive_json())["id"] == 100
+
+    assert len(started) == const.MAX_CONCURRENT_EXPENSIVE
+
+    # Closing a connection cancels its commands and frees their slots
+    await clients[0].close()
+    await hass.async_block_till_done()
+    release.set()
+    for client in clients[1:]:
+        for _ in range(2):
+            msg = await client.receive_json()
+            assert msg["success"]
+
+    assert len(started) == 6
@@ -80,3 +80,54 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](state: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_coalesce_messages(hass, websocket_client):
+    """Test queued messages are sent in one frame when the client supports it."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    msg = await websocket_client.receive_json()
+    assert [event["event"]["data"]["idx"] for event in msg] == [0, 1, 2]
+    assert all(event["id"] == 6 for event in msg)
+
+
+@pytest.mark.parametrize("features", [{}, {const.FEATURE_COALESCE_MESSAGES: 0}])
+async def test_no_coalesce_without_feature(hass, websocket_client, features):
+    """Test messages are sent one per frame unless the client enables it."""
+    await websocket_client.send_json(
+        {"id": 4, "type": "supported_features", "features": features}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    for idx in range(3):
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["data"]["idx"] == idx
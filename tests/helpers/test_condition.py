@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
+from homeassistant.core import Context
 from homeassistant.exceptions import ConditionError, HomeAssistantError
 from homeassistant.helpers import condition
 from homeassistant.helpers.template import Template
@@ -1224,3 +1225,103 @@ async def test_condition_template_invalid_results(hass):
         hass, {"condition": "template", "value_template": "{{ [1, 2, 3] }}"}
     )
     assert not test(hass)
+
+
+async def test_condition_memo_state(hass):
+    """Test state condition results are shared within a context."""
+    config = {"condition": "state", "entity_id": "sensor.temperature", "state": "100"}
+    test1 = await condition.async_from_config(hass, dict(config))
+    test2 = await condition.async_from_config(hass, dict(config))
+    hass.states.async_set("sensor.temperature", 100)
+
+    with patch(
+        "homeassistant.helpers.condition.state", wraps=condition.state
+    ) as mock_state:
+        with condition.async_memo_context(Context()):
+            assert test1(hass)
+            assert test2(hass)
+        assert len(mock_state.mock_calls) == 1
+
+        with condition.async_memo_context(Context()):
+            assert test1(hass)
+            hass.states.async_set("sensor.temperature", 101)
+            assert not test2(hass)
+        assert len(mock_state.mock_calls) == 3
+
+        # Without a memo context every evaluation runs
+        assert not test1(hass)
+        assert not test2(hass)
+        assert len(mock_state.mock_calls) == 5
+
+
+async def test_condition_memo_state_for(hass):
+    """Test state conditions with a duration are not shared."""
+    config = {
+        "condition": "state",
+        "entity_id": "sensor.temperature",
+        "state": "100",
+        "for": {"seconds": 5},
+    }
+    test = await condition.async_from_config(hass, config)
+    hass.states.async_set("sensor.temperature", 100)
+
+    with patch(
+        "homeassistant.helpers.condition.state", wraps=condition.state
+    ) as mock_state, condition.async_memo_context(Context()):
+        assert not test(hass)
+        assert not test(hass)
+    assert len(mock_state.mock_calls) == 2
+
+
+async def test_condition_memo_template(hass):
+    """Test template condition results are shared within a context."""
+    config = {
+        "condition": "template",
+        "value_template": "{{ is_state('sensor.temperature', '100') }}",
+    }
+    test1 = await condition.async_from_config(hass, dict(config))
+    test2 = await condition.async_from_config(hass, dict(config))
+    hass.states.async_set("sensor.temperature", 100)
+
+    with patch.object(
+        Template,
+        "async_render_to_info",
+        autospec=True,
+        side_effect=Template.async_render_to_info,
+    ) as mock_render, condition.async_memo_context(Context()):
+        assert test1(hass)
+        assert test2(hass)
+        assert len(mock_render.mock_calls) == 1
+
+        hass.states.async_set("sensor.temperature", 101)
+        assert not test1(hass)
+        assert not test2(hass)
+        assert len(mock_render.mock_calls) == 2
+
+
+async def test_condition_memo_template_not_shared(hass):
+    """Test templates using variables, time or domains are not shared."""
+    hass.states.async_set("sensor.temperature", 100)
+
+    for value_template in (
+        "{{ trigger == 'yes' }}",
+        "{{ now().year > 2000 }}",
+        "{{ states.sensor | count == 1 }}",
+    ):
+        test = await condition.async_from_config(
+            hass, {"condition": "template", "value_template": value_template}
+        )
+        variables = {"trigger": "yes"}
+        with patch(
+            "homeassistant.helpers.condition.async_template",
+            wraps=condition.async_template,
+        ) as mock_template, patch.object(
+            Template,
+            "async_render_to_info",
+            autospec=True,
+            side_effect=Template.async_render_to_info,
+        ) as mock_render:
+            with condition.async_memo_context(Context()):
+                assert test(hass, variables)
+                assert test(hass, variables)
+        assert len(mock_template.mock_calls) + len(mock_render.mock_calls) == 2
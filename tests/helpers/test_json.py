@@ -1,8 +1,17 @@
 """Test Home Assistant remote methods and classes."""
+from collections import namedtuple
+import json
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import (
+    JSONEncoder,
+    _stdlib_json_dumps,
+    json_bytes,
+    json_dumps,
+    json_dumps_pretty,
+)
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +28,53 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_dumps(hass):
+    """Test encoding Home Assistant objects with the JSON backend."""
+    now = dt_util.utcnow()
+    state = core.State("test.test", "hello", last_updated=now, last_changed=now)
+
+    assert json.loads(json_dumps({"state": state, "ids": {"a"}, "now": now})) == {
+        "state": json.loads(json_dumps(state.as_dict())),
+        "ids": ["a"],
+        "now": now.isoformat(),
+    }
+    assert json_bytes([1, "2"]) == b'[1,"2"]'
+
+    with pytest.raises(TypeError):
+        json_dumps(object())
+    with pytest.raises(TypeError):
+        json_dumps({"big": 2 ** 70, "object": object()})
+
+    assert json_dumps_pretty({"a": [1]}) == '{\n    "a": [\n        1\n    ]\n}'
+    with pytest.raises(TypeError):
+        json_dumps_pretty({"a": {1}})
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        ({"a": 1, 2: [True, None]}, '{"a":1,"2":[true,null]}'),
+        ("café", '"café"'),
+        ([float("NaN"), float("inf"), -float("inf"), 1.5], "[null,null,null,1.5]"),
+        (namedtuple("Point", "x y")(1, 2), "[1,2]"),
+        (2 ** 70, "1180591620717411303424"),
+    ],
+)
+def test_json_dumps_backends(data, expected):
+    """Test the installed backend and the standard library write the same JSON."""
+    assert json_dumps(data) == expected
+    assert _stdlib_json_dumps(data) == expected
+
+
+def test_json_dumps_nan_in_objects():
+    """Test NaN in Home Assistant objects is written as null."""
+    now = dt_util.utcnow()
+    state = core.State(
+        "test.test", "hello", {"nan": float("NaN")}, last_updated=now, last_changed=now
+    )
+    data = {"state": state, "ids": {float("NaN")}, "now": now}
+
+    assert json_dumps(data) == _stdlib_json_dumps(data)
+    assert json.loads(json_dumps(data))["state"]["attributes"] == {"nan": None}
@@ -1541,6 +1541,106 @@ async def test_choose(hass, caplog, var, result):
     assert f"{alias}: {expected_choice}: Executing step {aliases[var]}" in caplog.text
 
 
+async def test_parallel(hass, caplog):
+    """Test parallel action."""
+    events = async_capture_events(hass, "test_event")
+    hass.states.async_set("switch.trigger", "off")
+    sequence = cv.SCRIPT_SCHEMA(
+        {
+            "parallel": [
+                {
+                    "alias": "Sequential group",
+                    "sequence": [
+                        {
+                            "alias": "Waiting for trigger",
+                            "wait_for_trigger": {
+                                "platform": "state",
+                                "entity_id": "switch.trigger",
+                                "to": "on",
+                            },
+                        },
+                        {
+                            "event": "test_event",
+                            "event_data": {
+                                "hello": "from action 1",
+                                "what": "{{ what }}",
+                            },
+                        },
+                    ],
+                },
+                {
+                    "alias": "Don't wait at all",
+                    "event": "test_event",
+                    "event_data": {"hello": "from action 2", "what": "{{ what }}"},
+                },
+            ]
+        }
+    )
+    script_obj = script.Script(hass, sequence, "Test Name", "test_domain")
+    wait_started_flag = async_watch_for_action(script_obj, "Waiting for trigger")
+
+    hass.async_create_task(
+        script_obj.async_run(MappingProxyType({"what": "world"}), Context())
+    )
+    await asyncio.wait_for(wait_started_flag.wait(), 1)
+
+    assert script_obj.is_running
+    # The second branch does not wait for the first one
+    assert len(events) == 1
+    assert events[0].data == {"hello": "from action 2", "what": "world"}
+
+    hass.states.async_set("switch.trigger", "on")
+    await hass.async_block_till_done()
+
+    assert not script_obj.is_running
+    assert len(events) == 2
+    assert events[1].data == {"hello": "from action 1", "what": "world"}
+    assert (
+        "Test Name: Parallel action at step 1: Sequential group: Executing step Waiting for trigger"
+        in caplog.text
+    )
+
+
+async def test_parallel_stop(hass):
+    """Test stopping a script stops all parallel branches."""
+    sequence = cv.SCRIPT_SCHEMA(
+        {
+            "parallel": [
+                {"alias": "delay 1", "delay": 10},
+                {"alias": "delay 2", "delay": 10},
+            ]
+        }
+    )
+    script_obj = script.Script(hass, sequence, "Test Name", "test_domain")
+    delay_started_flag = async_watch_for_action(script_obj, "delay")
+
+    hass.async_create_task(script_obj.async_run(context=Context()))
+    await asyncio.wait_for(delay_started_flag.wait(), 1)
+    assert script_obj.is_running
+
+    await script_obj.async_stop()
+    assert not script_obj.is_running
+
+
+async def test_parallel_error(hass):
+    """Test an error in one branch is raised after all branches finished."""
+    events = async_capture_events(hass, "test_event")
+    sequence = cv.SCRIPT_SCHEMA(
+        {
+            "parallel": [
+                {"service": "epic.failure"},
+                {"event": "test_event"},
+            ]
+        }
+    )
+    script_obj = script.Script(hass, sequence, "Test Name", "test_domain")
+
+    with pytest.raises(exceptions.ServiceNotFound):
+        await script_obj.async_run(context=Context())
+
+    assert len(events) == 1
+
+
 @pytest.mark.parametrize(
     "action",
     [
@@ -2231,6 +2331,9 @@ async def test_validate_action_config(hass):
             ]
         },
         cv.SCRIPT_ACTION_VARIABLES: {"variables": {"hello": "world"}},
+        cv.SCRIPT_ACTION_PARALLEL: {
+            "parallel": [{"sequence": [{"event": "parallel_event"}]}]
+        },
     }
 
     for key in cv.ACTION_TYPE_SCHEMAS:
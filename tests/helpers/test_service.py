@@ -509,7 +509,8 @@ async def test_call_context_target_all(hass, mock_handle_entity_call, mock_entit
         "homeassistant.auth.AuthManager.async_get_user",
         return_value=Mock(
             permissions=PolicyPermissions(
-                {"entities": {"entity_ids": {"light.kitchen": True}}}, None
+                {"entities": {"entity_ids": {"light.kitchen": True}}},
+                hass.auth._store._perm_lookup,
             )
         ),
     ):
@@ -537,7 +538,8 @@ async def test_call_context_target_specific(
         "homeassistant.auth.AuthManager.async_get_user",
         return_value=Mock(
             permissions=PolicyPermissions(
-                {"entities": {"entity_ids": {"light.kitchen": True}}}, None
+                {"entities": {"entity_ids": {"light.kitchen": True}}},
+                hass.auth._store._perm_lookup,
             )
         ),
     ):
@@ -564,7 +566,9 @@ async def test_call_context_target_specific_no_auth(
     with pytest.raises(exceptions.Unauthorized) as err:
         with patch(
             "homeassistant.auth.AuthManager.async_get_user",
-            return_value=Mock(permissions=PolicyPermissions({}, None)),
+            return_value=Mock(
+                permissions=PolicyPermissions({}, hass.auth._store._perm_lookup)
+            ),
         ):
             await service.entity_service_call(
                 hass,
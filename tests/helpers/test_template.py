@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
 from datetime import datetime
+from functools import partial
 import math
 import random
 from unittest.mock import patch
@@ -104,6 +105,20 @@ def test_invalid_template(hass):
         tmpl.async_render()
 
 
+def test_referenced_variables(hass):
+    """Test the variables a template references."""
+    tmpl = template.Template(
+        "{% set x = 1 %}{{ states('sensor.a') | float + x + trigger.to_state }}", hass
+    )
+    assert tmpl.referenced_variables() == {"trigger"}
+
+    tmpl = template.Template("{{ is_state('sensor.a', 'on') and now() }}", hass)
+    assert tmpl.referenced_variables() == set()
+
+    with pytest.raises(TemplateError):
+        template.Template("{{", hass).referenced_variables()
+
+
 def test_referring_states_by_entity_id(hass):
     """Test referring states by entity id."""
     hass.states.async_set("test.object", "happy")
@@ -192,6 +207,32 @@ def test_iterating_domain_states(hass):
     )
 
 
+def test_iterating_domain_states_reuses_wrappers(hass):
+    """Test iterating domain states reuses state wrappers until the domain changes."""
+    hass.states.async_set("sensor.temperature", 10)
+    hass.states.async_set("sensor.back_door", "open")
+    hass.states.async_set("test.object", "happy")
+
+    tmpl = template.Template("{{ states.sensor | list }}", hass)
+    first = tmpl.async_render(parse_result=False)
+
+    with patch(
+        "homeassistant.helpers.template.TemplateState", side_effect=AssertionError
+    ):
+        assert tmpl.async_render(parse_result=False) == first
+        # Changes in other domains don't drop the wrappers
+        hass.states.async_set("test.object", "sad")
+        assert tmpl.async_render(parse_result=False) == first
+
+    hass.states.async_set("sensor.temperature", 11)
+    assert (
+        template.Template(
+            "{% for state in states.sensor %}{{ state.state }}{% endfor %}", hass
+        ).async_render()
+        == "open11"
+    )
+
+
 def test_float(hass):
     """Test float."""
     hass.states.async_set("sensor.temperature", "12")
@@ -2161,6 +2202,61 @@ async def test_cache_garbage_collection():
     )  # pylint: disable=protected-access
 
 
+async def test_render_many(hass):
+    """Test rendering many templates from a worker thread."""
+    hass.states.async_set("sensor.temperature", 10)
+    renders = [
+        (template.Template("{{ states('sensor.temperature') }}", hass), None),
+        (template.Template("{{ value * 2 }}", hass), {"value": 21}),
+        (template.Template("static", hass), None),
+    ]
+
+    with patch(
+        "homeassistant.helpers.template.run_callback_threadsafe",
+        wraps=template.run_callback_threadsafe,
+    ) as mock_threadsafe:
+        results = await hass.async_add_executor_job(template.render_many, renders)
+    assert results == [10, 42, "static"]
+    assert len(mock_threadsafe.mock_calls) == 1
+
+    failing = [*renders, (template.Template("{{ 1 / 0 }}", hass), None)]
+    with pytest.raises(TemplateError):
+        await hass.async_add_executor_job(template.render_many, failing)
+
+    results = await hass.async_add_executor_job(
+        partial(template.render_many, failing, return_exceptions=True)
+    )
+    assert results[:3] == [10, 42, "static"]
+    assert isinstance(results[3], TemplateError)
+
+    assert template.async_render_many(renders, parse_result=False) == [
+        "10",
+        "42",
+        "static",
+    ]
+
+
+async def test_render_complex_from_thread(hass):
+    """Test render_complex uses a single call into the event loop from a thread."""
+    hass.states.async_set("sensor.temperature", 10)
+    value = {
+        "temperature": template.Template("{{ states('sensor.temperature') }}", hass),
+        "list": [template.Template("{{ 1 + 1 }}", hass), "plain"],
+    }
+
+    with patch(
+        "homeassistant.helpers.template.run_callback_threadsafe",
+        wraps=template.run_callback_threadsafe,
+    ) as mock_threadsafe:
+        result = await hass.async_add_executor_job(template.render_complex, value)
+        assert result == {"temperature": 10, "list": [2, "plain"]}
+        assert len(mock_threadsafe.mock_calls) == 1
+
+        # In the event loop the templates are rendered directly
+        assert template.render_complex(value) == result
+        assert len(mock_threadsafe.mock_calls) == 1
+
+
 def test_is_template_string():
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
@@ -111,6 +111,7 @@ def test_secrets(isfile_patch, loop):
             "ip_ban_enabled": True,
             "login_attempts_threshold": -1,
             "server_port": 8123,
+            "slow_request_threshold": 10.0,
             "ssl_profile": "modern",
         }
         assert res["secret_cache"] == {secrets_path: {"http_pw": "http://google.com"}}
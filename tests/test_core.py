@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -360,6 +361,24 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_dict_json():
+    """Test a State as JSON encoded dictionary."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    assert json.loads(state.as_dict_json()) == state.as_dict()
+    # 2nd time to verify cache
+    assert state.as_dict_json() is state.as_dict_json()
+
+    state = ha.State("happy.happy", "on", {"pig": float("NaN")})
+    assert json.loads(state.as_dict_json())["attributes"] == {"pig": None}
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -1463,6 +1482,44 @@ async def test_async_all(hass):
     } == {"light.bowl", "light.frog", "switch.link"}
 
 
+async def test_async_all_sorted(hass):
+    """Test async_all_sorted."""
+    hass.states.async_set("switch.link", "on")
+    hass.states.async_set("light.frog", "on")
+    hass.states.async_set("light.bowl", "on")
+
+    all_states = hass.states.async_all_sorted()
+    light_states = hass.states.async_all_sorted("light")
+    switch_states = hass.states.async_all_sorted("switch")
+    assert [state.entity_id for state in all_states] == [
+        "light.bowl",
+        "light.frog",
+        "switch.link",
+    ]
+    assert [state.entity_id for state in light_states] == ["light.bowl", "light.frog"]
+    assert hass.states.async_all_sorted("light") is light_states
+
+    # Setting the same state does not invalidate
+    hass.states.async_set("light.bowl", "on")
+    assert hass.states.async_all_sorted("light") is light_states
+
+    hass.states.async_set("light.bowl", "off")
+    assert hass.states.async_all_sorted("switch") is switch_states
+    assert hass.states.async_all_sorted() is not all_states
+    light_states = hass.states.async_all_sorted("light")
+    assert [state.state for state in light_states] == ["off", "on"]
+
+    hass.states.async_remove("light.frog")
+    assert [state.entity_id for state in hass.states.async_all_sorted("light")] == [
+        "light.bowl"
+    ]
+    assert [state.entity_id for state in hass.states.async_all_sorted()] == [
+        "light.bowl",
+        "switch.link",
+    ]
+    assert hass.states.async_all_sorted("switch") is switch_states
+
+
 async def test_async_entity_ids_count(hass):
     """Test async_entity_ids_count."""
 
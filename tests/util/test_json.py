@@ -96,6 +96,15 @@ def test_load_bad_data():
         load_json(fname)
 
 
+def test_load_nan():
+    """Test loading a file saved with NaN values."""
+    fname = _path_for("test_nan")
+    save_json(fname, {"value": float("nan"), "large": 2 ** 70})
+    data = load_json(fname)
+    assert math.isnan(data["value"])
+    assert data["large"] == 2 ** 70
+
+
 def test_custom_encoder():
     """Test serializing with a custom encoder."""
 